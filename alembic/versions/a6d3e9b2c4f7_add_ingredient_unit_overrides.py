@@ -0,0 +1,27 @@
+"""Add density and piece weight overrides to ingredients
+
+Revision ID: a6d3e9b2c4f7
+Revises: f2c9d7a5b8e0
+Create Date: 2026-10-16 13:26:52.402817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6d3e9b2c4f7'
+down_revision: Union[str, None] = 'f2c9d7a5b8e0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('ingredients', sa.Column('density_g_per_ml', sa.Float(), nullable=True))
+    op.add_column('ingredients', sa.Column('piece_weight_g', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('ingredients', 'piece_weight_g')
+    op.drop_column('ingredients', 'density_g_per_ml')
@@ -0,0 +1,26 @@
+"""Add GIN indexes for recipe diet/intolerance filters
+
+Revision ID: b3f1c2d4e5a6
+Revises: 91496297a171
+Create Date: 2026-10-16 09:12:40.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f1c2d4e5a6'
+down_revision: Union[str, None] = '91496297a171'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_external_recipes_diets_gin', 'external_recipes', ['diets'], unique=False, postgresql_using='gin')
+    op.create_index('ix_external_recipes_intolerances_warn_gin', 'external_recipes', ['intolerances_warn'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_external_recipes_intolerances_warn_gin', table_name='external_recipes')
+    op.drop_index('ix_external_recipes_diets_gin', table_name='external_recipes')
@@ -0,0 +1,36 @@
+"""Add denormalized ingredient_ids array to external_recipes
+
+Revision ID: b8e1f4c7d9a2
+Revises: a6d3e9b2c4f7
+Create Date: 2026-10-16 14:12:30.861945
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e1f4c7d9a2'
+down_revision: Union[str, None] = 'a6d3e9b2c4f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('external_recipes', sa.Column('ingredient_ids', postgresql.ARRAY(sa.Integer()), server_default='{}', nullable=False))
+    op.execute("""
+        UPDATE external_recipes er SET ingredient_ids = agg.ids
+        FROM (
+            SELECT recipe_id, array_agg(DISTINCT ingredient_id ORDER BY ingredient_id) AS ids
+            FROM recipe_ingredients GROUP BY recipe_id
+        ) agg
+        WHERE agg.recipe_id = er.id
+    """)
+    op.create_index('ix_external_recipes_ingredient_ids_gin', 'external_recipes', ['ingredient_ids'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_external_recipes_ingredient_ids_gin', table_name='external_recipes', postgresql_using='gin')
+    op.drop_column('external_recipes', 'ingredient_ids')
@@ -0,0 +1,37 @@
+"""Add composite, partial and trigram indexes for hot per-user queries
+
+Revision ID: c5f8a1d3b7e9
+Revises: b8e1f4c7d9a2
+Create Date: 2026-10-16 15:02:47.318420
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5f8a1d3b7e9'
+down_revision: Union[str, None] = 'b8e1f4c7d9a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index('ix_pantry_items_user_expires_at', 'pantry_items', ['user_id', 'expires_at'], unique=False, postgresql_where=sa.text('expires_at IS NOT NULL'))
+    op.create_index('ix_user_food_logs_user_date_created', 'user_food_logs', ['user_id', 'date', 'created_at', 'id'], unique=False)
+    op.create_index('ix_shopping_list_items_user_pending', 'shopping_list_items', ['user_id', 'id'], unique=False, postgresql_where=sa.text('is_checked = false'))
+    op.create_index('ix_translation_jobs_open', 'translation_jobs', ['status', 'target_lang', 'id'], unique=False, postgresql_where=sa.text("status <> 'done'"))
+    op.create_index('ix_ingredients_display_name_trgm', 'ingredients', ['display_name'], unique=False, postgresql_using='gin', postgresql_ops={'display_name': 'gin_trgm_ops'})
+    op.create_index('ix_ingredient_translations_name_trgm', 'ingredient_translations', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ingredient_translations_name_trgm', table_name='ingredient_translations', postgresql_using='gin')
+    op.drop_index('ix_ingredients_display_name_trgm', table_name='ingredients', postgresql_using='gin')
+    op.drop_index('ix_translation_jobs_open', table_name='translation_jobs', postgresql_where=sa.text("status <> 'done'"))
+    op.drop_index('ix_shopping_list_items_user_pending', table_name='shopping_list_items', postgresql_where=sa.text('is_checked = false'))
+    op.drop_index('ix_user_food_logs_user_date_created', table_name='user_food_logs')
+    op.drop_index('ix_pantry_items_user_expires_at', table_name='pantry_items', postgresql_where=sa.text('expires_at IS NOT NULL'))
+    # pg_trgm is left installed (other objects may use it)
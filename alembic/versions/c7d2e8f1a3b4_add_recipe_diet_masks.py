@@ -0,0 +1,56 @@
+"""Add diet/intolerance bitmask columns to external_recipes
+
+Revision ID: c7d2e8f1a3b4
+Revises: b3f1c2d4e5a6
+Create Date: 2026-10-16 10:03:27.541982
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d2e8f1a3b4'
+down_revision: Union[str, None] = 'b3f1c2d4e5a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Snapshot of app.services.diet_mask at the time of this migration (bit positions are persisted)
+DIET_LABELS = [
+    "gluten free", "ketogenic", "keto", "vegetarian", "lacto vegetarian", "ovo vegetarian",
+    "lacto ovo vegetarian", "vegan", "pescatarian", "paleo", "paleolithic", "primal",
+    "low fodmap", "whole30", "dairy free",
+]
+INTOLERANCE_LABELS = [
+    "dairy", "egg", "gluten", "grain", "peanut", "seafood", "sesame", "shellfish",
+    "soy", "sulfite", "tree nut", "wheat", "nut", "fish",
+]
+
+
+def _mask_expression(column: str, labels: list) -> str:
+    values = ", ".join(f"('{label}', {1 << i})" for i, label in enumerate(labels))
+    return f"""(
+        SELECT COALESCE(bit_or(m.bit), 0)
+        FROM jsonb_array_elements_text(
+            CASE WHEN jsonb_typeof({column}) = 'array' THEN {column} ELSE '[]'::jsonb END
+        ) AS l(label)
+        JOIN (VALUES {values}) AS m(label, bit) ON m.label = lower(l.label)
+    )"""
+
+
+def upgrade() -> None:
+    op.add_column('external_recipes', sa.Column('diet_mask', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('external_recipes', sa.Column('intolerance_mask', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from the existing JSONB label lists
+    op.execute(f"""
+        UPDATE external_recipes SET
+            diet_mask = {_mask_expression('diets', DIET_LABELS)},
+            intolerance_mask = {_mask_expression('intolerances_warn', INTOLERANCE_LABELS)}
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('external_recipes', 'intolerance_mask')
+    op.drop_column('external_recipes', 'diet_mask')
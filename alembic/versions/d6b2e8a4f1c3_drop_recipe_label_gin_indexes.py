@@ -0,0 +1,29 @@
+"""Drop the GIN indexes on external_recipes.diets / intolerances_warn
+
+Diet and intolerance filters use diet_mask / intolerance_mask since c7d2e8f1a3b4;
+no query uses ?| on the JSONB label lists any more, so the indexes only add write cost.
+
+Revision ID: d6b2e8a4f1c3
+Revises: c5f8a1d3b7e9
+Create Date: 2026-10-17 09:41:15.207361
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd6b2e8a4f1c3'
+down_revision: Union[str, None] = 'c5f8a1d3b7e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_external_recipes_intolerances_warn_gin', table_name='external_recipes')
+    op.drop_index('ix_external_recipes_diets_gin', table_name='external_recipes')
+
+
+def downgrade() -> None:
+    op.create_index('ix_external_recipes_diets_gin', 'external_recipes', ['diets'], unique=False, postgresql_using='gin')
+    op.create_index('ix_external_recipes_intolerances_warn_gin', 'external_recipes', ['intolerances_warn'], unique=False, postgresql_using='gin')
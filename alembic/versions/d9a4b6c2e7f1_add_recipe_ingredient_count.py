@@ -0,0 +1,30 @@
+"""Add denormalized ingredient_count to external_recipes
+
+Revision ID: d9a4b6c2e7f1
+Revises: c7d2e8f1a3b4
+Create Date: 2026-10-16 11:21:05.774310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9a4b6c2e7f1'
+down_revision: Union[str, None] = 'c7d2e8f1a3b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('external_recipes', sa.Column('ingredient_count', sa.Integer(), server_default='0', nullable=False))
+    op.execute("""
+        UPDATE external_recipes er SET ingredient_count = (
+            SELECT count(*) FROM recipe_ingredients ri WHERE ri.recipe_id = er.id
+        )
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('external_recipes', 'ingredient_count')
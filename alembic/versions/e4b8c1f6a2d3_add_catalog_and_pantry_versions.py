@@ -0,0 +1,27 @@
+"""Add catalog_version_seq and users.pantry_version
+
+Revision ID: e4b8c1f6a2d3
+Revises: d9a4b6c2e7f1
+Create Date: 2026-10-16 12:04:37.118402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b8c1f6a2d3'
+down_revision: Union[str, None] = 'd9a4b6c2e7f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(sa.schema.CreateSequence(sa.Sequence('catalog_version_seq')))
+    op.add_column('users', sa.Column('pantry_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'pantry_version')
+    op.execute(sa.schema.DropSequence(sa.Sequence('catalog_version_seq')))
@@ -0,0 +1,45 @@
+"""Add full-text search_vector to external_recipes
+
+Revision ID: f2c9d7a5b8e0
+Revises: e4b8c1f6a2d3
+Create Date: 2026-10-16 12:41:09.530174
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c9d7a5b8e0'
+down_revision: Union[str, None] = 'e4b8c1f6a2d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('external_recipes', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    # Backfill (same document as app.services.recipe_search, inlined so this revision stays fixed)
+    op.execute("""
+        UPDATE external_recipes er SET search_vector =
+            setweight(to_tsvector('spanish',
+                coalesce((SELECT rt.title FROM recipe_translations rt
+                          WHERE rt.recipe_id = er.id AND rt.lang = 'es'), '')
+                || ' ' || er.title_original), 'A')
+            || setweight(to_tsvector('spanish', coalesce((
+                SELECT string_agg(coalesce(it.name, '') || ' ' || coalesce(i.display_name, i.canonical_name), ' ')
+                FROM recipe_ingredients ri
+                JOIN ingredients i ON i.id = ri.ingredient_id
+                LEFT JOIN ingredient_translations it ON it.ingredient_id = i.id AND it.lang = 'es'
+                WHERE ri.recipe_id = er.id), '')), 'B')
+            || setweight(to_tsvector('spanish',
+                coalesce((SELECT rt.instructions FROM recipe_translations rt
+                          WHERE rt.recipe_id = er.id AND rt.lang = 'es'), '')), 'C')
+    """)
+    op.create_index('ix_external_recipes_search_vector_gin', 'external_recipes', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_external_recipes_search_vector_gin', table_name='external_recipes', postgresql_using='gin')
+    op.drop_column('external_recipes', 'search_vector')
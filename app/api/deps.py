@@ -1,30 +1,102 @@
-from typing import Generator, AsyncGenerator
-from fastapi import Depends
+from typing import Generator, AsyncGenerator, Optional
+from fastapi import Depends, HTTPException, Query, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.session import AsyncSessionLocal
+from app.core.config import settings
+from app.core.security import decode_access_token
+from app.db.routing import wrote_recently
+from app.db.session import AsyncSessionLocal, ReadSessionLocal
 from app.models.user_pantry_log import User
+from app.services.user_cache import CurrentUser, user_cache
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+# Id of the dev stub user, resolved once per process
+_dev_user_id: Optional[int] = None
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         yield session
 
-async def get_current_user(db: AsyncSession = Depends(get_db)) -> User:
+
+async def get_catalog_db() -> AsyncGenerator[AsyncSession, None]:
+    """Read-only session on the replica (if configured), for routes without per-user data."""
+    async with ReadSessionLocal() as session:
+        yield session
+
+
+async def _get_dev_user() -> CurrentUser:
     """
-    Stub for authentication. Returns the first user in DB or creates a test User.
+    Stub for local development without tokens: the first user in DB, or a new test User.
     """
-    result = await db.execute(select(User).limit(1))
-    user = result.scalar_one_or_none()
+    global _dev_user_id
+    if _dev_user_id is not None:
+        user = await user_cache.get(_dev_user_id)
+        if user is not None:
+            return user
     
-    if not user:
-        # Create Dummy User for MVP testing
-        user = User(
-            email="test@cooky.com",
-            password_hash="hashed_secret",
-            name="Test User"
-        )
-        db.add(user)
-        await db.commit()
-        await db.refresh(user)
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(select(User).order_by(User.id).limit(1))
+        user = result.scalar_one_or_none()
         
+        if not user:
+            # Create Dummy User for MVP testing
+            user = User(
+                email="test@cooky.com",
+                password_hash="hashed_secret",
+                name="Test User"
+            )
+            session.add(user)
+            await session.commit()
+            await session.refresh(user)
+        
+        _dev_user_id = user.id
+        return user_cache.store(user)
+
+
+async def get_current_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)
+) -> CurrentUser:
+    """
+    User of the bearer token. The token is verified without a query and the profile comes
+    from user_cache, so most requests do no database work here.
+    Without an Authorization header, dev environments fall back to the stub user.
+    """
+    if credentials is None:
+        if settings.ENVIRONMENT == "dev":
+            return await _get_dev_user()
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    user_id = decode_access_token(credentials.credentials)
+    user = await user_cache.get(user_id) if user_id is not None else None
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
+
+
+async def get_read_db(
+    current_user: CurrentUser = Depends(get_current_user)
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Read-only session for catalog routes that also read the user's pantry: the replica
+    (if configured), except for a user who just wrote to the pantry (read-your-writes).
+    Writes must keep using get_db.
+    """
+    session_factory = AsyncSessionLocal if wrote_recently(current_user.id) else ReadSessionLocal
+    async with session_factory() as session:
+        yield session
+
+
+def get_lang(lang: str = Query(None, description="Language for names and titles (default: es)")) -> str:
+    """Requested language for user-facing names, falling back to settings.DEFAULT_LANG."""
+    return (lang or settings.DEFAULT_LANG).lower()
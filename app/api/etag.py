@@ -0,0 +1,66 @@
+"""
+Strong ETags and conditional GET for catalog-backed responses.
+
+An ETag is a hash of everything the response depends on: the catalog version
+(app.services.catalog_events), the user's diet profile, the pantry version when
+availability is shown, and the request path and query. If the client sends a
+matching If-None-Match the route returns 304 before loading any data.
+"""
+import hashlib
+import json
+from typing import Optional
+
+from fastapi import Request, Response
+
+from app.services import catalog_events
+from app.services.user_cache import CurrentUser
+
+# Clients may keep the response but must revalidate it on every use
+CACHE_CONTROL = "private, no-cache"
+
+
+def profile_hash(user: Optional[CurrentUser]) -> Optional[str]:
+    """Hash of the profile fields that change recipe compatibility/filtering."""
+    if user is None:
+        return None
+    profile = [user.diet_type, sorted(i.lower() for i in user.intolerances or [])]
+    return hashlib.sha1(json.dumps(profile).encode()).hexdigest()[:16]
+
+
+def make_etag(request: Request, *parts) -> Optional[str]:
+    """
+    Strong ETag for this request and the given extra parts (profile hash, pantry version...).
+    None when the catalog version is unknown (listener down), which disables conditional GET.
+    """
+    version = catalog_events.catalog_version()
+    if version is None:
+        return None
+    key = [version, request.url.path, sorted(request.query_params.multi_items()), *parts]
+    digest = hashlib.sha256(json.dumps(key, default=str).encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as required for If-None-Match
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    return any(c.removeprefix("W/") == etag for c in candidates)
+
+
+def check_not_modified(request: Request, response: Response, *parts) -> Optional[Response]:
+    """
+    Set ETag/Cache-Control on the response. Returns a 304 response when the client's
+    If-None-Match matches, so the route can return it immediately.
+    """
+    etag = make_etag(request, *parts)
+    if etag is None:
+        return None
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    if _matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+    return None
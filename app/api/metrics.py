@@ -0,0 +1,125 @@
+"""
+GET /metrics (Prometheus text format) and the middleware recording per-route metrics.
+
+Routes are labelled by their template (/recipes/{recipe_id}), never the raw path;
+requests matching no route share the "unmatched" label. Pool gauges are refreshed by
+each worker after every request, so the aggregated values stay current for all of them.
+"""
+import logging
+import time
+from typing import Callable, List, Optional, Pattern, Tuple
+
+from fastapi import APIRouter, Response
+from sqlalchemy import func, select
+from starlette.routing import compile_path
+
+from app.core import metrics
+from app.db.session import AsyncSessionLocal, engine, read_engine
+from app.models.translation import TranslationJob
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+UNMATCHED_ROUTE = "unmatched"
+
+# Last cumulative pool counters seen by this worker, to increment the Prometheus counters
+_pool_counters_seen: dict = {}
+
+
+def _pools():
+    yield "primary", engine.pool
+    if read_engine is not engine:
+        yield "replica", read_engine.pool
+
+
+def observe_pools() -> None:
+    for name, pool in _pools():
+        metrics.DB_POOL_SIZE.labels(name).set(pool.size())
+        metrics.DB_POOL_CONNECTIONS.labels(name, "checked_out").set(pool.checkedout())
+        metrics.DB_POOL_CONNECTIONS.labels(name, "checked_in").set(pool.checkedin())
+        metrics.DB_POOL_CONNECTIONS.labels(name, "overflow").set(max(pool.overflow(), 0))
+
+        waits, timeouts = _pool_counters_seen.get(name, (0, 0))
+        if pool.waits > waits:
+            metrics.DB_POOL_CHECKOUT_WAITS.labels(name).inc(pool.waits - waits)
+        if pool.timeouts > timeouts:
+            metrics.DB_POOL_CHECKOUT_TIMEOUTS.labels(name).inc(pool.timeouts - timeouts)
+        _pool_counters_seen[name] = (pool.waits, pool.timeouts)
+
+
+class PrometheusMiddleware:
+    def __init__(self, app, openapi: Callable[[], dict]):
+        self.app = app
+        # Route templates come from the OpenAPI schema (public, in route order); built lazily
+        # because routers are included after the middleware is registered
+        self.openapi = openapi
+        self._routes: Optional[List[Tuple[Pattern, frozenset, str]]] = None
+
+    def _build_routes(self) -> List[Tuple[Pattern, frozenset, str]]:
+        routes = []
+        for template, operations in self.openapi()["paths"].items():
+            regex, _, _ = compile_path(template)
+            routes.append((regex, frozenset(m.upper() for m in operations), template))
+        return routes
+
+    def _route_label(self, method: str, path: str) -> str:
+        if self._routes is None:
+            self._routes = self._build_routes()
+        # Same first-match rule as the router (/recipes/search before /recipes/{recipe_id})
+        for regex, methods, template in self._routes:
+            if method in methods and regex.match(path):
+                return template
+        return UNMATCHED_ROUTE
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = self._route_label(method, scope["path"])
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = metrics.HTTP_IN_PROGRESS.labels(method, route)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.HTTP_LATENCY.labels(method, route).observe(time.perf_counter() - started)
+            metrics.HTTP_REQUESTS.labels(method, route, str(status_code)).inc()
+            in_progress.dec()
+            observe_pools()
+
+
+async def _observe_translation_queue() -> None:
+    async with AsyncSessionLocal() as session:
+        rows = (await session.execute(
+            select(TranslationJob.status, func.count())
+            .where(TranslationJob.status != "done")
+            .group_by(TranslationJob.status)
+        )).all()
+    counts = dict(rows)
+    for status in ("pending", "in_progress", "error"):
+        metrics.TRANSLATION_QUEUE.labels(status).set(counts.get(status, 0))
+
+
+@router.get("/metrics")
+async def get_metrics() -> Response:
+    """Prometheus scrape endpoint (all workers in multiprocess mode)."""
+    try:
+        await _observe_translation_queue()
+    except Exception as e:
+        # Keep serving the other metrics if the database is unreachable; the queue
+        # gauges then keep their last values
+        logger.warning(f"Translation queue metrics not refreshed (gauges are stale): {e}")
+    observe_pools()
+    body, content_type = metrics.render_latest()
+    return Response(content=body, media_type=content_type)
@@ -0,0 +1,72 @@
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+# Hard cap for page sizes on list endpoints
+MAX_PAGE_SIZE = 200
+
+# Page size of list endpoints when the client does not pass one
+DEFAULT_PAGE_SIZE = 50
+
+# Response header used by list endpoints whose body is a plain JSON array
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Unsupported cursor value: {value!r}")
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode the (sort key, id) of the last row of a page into an opaque cursor.
+    """
+    raw = json.dumps(list(values), default=_json_default, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: type) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor, converting each value to the given type.
+    Raises a 400 if the cursor is malformed or does not match the expected shape.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("cursor shape mismatch")
+
+        decoded = []
+        for value, type_ in zip(values, types):
+            if type_ is datetime:
+                decoded.append(datetime.fromisoformat(value))
+            elif type_ is date:
+                decoded.append(date.fromisoformat(value))
+            else:
+                decoded.append(type_(value))
+        return decoded
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_after(columns: Sequence[Any], values: Sequence[Any]):
+    """
+    Row-value predicate selecting rows strictly after the cursor position,
+    e.g. (created_at, id) > (:created_at, :id). Uses the ordering index directly,
+    so deep pages cost the same as the first one.
+    """
+    if len(columns) == 1:
+        return columns[0] > values[0]
+    return tuple_(*columns) > tuple_(*values)
+
+
+def keyset_before(columns: Sequence[Any], values: Sequence[Any]):
+    """keyset_after for descending orderings, e.g. (rank, id) < (:rank, :id)."""
+    if len(columns) == 1:
+        return columns[0] < values[0]
+    return tuple_(*columns) < tuple_(*values)
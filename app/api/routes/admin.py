@@ -0,0 +1,45 @@
+from fastapi import APIRouter
+
+from app.db.session import engine, read_engine
+from app.services.recipe_catalog import recipe_catalog
+from app.services.ingredient_cache import ingredient_cache
+from app.services.similarity import similarity_index
+from app.services.user_cache import user_cache
+
+router = APIRouter()
+
+
+@router.get("/catalog/stats")
+async def get_catalog_stats() -> dict:
+    """In-memory recipe catalog snapshot of this worker: size, memory footprint and hit/miss counters."""
+    return recipe_catalog.stats()
+
+
+@router.get("/ingredients/cache/stats")
+async def get_ingredient_cache_stats() -> dict:
+    """Ingredient name cache of this worker: entries and hit/miss counters."""
+    return ingredient_cache.stats()
+
+
+@router.get("/similarity/stats")
+async def get_similarity_stats() -> dict:
+    """MinHash/LSH similarity index of this worker: indexed recipes, delta size and rebuilds."""
+    return similarity_index.stats()
+
+
+@router.get("/users/cache/stats")
+async def get_user_cache_stats() -> dict:
+    """Authenticated user cache of this worker: entries, TTL and hit/miss counters."""
+    return user_cache.stats()
+
+
+@router.get("/db/pool/stats")
+async def get_db_pool_stats() -> dict:
+    """
+    Connection pools of this worker: size, checked out, overflow, and checkout waits/timeouts.
+    replica is null when DATABASE_URL_READ is not set.
+    """
+    return {
+        "primary": engine.pool.stats(),
+        "replica": read_engine.pool.stats() if read_engine is not engine else None,
+    }
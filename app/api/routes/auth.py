@@ -0,0 +1,55 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from typing import Any
+
+from app.api import deps
+from app.core.security import create_access_token, dummy_password_hash, hash_password, verify_password
+from app.models.user_pantry_log import User
+from app.schemas.user import LoginRequest, Token, UserRegister
+
+router = APIRouter()
+
+
+@router.post("/register", response_model=Token, status_code=status.HTTP_201_CREATED)
+async def register(
+    user_in: UserRegister,
+    db: AsyncSession = Depends(deps.get_db)
+) -> Any:
+    """Create an account and return a bearer token for it."""
+    email = user_in.email.strip().lower()
+    existing = await db.execute(select(User.id).where(User.email == email))
+    if existing.scalar_one_or_none() is not None:
+        raise HTTPException(status_code=400, detail="Email already registered")
+    
+    # PBKDF2 runs in a thread: it would block every other request of the worker
+    password_hash = await run_in_threadpool(hash_password, user_in.password)
+    user = User(email=email, password_hash=password_hash, name=user_in.name)
+    db.add(user)
+    await db.commit()
+    
+    return Token(access_token=create_access_token(user.id))
+
+
+@router.post("/login", response_model=Token)
+async def login(
+    credentials: LoginRequest,
+    db: AsyncSession = Depends(deps.get_db)
+) -> Any:
+    """Exchange email and password for a bearer token (send it as `Authorization: Bearer <token>`)."""
+    result = await db.execute(select(User).where(User.email == credentials.email.strip().lower()))
+    user = result.scalar_one_or_none()
+    # Unknown emails are checked against a dummy hash: same cost, so the response time
+    # does not reveal which emails are registered
+    valid = await run_in_threadpool(
+        verify_password, credentials.password, user.password_hash if user else dummy_password_hash()
+    )
+    if not user or not valid:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    return Token(access_token=create_access_token(user.id))
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
 from app.api import deps
 from app.integrations.spoonacular_client import spoonacular_client
 from app.models.recipe import ExternalRecipe, RecipeTranslation, RecipeIngredient
@@ -8,6 +8,11 @@ from app.models.ingredient import Ingredient, IngredientTranslation
 from app.models.translation import TranslationJob
 from app.schemas.recipe import RecipeImportResponse
 from app.services.normalization import normalize_ingredient_name
+from app.services.diet_mask import compute_diet_mask
+from app.services.catalog_events import notify_catalog_changed
+from app.services.recipe_search import refresh_search_vectors
+from app.services.recipe_catalog import recipe_catalog
+from app.services.ingredient_cache import ingredient_cache
 from app.core.config import settings
 
 router = APIRouter()
@@ -39,6 +44,8 @@ async def import_recipe(
             image_url=data.get("image", ""),
             servings=data.get("servings", 1),
             diets=data.get("diets", []),
+            diet_mask=compute_diet_mask(data.get("diets", [])),
+            intolerance_mask=0,  # intolerances_warn is not populated from Spoonacular yet
             # nutrition_totals_per_serving could be calculated or taken from Spoonacular if properly parsed
             # For MVP, we presume Spoonacular structure or leave null
             instructions_raw=data.get("instructions", ""),
@@ -161,9 +168,28 @@ async def import_recipe(
             )
             db.add(link)
             ingredients_processed += 1
-            
+    
+    # Keep the denormalized count / ingredient id array in sync (autoflush includes new links)
+    ingredient_count, ingredient_ids = (await db.execute(
+        select(
+            func.count(),
+            func.array_agg(RecipeIngredient.ingredient_id.distinct()),
+        ).where(RecipeIngredient.recipe_id == recipe.id)
+    )).one()
+    recipe.ingredient_count = ingredient_count
+    recipe.ingredient_ids = ingredient_ids or []
+    
+    # Full-text document (titles, ingredient names, instructions)
+    await refresh_search_vectors(db, [recipe.id])
+    
+    # Tell the other workers to reload their catalog snapshot (delivered on commit)
+    await notify_catalog_changed(db, "recipes")
     await db.commit()
     
+    # Swap in a fresh snapshot for this worker
+    await recipe_catalog.refresh(db)
+    ingredient_cache.invalidate("recipes")
+    
     return RecipeImportResponse(
         recipe_id=recipe.id,
         title=recipe.title_original,
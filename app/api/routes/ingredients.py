@@ -1,40 +1,59 @@
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_, and_
+from sqlalchemy import select, and_, union
 from typing import List
 
 from app.api import deps
+from app.api.etag import check_not_modified
 from app.models.ingredient import Ingredient, IngredientTranslation
 from app.schemas.ingredient import IngredientSearchResult
 
 router = APIRouter()
 
+def search_ingredients_stmt(q: str, limit: int, offset: int):
+    """
+    Ingredients whose Spanish translation or display_name contains q (ILIKE), with
+    the translation row (or None).
+    Each side is its own lookup so both use their pg_trgm index; an OR across the
+    outer join could not use either.
+    """
+    pattern = f"%{q}%"
+    matching_ids = union(
+        select(IngredientTranslation.ingredient_id).where(
+            IngredientTranslation.lang == "es",
+            IngredientTranslation.name.ilike(pattern)
+        ),
+        select(Ingredient.id).where(Ingredient.display_name.ilike(pattern))
+    )
+    
+    # Left Join Ingredient -> IngredientTranslation (lang='es') for the display name
+    return select(Ingredient, IngredientTranslation).\
+        outerjoin(IngredientTranslation, and_(
+            Ingredient.id == IngredientTranslation.ingredient_id, 
+            IngredientTranslation.lang == "es"
+        )).\
+        where(Ingredient.id.in_(matching_ids)).\
+        limit(limit).offset(offset)
+
+
 @router.get("/search", response_model=List[IngredientSearchResult])
 async def search_ingredients(
+    request: Request,
+    response: Response,
     q: str = Query(..., min_length=2),
     limit: int = 20,
     offset: int = 0,
-    db: AsyncSession = Depends(deps.get_db)
+    db: AsyncSession = Depends(deps.get_catalog_db)
 ):
+    # Results only change with imports/translations (catalog version)
+    not_modified = check_not_modified(request, response)
+    if not_modified:
+        return not_modified
+
     if limit > 50:
         limit = 50
         
-    # Search logic: Left Join Ingredient -> IngredientTranslation (lang='es')
-    # Filter: matches translation OR matches display_name
-    stmt = select(Ingredient, IngredientTranslation).\
-        outerjoin(IngredientTranslation, and_(
-            Ingredient.id == IngredientTranslation.ingredient_id, 
-            IngredientTranslation.lang == "es"
-        )).\
-        where(
-            or_(
-                IngredientTranslation.name.ilike(f"%{q}%"),
-                Ingredient.display_name.ilike(f"%{q}%")
-            )
-        ).\
-        limit(limit).offset(offset)
-        
-    result = await db.execute(stmt)
+    result = await db.execute(search_ingredients_stmt(q, limit, offset))
     rows = result.all()
     
     results = []
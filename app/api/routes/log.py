@@ -1,83 +1,162 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, and_, func, Float
 from datetime import datetime, date, timedelta
-from typing import Any, List
+from typing import Any, Dict, List, Optional
 
 from app.api import deps
-from app.models.user_pantry_log import User, UserFoodLog
-from app.models.recipe import ExternalRecipe, RecipeTranslation
-from app.models.ingredient import Ingredient, IngredientTranslation
+from app.api.pagination import MAX_PAGE_SIZE, encode_cursor, decode_cursor, keyset_after
+from app.models.user_pantry_log import UserFoodLog
+from app.services.user_cache import CurrentUser
 from app.schemas.log import (
     RecipeLogCreate, IngredientLogCreate, 
     FoodLogEntryRead, DailySummary, MacroTotals
 )
+from app.services.ingredient_cache import ingredient_cache
+from app.services.recipe_catalog import recipe_catalog
+from app.services.nutrition import calculate_recipe_macros, macros_for_grams
+from app.services.units import to_grams_many
 
 router = APIRouter()
 
 
-def calculate_recipe_macros(nutrition: dict, servings: float) -> MacroTotals:
-    """Calculate macros for a recipe based on servings."""
-    if not nutrition:
-        return MacroTotals()
-    
-    return MacroTotals(
-        calories=round((nutrition.get('calories', 0) or 0) * servings, 1),
-        protein=round((nutrition.get('protein', 0) or 0) * servings, 1),
-        carbs=round((nutrition.get('carbohydrates', 0) or nutrition.get('carbs', 0) or 0) * servings, 1),
-        fat=round((nutrition.get('fat', 0) or 0) * servings, 1)
-    )
-
-
-def calculate_ingredient_macros(nutrition_per_100g: dict, quantity: float, unit: str) -> MacroTotals:
+def calculate_ingredient_macros(
+    nutrition_per_100g: dict,
+    quantity: float,
+    unit: str,
+    density_g_per_ml: float = None,
+    piece_weight_g: float = None
+) -> MacroTotals:
     """
     Calculate macros for an ingredient based on quantity and unit.
-    Simple approach: assumes unit is grams (g) or kg.
-    For other units, treats quantity as grams.
+    The quantity is converted to grams with app.services.units (mass, volume via density,
+    pieces via piece weight); units that can't be converted are treated as grams.
     """
     if not nutrition_per_100g:
         return MacroTotals()
     
-    # Convert to grams
-    grams = quantity
-    if unit.lower() == 'kg':
-        grams = quantity * 1000
-    elif unit.lower() in ['g', 'gr', 'gramos']:
-        grams = quantity
-    # For other units (pcs, ml, etc.), treat quantity as approximate grams
-    # This is a simplification documented in the code
+    (grams,) = to_grams_many([(quantity, unit, density_g_per_ml, piece_weight_g)])
+    return macros_for_grams(nutrition_per_100g, quantity if grams is None else grams)
+
+
+def daily_log_stmt(user_id: int, log_date: date, after: Optional[tuple] = None):
+    """
+    The user's log entries of a day ordered by (created_at, id), so the cursor is stable.
+    after: (created_at, id) of the last entry of the previous page.
+    """
+    stmt = select(UserFoodLog).where(
+        UserFoodLog.user_id == user_id,
+        UserFoodLog.date == log_date
+    ).order_by(UserFoodLog.created_at, UserFoodLog.id)
     
-    multiplier = grams / 100.0
+    if after:
+        stmt = stmt.where(keyset_after([UserFoodLog.created_at, UserFoodLog.id], list(after)))
+    return stmt
+
+
+def daily_snapshot_totals_stmt(user_id: int, log_date: date):
+    """Sums of the nutrition snapshots of every log entry of a day, in one aggregate query."""
+    def snapshot_sum(key: str):
+        return func.coalesce(func.sum(UserFoodLog.nutrition_snapshot[key].astext.cast(Float)), 0)
     
-    return MacroTotals(
-        calories=round((nutrition_per_100g.get('calories', 0) or nutrition_per_100g.get('kcal', 0) or 0) * multiplier, 1),
-        protein=round((nutrition_per_100g.get('protein', 0) or 0) * multiplier, 1),
-        carbs=round((nutrition_per_100g.get('carbohydrates', 0) or nutrition_per_100g.get('carbs', 0) or 0) * multiplier, 1),
-        fat=round((nutrition_per_100g.get('fat', 0) or 0) * multiplier, 1)
+    return select(
+        snapshot_sum("calories"),
+        snapshot_sum("protein"),
+        snapshot_sum("carbs"),
+        snapshot_sum("fat"),
+    ).where(
+        UserFoodLog.user_id == user_id,
+        UserFoodLog.date == log_date
     )
 
 
+async def _sum_daily_snapshots(db: AsyncSession, user_id: int, log_date: date) -> MacroTotals:
+    """Sum the nutrition snapshots of every log entry of a day."""
+    calories, protein, carbs, fat = (await db.execute(daily_snapshot_totals_stmt(user_id, log_date))).one()
+    return MacroTotals(calories=calories, protein=protein, carbs=carbs, fat=fat)
+
+
+def _entry_macros(logs: List[UserFoodLog], snapshot, ingredients: dict) -> Dict[int, MacroTotals]:
+    """
+    Macros per log entry id: the stored snapshot, or for entries logged before snapshots
+    existed, recalculated from the recipe catalog snapshot and the cached ingredients.
+    """
+    # Grams of the ingredient entries without a stored snapshot, converted in one batch
+    to_recalculate = [
+        log for log in logs
+        if log.nutrition_snapshot is None and log.type == "ingredient" and log.ingredient_id in ingredients
+    ]
+    grams_by_log = dict(zip(
+        (log.id for log in to_recalculate),
+        to_grams_many(
+            (log.quantity, log.unit,
+             ingredients[log.ingredient_id].density_g_per_ml, ingredients[log.ingredient_id].piece_weight_g)
+            for log in to_recalculate
+        )
+    ))
+    
+    macros_by_log = {}
+    for log in logs:
+        recipe = snapshot.get(log.recipe_id) if log.recipe_id is not None else None
+        ingredient = ingredients.get(log.ingredient_id)
+        
+        # Get macros from snapshot or recalculate
+        if log.nutrition_snapshot is not None:
+            macros = MacroTotals(**log.nutrition_snapshot)
+        elif log.type == "recipe" and recipe:
+            macros = calculate_recipe_macros(
+                recipe.nutrition_totals_per_serving, log.quantity
+            )
+        elif log.type == "ingredient" and ingredient:
+            grams = grams_by_log.get(log.id)
+            macros = macros_for_grams(
+                ingredient.nutrition_per_100g, log.quantity if grams is None else grams
+            )
+        else:
+            macros = MacroTotals()
+        macros_by_log[log.id] = macros
+    return macros_by_log
+
+
+async def _daily_totals(db: AsyncSession, user_id: int, log_date: date) -> MacroTotals:
+    """
+    Macro totals of a whole day: the stored snapshots are summed in SQL, and the entries
+    without one (NULL or JSON null) are recalculated the same way the entries list does.
+    """
+    totals = await _sum_daily_snapshots(db, user_id, log_date)
+    
+    without_snapshot = (await db.execute(daily_log_stmt(user_id, log_date).where(
+        func.jsonb_typeof(UserFoodLog.nutrition_snapshot).is_distinct_from("object")
+    ))).scalars().all()
+    if without_snapshot:
+        snapshot = await recipe_catalog.get(db)
+        ingredients = await ingredient_cache.get_many(
+            db, {log.ingredient_id for log in without_snapshot if log.ingredient_id is not None}
+        )
+        for macros in _entry_macros(without_snapshot, snapshot, ingredients).values():
+            totals.calories += macros.calories
+            totals.protein += macros.protein
+            totals.carbs += macros.carbs
+            totals.fat += macros.fat
+    return totals
+
+
 @router.post("/recipe", response_model=FoodLogEntryRead, status_code=status.HTTP_201_CREATED)
 async def log_recipe(
     body: RecipeLogCreate,
+    lang: str = Depends(deps.get_lang),
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: CurrentUser = Depends(deps.get_current_user)
 ) -> Any:
     """Log consumption of a recipe."""
-    # Validate recipe exists
-    stmt = select(ExternalRecipe).where(ExternalRecipe.id == body.recipe_id).options(
-        selectinload(ExternalRecipe.translations)
-    )
-    result = await db.execute(stmt)
-    recipe = result.scalar_one_or_none()
+    # Validate recipe exists (title and macros come from the catalog snapshot)
+    recipe = await recipe_catalog.lookup(db, body.recipe_id)
     
     if not recipe:
         raise HTTPException(status_code=404, detail="Recipe not found")
     
     # Get title
-    r_trans = next((t for t in recipe.translations if t.lang == "es"), None)
-    title = r_trans.title if r_trans else recipe.title_original
+    title = recipe.title(lang)
     
     # Calculate macros
     macros = calculate_recipe_macros(recipe.nutrition_totals_per_serving, body.servings)
@@ -119,26 +198,25 @@ async def log_recipe(
 @router.post("/ingredient", response_model=FoodLogEntryRead, status_code=status.HTTP_201_CREATED)
 async def log_ingredient(
     body: IngredientLogCreate,
+    lang: str = Depends(deps.get_lang),
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: CurrentUser = Depends(deps.get_current_user)
 ) -> Any:
     """Log consumption of an ingredient (standalone, not from a recipe)."""
-    # Validate ingredient exists
-    stmt = select(Ingredient).where(Ingredient.id == body.ingredient_id).options(
-        selectinload(Ingredient.translations)
-    )
-    result = await db.execute(stmt)
-    ingredient = result.scalar_one_or_none()
+    # Validate ingredient exists (name and nutrition come from the ingredient cache)
+    ingredient = await ingredient_cache.get(db, body.ingredient_id)
     
     if not ingredient:
         raise HTTPException(status_code=404, detail="Ingredient not found")
     
     # Get name
-    i_trans = next((t for t in ingredient.translations if t.lang == "es"), None)
-    name = i_trans.name if i_trans else (ingredient.display_name or ingredient.canonical_name)
+    name = ingredient.name(lang)
     
     # Calculate macros
-    macros = calculate_ingredient_macros(ingredient.nutrition_per_100g, body.quantity, body.unit)
+    macros = calculate_ingredient_macros(
+        ingredient.nutrition_per_100g, body.quantity, body.unit,
+        ingredient.density_g_per_ml, ingredient.piece_weight_g
+    )
     
     # Determine log time
     logged_at = body.logged_at or datetime.now()
@@ -177,57 +255,56 @@ async def log_ingredient(
 @router.get("/daily-summary", response_model=DailySummary)
 async def get_daily_summary(
     log_date: date = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    lang: str = Depends(deps.get_lang),
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: CurrentUser = Depends(deps.get_current_user)
 ) -> Any:
-    """Get the daily summary of food logs with macro totals."""
+    """
+    Get the daily summary of food logs with macro totals.
+    Pass limit (and then next_cursor as cursor) to page through the entries;
+    totals always cover the whole day.
+    """
     if log_date is None:
         log_date = date.today()
     
-    # Fetch logs for the date
-    stmt = select(UserFoodLog).where(
-        UserFoodLog.user_id == current_user.id,
-        UserFoodLog.date == log_date
-    ).options(
-        selectinload(UserFoodLog.recipe).selectinload(ExternalRecipe.translations),
-        selectinload(UserFoodLog.ingredient).selectinload(Ingredient.translations)
-    ).order_by(UserFoodLog.created_at)
+    # Fetch logs for the date.
+    # Recipe titles/macros and ingredient names/nutrition come from the in-process caches.
+    after = decode_cursor(cursor, datetime, int) if cursor else None
+    stmt = daily_log_stmt(current_user.id, log_date, after)
+    if limit:
+        stmt = stmt.limit(limit + 1)
     
     result = await db.execute(stmt)
     logs = result.scalars().all()
     
-    # Build entries and calculate totals
-    entries = []
-    total_macros = MacroTotals()
+    next_cursor = None
+    if limit and len(logs) > limit:
+        logs = logs[:limit]
+        next_cursor = encode_cursor(logs[-1].created_at, logs[-1].id)
+    
+    snapshot = await recipe_catalog.get(db)
+    ingredients = await ingredient_cache.get_many(
+        db, {log.ingredient_id for log in logs if log.ingredient_id is not None}
+    )
+    macros_by_log = _entry_macros(logs, snapshot, ingredients)
     
+    # Build entries
+    entries = []
     for log in logs:
-        # Get macros from snapshot or recalculate
-        if log.nutrition_snapshot:
-            macros = MacroTotals(**log.nutrition_snapshot)
-        elif log.type == "recipe" and log.recipe:
-            macros = calculate_recipe_macros(
-                log.recipe.nutrition_totals_per_serving, log.quantity
-            )
-        elif log.type == "ingredient" and log.ingredient:
-            macros = calculate_ingredient_macros(
-                log.ingredient.nutrition_per_100g, log.quantity, log.unit
-            )
-        else:
-            macros = MacroTotals()
+        recipe = snapshot.get(log.recipe_id) if log.recipe_id is not None else None
+        ingredient = ingredients.get(log.ingredient_id)
         
         # Get names
         recipe_title = None
         ingredient_name = None
         
-        if log.type == "recipe" and log.recipe:
-            r_trans = next((t for t in log.recipe.translations if t.lang == "es"), None)
-            recipe_title = r_trans.title if r_trans else log.recipe.title_original
+        if log.type == "recipe" and recipe:
+            recipe_title = recipe.title(lang)
         
-        if log.type == "ingredient" and log.ingredient:
-            i_trans = next((t for t in log.ingredient.translations if t.lang == "es"), None)
-            ingredient_name = i_trans.name if i_trans else (
-                log.ingredient.display_name or log.ingredient.canonical_name
-            )
+        if log.type == "ingredient" and ingredient:
+            ingredient_name = ingredient.name(lang)
         
         entries.append(FoodLogEntryRead(
             id=log.id,
@@ -239,14 +316,11 @@ async def get_daily_summary(
             quantity=log.quantity,
             unit=log.unit,
             logged_at=log.created_at,
-            macros=macros
+            macros=macros_by_log[log.id]
         ))
-        
-        # Accumulate totals
-        total_macros.calories += macros.calories
-        total_macros.protein += macros.protein
-        total_macros.carbs += macros.carbs
-        total_macros.fat += macros.fat
+    
+    # Totals always cover the whole day, however the entries are paged
+    total_macros = await _daily_totals(db, current_user.id, log_date)
     
     # Round totals
     total_macros.calories = round(total_macros.calories, 1)
@@ -257,7 +331,8 @@ async def get_daily_summary(
     return DailySummary(
         date=log_date,
         totals=total_macros,
-        entries=entries
+        entries=entries,
+        next_cursor=next_cursor
     )
 
 
@@ -265,7 +340,7 @@ async def get_daily_summary(
 async def delete_log_entry(
     log_id: int,
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: CurrentUser = Depends(deps.get_current_user)
 ) -> None:
     """Delete a food log entry."""
     stmt = select(UserFoodLog).where(
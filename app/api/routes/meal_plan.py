@@ -0,0 +1,103 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from datetime import date, datetime, timedelta
+from typing import Any, Optional
+
+from app.api import deps
+from app.models.user_pantry_log import PantryItem
+from app.services.user_cache import CurrentUser
+from app.schemas.log import MacroTotals
+from app.schemas.meal_plan import MealPlan, MealPlanDay, MealPlanMeal, MealPlanTargets
+from app.services.cookable import cookable_engine
+from app.services.diet_mask import acceptable_diet_mask, compute_intolerance_mask
+from app.services.meal_plan import EXPIRING_WEIGHT, PANTRY_WEIGHT, macro_matrix_cache, plan_meals
+
+router = APIRouter()
+
+
+@router.get("/", response_model=MealPlan)
+async def get_meal_plan(
+    days: int = Query(7, ge=1, le=14),
+    meals_per_day: int = Query(3, ge=1, le=6),
+    calories: float = Query(2000, gt=0),
+    protein: Optional[float] = Query(None, gt=0),
+    carbs: Optional[float] = Query(None, gt=0),
+    fat: Optional[float] = Query(None, gt=0),
+    start_date: date = None,
+    expiring_days: int = Query(3, ge=0, le=30),
+    seed: Optional[int] = None,
+    lang: str = Depends(deps.get_lang),
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user: CurrentUser = Depends(deps.get_current_user)
+) -> Any:
+    """
+    Plan meals_per_day recipes per day that fit the daily macro targets.
+    
+    - Only recipes compatible with the user's diet and intolerances are used.
+    - Recipes using pantry ingredients (and especially expiring ones) are preferred.
+    - seed: pass a different value to get another plan (default: stable per user)
+    """
+    if start_date is None:
+        start_date = date.today()
+    
+    # 1. Pantry ingredients, and those expiring soon
+    rows = (await db.execute(
+        select(PantryItem.ingredient_id, PantryItem.expires_at).where(PantryItem.user_id == current_user.id)
+    )).all()
+    today = datetime.combine(date.today(), datetime.min.time())
+    expiring_until = today + timedelta(days=expiring_days + 1)
+    pantry_ids = {row.ingredient_id for row in rows}
+    expiring_ids = {
+        row.ingredient_id for row in rows
+        if row.expires_at is not None and today <= row.expires_at.replace(tzinfo=None) < expiring_until
+    }
+    
+    # 2. Catalog matrices (cached per catalog snapshot)
+    index = await cookable_engine.get_index(db)
+    matrix = macro_matrix_cache.get(index)
+    
+    eligible = index.diet_filter(
+        acceptable_diet_mask(current_user.diet_type),
+        compute_intolerance_mask(current_user.intolerances)
+    )
+    coverage = index.coverage_of(index.matched_counts(pantry_ids))
+    expiring_matched = index.matched_counts(expiring_ids)
+    bonus = PANTRY_WEIGHT * coverage + EXPIRING_WEIGHT * expiring_matched
+    
+    # 3. Vectorized planning
+    targets = MealPlanTargets(calories=calories, protein=protein, carbs=carbs, fat=fat)
+    planned = plan_meals(
+        matrix,
+        eligible,
+        [calories, protein, carbs, fat],
+        days,
+        meals_per_day,
+        bonus,
+        seed=current_user.id if seed is None else seed
+    )
+    
+    # 4. Build response
+    plan_days = []
+    for day_offset, day in enumerate(planned):
+        meals = []
+        for pos in day.positions:
+            r = index.recipes[pos]
+            meals.append(MealPlanMeal(
+                id=r.id,
+                title=r.title(lang),
+                image_url=r.image_url,
+                servings=r.servings,
+                nutrition_totals_per_serving=r.nutrition_totals_per_serving,
+                pantry_coverage=round(float(coverage[pos]), 2),
+                expiring_ingredients_count=int(expiring_matched[pos])
+            ))
+        
+        calories_total, protein_total, carbs_total, fat_total = (round(float(v), 1) for v in day.totals)
+        plan_days.append(MealPlanDay(
+            date=start_date + timedelta(days=day_offset),
+            meals=meals,
+            totals=MacroTotals(calories=calories_total, protein=protein_total, carbs=carbs_total, fat=fat_total)
+        ))
+    
+    return MealPlan(targets=targets, days=plan_days)
@@ -1,62 +1,107 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
-from typing import List
+from sqlalchemy import select, update
+from typing import List, Optional
 
 from app.api import deps
+from app.api.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, encode_cursor, decode_cursor, keyset_after
 from app.models.user_pantry_log import User, PantryItem
-from app.models.ingredient import Ingredient, IngredientTranslation
+from app.services.user_cache import CurrentUser, user_cache
 from app.schemas.pantry import PantryItemCreate, PantryItemUpdate, PantryItemRead
+from app.services.ingredient_cache import ingredient_cache
+from app.services.catalog_events import notify_user_changed
+from app.db.routing import mark_user_write
 
 router = APIRouter()
 
+
+async def _commit_pantry_change(db: AsyncSession, user_id: int) -> None:
+    """
+    Bump the user's pantry_version and commit the pending pantry write with it.
+
+    The version invalidates the ETags of pantry-dependent responses (recipe
+    availability). Cached users carry the version: other workers drop this one when
+    the NOTIFY arrives on commit, and this worker drops it right after the commit, so
+    its next request can't revalidate against the old version.
+    """
+    await db.execute(
+        update(User).where(User.id == user_id).values(pantry_version=User.pantry_version + 1)
+    )
+    await notify_user_changed(db, user_id)
+    # Also marked by the user event; this covers a worker whose listener is down
+    mark_user_write(user_id)
+    await db.commit()
+    user_cache.invalidate(user_id)
+
+
+def _to_read(item: PantryItem, name: str) -> PantryItemRead:
+    return PantryItemRead(
+        id=item.id,
+        ingredient_id=item.ingredient_id,
+        ingredient_name=name,
+        quantity=item.quantity,
+        unit=item.unit,
+        expires_at=item.expires_at,
+        created_at=item.created_at,
+        updated_at=item.updated_at
+    )
+
+
+def pantry_items_stmt(user_id: int, after_id: Optional[int] = None):
+    """The user's pantry items ordered by id, after the cursor's id if given."""
+    stmt = select(PantryItem).where(PantryItem.user_id == user_id).order_by(PantryItem.id)
+    if after_id is not None:
+        stmt = stmt.where(keyset_after([PantryItem.id], [after_id]))
+    return stmt
+
+
 @router.get("/", response_model=List[PantryItemRead])
 async def get_pantry_items(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    paginate: bool = Query(True, description="false returns the whole pantry in one response"),
+    lang: str = Depends(deps.get_lang),
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: CurrentUser = Depends(deps.get_current_user)
 ):
-    
-    # Fetch Pantry Items with Ingredients and Translations
-    stmt = select(PantryItem).where(PantryItem.user_id == current_user.id).options(
-        selectinload(PantryItem.ingredient).selectinload(Ingredient.translations)
-    )
+    """
+    List the user's pantry ordered by id, one page of `limit` items at a time;
+    the cursor for the next page is returned in the X-Next-Cursor header.
+    """
+    # Fetch Pantry Items (names come from the ingredient cache)
+    after_id = decode_cursor(cursor, int)[0] if cursor else None
+    stmt = pantry_items_stmt(current_user.id, after_id)
+    if paginate:
+        stmt = stmt.limit(limit + 1)
+
     result = await db.execute(stmt)
     items = result.scalars().all()
-    
-    response = []
-    for item in items:
-        # Resolve Name
-        ing = item.ingredient
-        # Find ES translation
-        trans = next((t for t in ing.translations if t.lang == "es"), None)
-        name = trans.name if trans else (ing.display_name or ing.canonical_name)
-        
-        response.append(PantryItemRead(
-            id=item.id,
-            ingredient_id=item.ingredient_id,
-            ingredient_name=name,
-            quantity=item.quantity,
-            unit=item.unit,
-            expires_at=item.expires_at,
-            created_at=item.created_at,
-            updated_at=item.updated_at
-        ))
-        
-    return response
+
+    if paginate and len(items) > limit:
+        items = items[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(items[-1].id)
+
+    ingredients = await ingredient_cache.get_many(db, {item.ingredient_id for item in items})
+
+    return [
+        _to_read(item, ingredients[item.ingredient_id].name(lang))
+        for item in items
+    ]
 
 @router.post("/", response_model=PantryItemRead, status_code=status.HTTP_201_CREATED)
 async def create_pantry_item(
     item_in: PantryItemCreate,
+    lang: str = Depends(deps.get_lang),
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: CurrentUser = Depends(deps.get_current_user)
 ):
-    
+
     # 1. Validate Ingredient Exists
-    ing = await db.get(Ingredient, item_in.ingredient_id)
+    ing = await ingredient_cache.get(db, item_in.ingredient_id)
     if not ing:
         raise HTTPException(status_code=404, detail="Ingredient not found")
-        
+
     # 2. Check Duplicates for User
     stmt = select(PantryItem).where(
         PantryItem.user_id == current_user.id,
@@ -64,10 +109,10 @@ async def create_pantry_item(
     )
     result = await db.execute(stmt)
     existing = result.scalar_one_or_none()
-    
+
     if existing:
         raise HTTPException(status_code=400, detail="Item already in pantry. Use PATCH to update.")
-        
+
     # 3. Create
     new_item = PantryItem(
         user_id=current_user.id,
@@ -77,116 +122,69 @@ async def create_pantry_item(
         expires_at=item_in.expires_at
     )
     db.add(new_item)
-    await db.commit()
+    await _commit_pantry_change(db, current_user.id)
     await db.refresh(new_item)
-    
-    # Reload for naming logic (could be optimized)
-    stmt_refetch = select(PantryItem).where(PantryItem.id == new_item.id).options(
-         selectinload(PantryItem.ingredient).selectinload(Ingredient.translations)
-    )
-    res_refetch = await db.execute(stmt_refetch)
-    final_item = res_refetch.scalar_one()
-    
-    # Resolve Name
-    ing = final_item.ingredient
-    trans = next((t for t in ing.translations if t.lang == "es"), None)
-    name = trans.name if trans else (ing.display_name or ing.canonical_name)
-    
-    return PantryItemRead(
-        id=final_item.id,
-        ingredient_id=final_item.ingredient_id,
-        ingredient_name=name,
-        quantity=final_item.quantity,
-        unit=final_item.unit,
-        expires_at=final_item.expires_at,
-        created_at=final_item.created_at,
-        updated_at=final_item.updated_at
-    )
+
+    return _to_read(new_item, ing.name(lang))
 
 @router.get("/{item_id}", response_model=PantryItemRead)
 async def get_pantry_item(
     item_id: int,
+    lang: str = Depends(deps.get_lang),
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: CurrentUser = Depends(deps.get_current_user)
 ):
     stmt = select(PantryItem).where(
         PantryItem.id == item_id,
         PantryItem.user_id == current_user.id
-    ).options(
-         selectinload(PantryItem.ingredient).selectinload(Ingredient.translations)
     )
     result = await db.execute(stmt)
     item = result.scalar_one_or_none()
-    
+
     if not item:
         raise HTTPException(status_code=404, detail="Pantry item not found")
-        
+
     # Resolve Name
-    ing = item.ingredient
-    trans = next((t for t in ing.translations if t.lang == "es"), None)
-    name = trans.name if trans else (ing.display_name or ing.canonical_name)
-    
-    return PantryItemRead(
-        id=item.id,
-        ingredient_id=item.ingredient_id,
-        ingredient_name=name,
-        quantity=item.quantity,
-        unit=item.unit,
-        expires_at=item.expires_at,
-        created_at=item.created_at,
-        updated_at=item.updated_at
-    )
+    ing = await ingredient_cache.get(db, item.ingredient_id)
+    return _to_read(item, ing.name(lang))
 
 @router.patch("/{item_id}", response_model=PantryItemRead)
 async def update_pantry_item(
     item_id: int,
     item_update: PantryItemUpdate,
+    lang: str = Depends(deps.get_lang),
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: CurrentUser = Depends(deps.get_current_user)
 ):
     stmt = select(PantryItem).where(
         PantryItem.id == item_id,
         PantryItem.user_id == current_user.id
-    ).options(
-         selectinload(PantryItem.ingredient).selectinload(Ingredient.translations)
     )
     result = await db.execute(stmt)
     item = result.scalar_one_or_none()
-    
+
     if not item:
         raise HTTPException(status_code=404, detail="Pantry item not found")
-        
+
     if item_update.quantity is not None:
         item.quantity = item_update.quantity
     if item_update.unit is not None:
         item.unit = item_update.unit
     if item_update.expires_at is not None:
         item.expires_at = item_update.expires_at
-        
-    await db.commit()
+
+    await _commit_pantry_change(db, current_user.id)
     await db.refresh(item)
-    
+
     # Resolve Name
-    ing = item.ingredient
-    trans = next((t for t in ing.translations if t.lang == "es"), None)
-    name = trans.name if trans else (ing.display_name or ing.canonical_name)
-    
-    return PantryItemRead(
-        id=item.id,
-        ingredient_id=item.ingredient_id,
-        ingredient_name=name,
-        quantity=item.quantity,
-        unit=item.unit,
-        expires_at=item.expires_at,
-        created_at=item.created_at,
-        updated_at=item.updated_at
-    )
+    ing = await ingredient_cache.get(db, item.ingredient_id)
+    return _to_read(item, ing.name(lang))
 
 @router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_pantry_item(
     item_id: int,
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: CurrentUser = Depends(deps.get_current_user)
 ):
     stmt = select(PantryItem).where(
         PantryItem.id == item_id,
@@ -194,9 +192,9 @@ async def delete_pantry_item(
     )
     result = await db.execute(stmt)
     item = result.scalar_one_or_none()
-    
+
     if not item:
         raise HTTPException(status_code=404, detail="Pantry item not found")
-        
+
     await db.delete(item)
-    await db.commit()
+    await _commit_pantry_change(db, current_user.id)
@@ -4,6 +4,8 @@ from typing import Any
 
 from app.api import deps
 from app.models.user_pantry_log import User
+from app.services.user_cache import CurrentUser, user_cache
+from app.services.catalog_events import notify_user_changed
 from app.schemas.user import UserProfileRead, UserProfileUpdate
 
 router = APIRouter()
@@ -17,7 +19,7 @@ VALID_INTOLERANCES = {"gluten", "dairy", "egg", "nut", "soy", "shellfish", "fish
 
 @router.get("/", response_model=UserProfileRead)
 async def get_profile(
-    current_user: User = Depends(deps.get_current_user)
+    current_user: CurrentUser = Depends(deps.get_current_user)
 ) -> Any:
     """Get the current user's profile including diet preferences and intolerances."""
     return UserProfileRead(
@@ -32,33 +34,39 @@ async def get_profile(
 async def update_profile(
     profile_update: UserProfileUpdate,
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: CurrentUser = Depends(deps.get_current_user)
 ) -> Any:
     """Update the current user's profile (diet_type, intolerances, name)."""
+    user = await db.get(User, current_user.id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
     
     # Update diet_type if provided
     if profile_update.diet_type is not None:
         if profile_update.diet_type != "" and profile_update.diet_type.lower() not in VALID_DIET_TYPES:
             # Soft warning but still allow
             pass
-        current_user.diet_type = profile_update.diet_type if profile_update.diet_type else None
+        user.diet_type = profile_update.diet_type if profile_update.diet_type else None
     
     # Update intolerances if provided
     if profile_update.intolerances is not None:
         # Normalize to lowercase
         normalized = [i.lower() for i in profile_update.intolerances]
-        current_user.intolerances = normalized
+        user.intolerances = normalized
     
     # Update name if provided
     if profile_update.name is not None:
-        current_user.name = profile_update.name
+        user.name = profile_update.name
     
+    # Other workers drop their cached copy when this commits
+    await notify_user_changed(db, user.id)
     await db.commit()
-    await db.refresh(current_user)
+    await db.refresh(user)
+    user_cache.invalidate(user.id)
     
     return UserProfileRead(
-        diet_type=current_user.diet_type,
-        intolerances=current_user.intolerances or [],
-        name=current_user.name,
-        email=current_user.email
+        diet_type=user.diet_type,
+        intolerances=user.intolerances or [],
+        name=user.name,
+        email=user.email
     )
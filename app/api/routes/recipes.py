@@ -1,18 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from bisect import bisect_right
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, and_, func, cast, distinct, true, Date, Float
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from app.api import deps
+from app.api.pagination import MAX_PAGE_SIZE, encode_cursor, decode_cursor, keyset_after, keyset_before
+from app.api.etag import check_not_modified, profile_hash
 from app.models.recipe import ExternalRecipe, RecipeTranslation, RecipeIngredient
 from app.models.ingredient import Ingredient, IngredientTranslation
-from app.models.user_pantry_log import User, PantryItem, ShoppingListItem
-from app.schemas.recipe import RecipeList, RecipeDetail
+from app.models.user_pantry_log import PantryItem, ShoppingListItem
+from app.services.user_cache import CurrentUser
+from app.schemas.recipe import RecipeList, RecipeDetail, RecipeSimilar
 from app.schemas.ingredient import IngredientInRecipe
+from app.services.recipe_catalog import CatalogRecipe, recipe_catalog, select_recipe_cards
+from app.services.recipe_search import search_query
+from app.services.cookable import cookable_engine
+from app.services.similarity import similarity_index
+from app.services.units import convert_many, merge_quantities, unit_key
+from app.services.ingredient_cache import ingredient_cache
+from app.services.diet_mask import (
+    compute_diet_mask, compute_intolerance_mask,
+    acceptable_diet_mask, is_diet_compatible, intolerance_labels
+)
 from pydantic import BaseModel
 from typing import Any, List, Optional
 
 router = APIRouter()
 
+# Max recipe details returned by GET /recipes/batch
+MAX_BATCH_RECIPES = 20
+
 
 class AddMissingRequest(BaseModel):
     include_partially_available: bool = True
@@ -32,25 +49,25 @@ class AddedItemResponse(BaseModel):
 async def get_pantry_for_ingredients(
     db: AsyncSession, 
     user_id: int, 
-    ingredient_ids: List[int]
+    ingredient_ids: Optional[List[int]] = None
 ) -> dict:
     """
-    Get pantry quantities for given ingredient IDs, grouped by ingredient_id and unit.
+    Get pantry quantities for given ingredient IDs (the whole pantry if None),
+    grouped by ingredient_id and unit.
     Returns: {ingredient_id: {unit: total_quantity}}
     """
-    stmt = select(PantryItem).where(
-        PantryItem.user_id == user_id,
-        PantryItem.ingredient_id.in_(ingredient_ids)
-    )
+    stmt = select(PantryItem).where(PantryItem.user_id == user_id)
+    if ingredient_ids is not None:
+        stmt = stmt.where(PantryItem.ingredient_id.in_(ingredient_ids))
     result = await db.execute(stmt)
     pantry_items = result.scalars().all()
     
-    # Group by ingredient_id and unit
+    # Group by ingredient_id and unit (spellings of the same unit are merged: "gr" -> "g")
     pantry_map = {}
     for item in pantry_items:
         if item.ingredient_id not in pantry_map:
             pantry_map[item.ingredient_id] = {}
-        unit = item.unit or ""
+        unit = unit_key(item.unit)
         if unit not in pantry_map[item.ingredient_id]:
             pantry_map[item.ingredient_id][unit] = 0
         pantry_map[item.ingredient_id][unit] += item.quantity
@@ -61,10 +78,14 @@ async def get_pantry_for_ingredients(
 def calculate_availability(
     recipe_amount: float | None,
     recipe_unit: str | None,
-    pantry_map: dict
+    pantry_map: dict,
+    density_g_per_ml: float | None = None,
+    piece_weight_g: float | None = None
 ) -> tuple[float, str | None, bool, float | None]:
     """
     Calculate availability for an ingredient.
+    Pantry quantities in other units are converted to the recipe unit (app.services.units),
+    using the ingredient's density / piece weight when the dimensions differ.
     Returns: (pantry_quantity, pantry_unit, is_available, missing_quantity)
     """
     recipe_amount = recipe_amount or 0
@@ -74,32 +95,27 @@ def calculate_availability(
         # No pantry items for this ingredient
         return 0, None, False, recipe_amount if recipe_amount > 0 else None
     
-    # Check if we have matching unit
-    if recipe_unit in pantry_map:
-        pantry_qty = pantry_map[recipe_unit]
+    # Convert every pantry entry to the recipe unit in one batch
+    converted = convert_many(
+        (qty, unit, recipe_unit, density_g_per_ml, piece_weight_g)
+        for unit, qty in pantry_map.items()
+    )
+    convertible = [qty for qty in converted if qty is not None]
+    
+    if convertible:
+        pantry_qty = round(sum(convertible), 2)
         is_available = pantry_qty >= recipe_amount
-        missing = max(recipe_amount - pantry_qty, 0) if not is_available else 0
+        missing = round(max(recipe_amount - pantry_qty, 0), 2) if not is_available else 0
         return pantry_qty, recipe_unit, is_available, missing if missing > 0 else None
     
-    # If unit doesn't match, consider as not available (no conversion)
-    # But show what we have in the first available unit
+    # Units can't be converted (e.g. pieces without a known weight): not available,
+    # but show what we have in the first available unit
     first_unit = list(pantry_map.keys())[0]
     first_qty = pantry_map[first_unit]
     return first_qty, first_unit, False, recipe_amount
 
 
 
-# Diet compatibility mapping: diet_type -> acceptable recipe diet labels
-DIET_COMPATIBILITY = {
-    "vegan": ["vegan"],
-    "vegetarian": ["vegetarian", "vegan"],
-    "pescatarian": ["pescatarian", "vegetarian", "vegan"],
-    "omnivore": None,  # None means all diets are ok
-    "keto": ["ketogenic", "keto"],
-    "paleo": ["paleo", "whole30"],
-}
-
-
 def check_diet_compatible(recipe_diets: list, user_diet: str) -> bool:
     """
     Check if recipe is compatible with user's diet.
@@ -111,21 +127,9 @@ def check_diet_compatible(recipe_diets: list, user_diet: str) -> bool:
     - omnivore/None: all recipes are ok
     
     Recipes WITHOUT diet labels are treated as "unknown" - they pass for omnivore only.
+    Prefer is_diet_compatible with the stored ExternalRecipe.diet_mask when the recipe row is at hand.
     """
-    if not user_diet or user_diet.lower() == "omnivore":
-        return True  # Omnivores can eat everything
-    
-    acceptable_labels = DIET_COMPATIBILITY.get(user_diet.lower())
-    if acceptable_labels is None:
-        return True  # Unknown diet type, allow all
-    
-    if not recipe_diets:
-        # Recipe has no diet labels - we can't confirm it's safe for restrictive diets
-        return False
-    
-    # Check if recipe has at least one of the acceptable labels
-    recipe_diets_lower = [d.lower() for d in recipe_diets]
-    return any(label in recipe_diets_lower for label in acceptable_labels)
+    return is_diet_compatible(compute_diet_mask(recipe_diets), user_diet)
 
 
 def get_intolerance_warnings(recipe_intolerances: list, user_intolerances: list) -> list:
@@ -138,15 +142,150 @@ def get_intolerance_warnings(recipe_intolerances: list, user_intolerances: list)
     return list(recipe_set & user_set)
 
 
+def get_user_compatibility(recipe: ExternalRecipe, user: CurrentUser) -> tuple[bool | None, list]:
+    """
+    Compatibility flags shown on recipe cards/details, derived from the recipe masks.
+    Returns: (is_compatible_with_user, intolerance_warnings)
+    """
+    if not user or not (user.diet_type or user.intolerances):
+        return None, []
+    
+    diet_ok = is_diet_compatible(recipe.diet_mask, user.diet_type) if user.diet_type else True
+    conflicts = (recipe.intolerance_mask or 0) & compute_intolerance_mask(user.intolerances)
+    intolerance_warnings = intolerance_labels(conflicts)
+    
+    return diet_ok and not intolerance_warnings, intolerance_warnings
+
+
+def recipe_filter_clauses(diet_type: str | None, intolerances: list | None) -> list:
+    """
+    SQL equivalent of check_diet_compatible / get_intolerance_warnings, used to filter
+    recipes in the database. Both predicates are a single AND against the stored masks.
+    Recipes without ingredients are always excluded.
+    """
+    clauses = [
+        ExternalRecipe.ingredient_count > 0
+    ]
+    
+    required_diet_mask = acceptable_diet_mask(diet_type)
+    if required_diet_mask is not None:
+        # Recipe must have at least one of the acceptable labels (no labels fails)
+        clauses.append(ExternalRecipe.diet_mask.op("&")(required_diet_mask) != 0)
+    
+    excluded_mask = compute_intolerance_mask(intolerances)
+    if excluded_mask:
+        clauses.append(ExternalRecipe.intolerance_mask.op("&")(excluded_mask) == 0)
+    
+    return clauses
+
+
+def resolve_filters(
+    diet_type: str | None, exclude_intolerances: list | None, use_user_profile: bool, user: CurrentUser
+) -> tuple[str | None, list]:
+    """Effective (diet, intolerances): explicit params win, the user's profile fills the gaps."""
+    effective_diet = diet_type
+    effective_intolerances = exclude_intolerances or []
+    
+    if use_user_profile and user:
+        if not effective_diet and user.diet_type:
+            effective_diet = user.diet_type
+        if not effective_intolerances and user.intolerances:
+            effective_intolerances = user.intolerances
+    
+    return effective_diet, effective_intolerances
+
+
+def parse_id_list(value: str | None, name: str) -> List[int]:
+    """Distinct ids, in order, from a comma-separated query parameter (400 on bad input)."""
+    if not value:
+        return []
+    try:
+        return list(dict.fromkeys(int(i) for i in value.split(",") if i.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"{name} must be a comma-separated list of integers")
+
+
+def select_recipe_ingredient_rows(recipe_ids: List[int], user_id: int, lang: str):
+    """
+    One statement for the ingredient rows of the given recipes, each with its localized
+    name and the user's pantry quantities per unit ({unit: quantity}, or NULL).
+    
+    The pantry side is a LATERAL lookup per row; (user_id, ingredient_id, unit) is unique,
+    so jsonb_object_agg over the matching pantry rows already yields totals per unit.
+    """
+    pantry = select(
+        func.jsonb_object_agg(PantryItem.unit, PantryItem.quantity).label("pantry")
+    ).where(
+        PantryItem.user_id == user_id,
+        PantryItem.ingredient_id == RecipeIngredient.ingredient_id
+    ).lateral("pantry")
+    
+    return select(
+        RecipeIngredient.recipe_id,
+        RecipeIngredient.ingredient_id,
+        RecipeIngredient.amount,
+        RecipeIngredient.unit,
+        RecipeIngredient.nutrition_for_amount,
+        Ingredient.canonical_name,
+        Ingredient.density_g_per_ml,
+        Ingredient.piece_weight_g,
+        func.coalesce(
+            IngredientTranslation.name, Ingredient.display_name, Ingredient.canonical_name
+        ).label("name"),
+        pantry.c.pantry
+    ).join(
+        Ingredient, Ingredient.id == RecipeIngredient.ingredient_id
+    ).outerjoin(IngredientTranslation, and_(
+        IngredientTranslation.ingredient_id == Ingredient.id,
+        IngredientTranslation.lang == lang
+    )).outerjoin(
+        pantry, true()
+    ).where(
+        RecipeIngredient.recipe_id.in_(recipe_ids)
+    ).order_by(RecipeIngredient.recipe_id, RecipeIngredient.id)
+
+
+def ingredient_in_recipe(row) -> IngredientInRecipe:
+    """IngredientInRecipe with availability from a select_recipe_ingredient_rows row."""
+    pantry_qty, pantry_unit, is_available, missing = calculate_availability(
+        row.amount, row.unit, merge_quantities(row.pantry or {}),
+        row.density_g_per_ml, row.piece_weight_g
+    )
+    return IngredientInRecipe(
+        id=row.ingredient_id,
+        name=row.name,
+        canonical_name=row.canonical_name,
+        amount=row.amount,
+        unit=row.unit,
+        nutrition=row.nutrition_for_amount,
+        pantry_quantity=pantry_qty if pantry_qty > 0 else None,
+        pantry_unit=pantry_unit,
+        is_available=is_available,
+        missing_quantity=missing
+    )
+
+
+async def _get_recipe_ingredients(db: AsyncSession, recipe_id: int) -> List[RecipeIngredient]:
+    """RecipeIngredient rows of a recipe, without eager loads (names come from the ingredient cache)."""
+    stmt = select(RecipeIngredient).where(
+        RecipeIngredient.recipe_id == recipe_id
+    ).order_by(RecipeIngredient.id)
+    return (await db.execute(stmt)).scalars().all()
+
+
 @router.get("/", response_model=dict)
 async def get_recipes(
+    request: Request,
+    response: Response,
     skip: int = 0,
-    limit: int = 20,
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     diet_type: str = None,
     exclude_intolerances: List[str] = Query(None),
     use_user_profile: bool = False,
-    db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user)
+    lang: str = Depends(deps.get_lang),
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user: CurrentUser = Depends(deps.get_current_user)
 ) -> Any:
     """
     Get recipes list with optional filtering by diet and intolerances.
@@ -154,204 +293,417 @@ async def get_recipes(
     - diet_type: Filter by diet (vegan, vegetarian, etc.)
     - exclude_intolerances: Exclude recipes with these intolerances
     - use_user_profile: If true, use current user's diet/intolerances as defaults
+    - cursor: Opaque cursor from a previous page's next_cursor (keyset mode).
+      If omitted, skip is used as an offset (fallback mode).
+    
+    Supports If-None-Match: the ETag covers the catalog version, the user's profile and the query.
     """
-    # Resolve effective diet and intolerances
-    effective_diet = diet_type
-    effective_intolerances = exclude_intolerances or []
+    not_modified = check_not_modified(request, response, profile_hash(current_user))
+    if not_modified:
+        return not_modified
     
-    if use_user_profile and current_user:
-        if not effective_diet and current_user.diet_type:
-            effective_diet = current_user.diet_type
-        if not effective_intolerances and current_user.intolerances:
-            effective_intolerances = current_user.intolerances
+    effective_diet, effective_intolerances = resolve_filters(
+        diet_type, exclude_intolerances, use_user_profile, current_user
+    )
     
-    # Fetch recipes with translations and ingredients
-    stmt = select(ExternalRecipe).options(
-        selectinload(ExternalRecipe.translations),
-        selectinload(ExternalRecipe.ingredients)
+    # Filter and paginate over the in-memory catalog snapshot
+    snapshot = await recipe_catalog.get(db)
+    ids, matches = snapshot.filtered(
+        acceptable_diet_mask(effective_diet),
+        compute_intolerance_mask(effective_intolerances)
     )
+    total_filtered = len(matches)
     
-    result = await db.execute(stmt)
-    all_recipes = result.scalars().all()
+    if cursor:
+        (last_id,) = decode_cursor(cursor, int)
+        start = bisect_right(ids, last_id)
+    else:
+        start = skip
     
-    # Filter recipes
-    filtered_recipes = []
-    for r in all_recipes:
-        # Skip recipes without ingredients
-        if not r.ingredients or len(r.ingredients) == 0:
-            continue
-            
-        recipe_diets = r.diets or []
-        recipe_intolerances = r.intolerances_warn or []
-        
-        # Diet filter
-        if effective_diet:
-            if not check_diet_compatible(recipe_diets, effective_diet):
-                continue
-        
-        # Intolerance filter
-        if effective_intolerances:
-            warnings = get_intolerance_warnings(recipe_intolerances, effective_intolerances)
-            if warnings:
-                continue  # Skip recipes with user's intolerances
-        
-        filtered_recipes.append(r)
-    
-    # Apply pagination
-    paginated = filtered_recipes[skip:skip + limit]
+    paginated = matches[start:start + limit]
+    next_cursor = encode_cursor(paginated[-1].id) if start + limit < total_filtered else None
     
     # Build output with compatibility info
     output = []
     for r in paginated:
-        trans = next((t for t in r.translations if t.lang == "es"), None)
-        title = trans.title if trans else r.title_original
-        
         # Calculate compatibility based on user profile
-        is_compatible = None
-        intolerance_warnings = []
-        
-        if current_user and (current_user.diet_type or current_user.intolerances):
-            recipe_diets = r.diets or []
-            recipe_intolerances = r.intolerances_warn or []
-            
-            diet_ok = check_diet_compatible(recipe_diets, current_user.diet_type) if current_user.diet_type else True
-            intolerance_warnings = get_intolerance_warnings(recipe_intolerances, current_user.intolerances or [])
-            
-            is_compatible = diet_ok and len(intolerance_warnings) == 0
+        is_compatible, intolerance_warnings = get_user_compatibility(r, current_user)
         
         output.append(RecipeList(
             id=r.id,
-            title=title,
+            title=r.title(lang),
             image_url=r.image_url,
             servings=r.servings,
             nutrition_totals_per_serving=r.nutrition_totals_per_serving,
             is_compatible_with_user=is_compatible,
             intolerance_warnings=intolerance_warnings,
-            diets=r.diets or []
+            diets=list(r.diets)
         ))
         
-    return {"recipes": output, "total_filtered": len(filtered_recipes)}
+    return {"recipes": output, "total_filtered": total_filtered, "next_cursor": next_cursor}
 
 
 
-@router.get("/{recipe_id}", response_model=RecipeDetail)
-async def get_recipe_detail(
-    recipe_id: int,
-    db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user)
+def search_recipes_stmt(
+    q: str, lang: str, diet_type: str | None, intolerances: list | None, after: tuple | None = None
+):
+    """
+    Matching recipe cards with their localized title and rank, best matches first.
+    after: (rank, id) of the last row of the previous page.
+    """
+    ts_query = search_query(q)
+    rank = func.ts_rank(ExternalRecipe.search_vector, ts_query)
+    
+    # Matching uses the GIN index on search_vector; only matches are ranked
+    stmt = select_recipe_cards().add_columns(
+        RecipeTranslation.title.label("title_translated"),
+        rank.label("rank")
+    ).outerjoin(RecipeTranslation, and_(
+        RecipeTranslation.recipe_id == ExternalRecipe.id,
+        RecipeTranslation.lang == lang
+    )).where(
+        ExternalRecipe.search_vector.op("@@")(ts_query),
+        *recipe_filter_clauses(diet_type, intolerances)
+    ).order_by(rank.desc(), ExternalRecipe.id.desc())
+    
+    if after:
+        stmt = stmt.where(keyset_before([rank, ExternalRecipe.id], list(after)))
+    return stmt
+
+
+@router.get("/search", response_model=dict)
+async def search_recipes(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=2, max_length=200),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    diet_type: str = None,
+    exclude_intolerances: List[str] = Query(None),
+    use_user_profile: bool = False,
+    lang: str = Depends(deps.get_lang),
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user: CurrentUser = Depends(deps.get_current_user)
 ) -> Any:
-    # Fetch recipe with ingredients and translations
-    stmt = select(ExternalRecipe).where(ExternalRecipe.id == recipe_id).options(
-        selectinload(ExternalRecipe.translations),
-        selectinload(ExternalRecipe.ingredients).selectinload(RecipeIngredient.ingredient).selectinload(Ingredient.translations)
+    """
+    Full-text search over titles, ingredient names and instructions, best matches first.
+    
+    - q: Search text (websearch syntax: "exact phrase", or, -exclude)
+    - diet_type / exclude_intolerances / use_user_profile: same filters as GET /recipes/
+    - cursor: Opaque cursor from a previous page's next_cursor
+    """
+    not_modified = check_not_modified(request, response, profile_hash(current_user))
+    if not_modified:
+        return not_modified
+    
+    effective_diet, effective_intolerances = resolve_filters(
+        diet_type, exclude_intolerances, use_user_profile, current_user
     )
     
-    result = await db.execute(stmt)
-    recipe = result.scalar_one_or_none()
+    after = decode_cursor(cursor, float, int) if cursor else None
+    stmt = search_recipes_stmt(q, lang, effective_diet, effective_intolerances, after)
     
-    if not recipe:
-        raise HTTPException(status_code=404, detail="Recipe not found")
+    rows = (await db.execute(stmt.limit(limit + 1))).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].rank, rows[-1].id)
     
-    # Recipe Translation
-    r_trans = next((t for t in recipe.translations if t.lang == "es"), None)
-    title = r_trans.title if r_trans else recipe.title_original
-    instructions = r_trans.instructions if r_trans else recipe.instructions_raw
-    summary = r_trans.summary if r_trans else None
+    output = []
+    for row in rows:
+        is_compatible, intolerance_warnings = get_user_compatibility(row, current_user)
+        
+        output.append(RecipeList(
+            id=row.id,
+            title=row.title_translated or row.title_original,
+            image_url=row.image_url,
+            servings=row.servings,
+            nutrition_totals_per_serving=row.nutrition_totals_per_serving,
+            is_compatible_with_user=is_compatible,
+            intolerance_warnings=intolerance_warnings,
+            diets=row.diets or []
+        ))
+    
+    return {"recipes": output, "next_cursor": next_cursor}
+
+
+async def build_recipe_details(
+    db: AsyncSession, recipes: List[CatalogRecipe], user: CurrentUser, lang: str
+) -> List[RecipeDetail]:
+    """
+    RecipeDetail for each catalog recipe, in order, with two queries whatever the count:
+    instructions/summary, and ingredient rows with names and pantry availability.
+    """
+    recipe_ids = [r.id for r in recipes]
     
-    # Get all ingredient IDs for this recipe
-    ingredient_ids = [ri.ingredient_id for ri in recipe.ingredients]
+    # Instructions are not part of the snapshot
+    stmt = select(
+        ExternalRecipe.id,
+        ExternalRecipe.instructions_raw,
+        RecipeTranslation.id.label("translation_id"),
+        RecipeTranslation.instructions,
+        RecipeTranslation.summary
+    ).outerjoin(RecipeTranslation, and_(
+        RecipeTranslation.recipe_id == ExternalRecipe.id,
+        RecipeTranslation.lang == lang
+    )).where(ExternalRecipe.id.in_(recipe_ids))
+    texts = {row.id: row for row in (await db.execute(stmt)).all()}
     
-    # Get pantry availability for current user
-    pantry_map = await get_pantry_for_ingredients(db, current_user.id, ingredient_ids)
+    # Ingredient rows with localized names and pantry availability, in one query
+    ingredients_by_recipe = {}
+    for row in (await db.execute(select_recipe_ingredient_rows(recipe_ids, user.id, lang))).all():
+        ingredients_by_recipe.setdefault(row.recipe_id, []).append(ingredient_in_recipe(row))
     
-    # Build ingredients list with availability
-    ing_list = []
-    for ri in recipe.ingredients:
-        ing = ri.ingredient
-        # Ing Translation
-        i_trans = next((t for t in ing.translations if t.lang == "es"), None)
-        name = i_trans.name if i_trans else (ing.display_name or ing.canonical_name)
+    details = []
+    for recipe in recipes:
+        text_row = texts.get(recipe.id)
+        has_translation = text_row is not None and text_row.translation_id is not None
         
-        # Calculate availability
-        ing_pantry = pantry_map.get(ing.id, {})
-        pantry_qty, pantry_unit, is_available, missing = calculate_availability(
-            ri.amount, ri.unit, ing_pantry
-        )
+        # Calculate user compatibility
+        is_compatible, intolerance_warnings = get_user_compatibility(recipe, user)
         
-        ing_list.append(IngredientInRecipe(
-            id=ing.id,
-            name=name,
-            canonical_name=ing.canonical_name,
-            amount=ri.amount,
-            unit=ri.unit,
-            nutrition=ri.nutrition_for_amount,
-            pantry_quantity=pantry_qty if pantry_qty > 0 else None,
-            pantry_unit=pantry_unit,
-            is_available=is_available,
-            missing_quantity=missing
+        details.append(RecipeDetail(
+            id=recipe.id,
+            title=recipe.title(lang),
+            image_url=recipe.image_url,
+            servings=recipe.servings,
+            nutrition_totals_per_serving=recipe.nutrition_totals_per_serving,
+            instructions=(text_row.instructions if has_translation else text_row.instructions_raw) if text_row else None,
+            summary=text_row.summary if has_translation else None,
+            ingredients=ingredients_by_recipe.get(recipe.id, []),
+            is_compatible_with_user=is_compatible,
+            intolerance_warnings=intolerance_warnings,
+            diets=list(recipe.diets)
         ))
-        
-    # Calculate user compatibility
-    is_compatible = None
-    intolerance_warnings = []
     
-    if current_user and (current_user.diet_type or current_user.intolerances):
-        recipe_diets = recipe.diets or []
-        recipe_intolerances = recipe.intolerances_warn or []
-        
-        diet_ok = check_diet_compatible(recipe_diets, current_user.diet_type) if current_user.diet_type else True
-        intolerance_warnings = get_intolerance_warnings(recipe_intolerances, current_user.intolerances or [])
-        
-        is_compatible = diet_ok and len(intolerance_warnings) == 0
+    return details
+
+
+@router.get("/batch", response_model=List[RecipeDetail])
+async def get_recipes_batch(
+    request: Request,
+    response: Response,
+    ids: str = Query(..., description="Comma-separated recipe ids, e.g. 12,7,31"),
+    lang: str = Depends(deps.get_lang),
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user: CurrentUser = Depends(deps.get_current_user)
+) -> Any:
+    """
+    Several recipe details in one request (e.g. to preload the next screen).
+    Same output as GET /recipes/{id}, in the requested order; unknown ids are skipped.
+    Uses a constant number of queries regardless of how many ids are asked for.
+    """
+    recipe_ids = parse_id_list(ids, "ids")
+    if not recipe_ids:
+        raise HTTPException(status_code=400, detail="ids is required")
+    if len(recipe_ids) > MAX_BATCH_RECIPES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_RECIPES} ids per request")
+    
+    not_modified = check_not_modified(
+        request, response, profile_hash(current_user), current_user.pantry_version
+    )
+    if not_modified:
+        return not_modified
+    
+    snapshot = await recipe_catalog.get(db)
+    recipes = [r for r in (snapshot.get(i) for i in recipe_ids) if r is not None]
+    if not recipes:
+        return []
+    
+    return await build_recipe_details(db, recipes, current_user, lang)
+
+
+def recipes_by_ingredients_stmt(
+    all_ids: List[int], any_ids: List[int], none_ids: List[int], lang: str,
+    diet_type: str | None, intolerances: list | None, after_id: int | None = None
+):
+    """Recipe cards by ingredient set, with their localized title, ordered by id."""
+    clauses = recipe_filter_clauses(diet_type, intolerances)
+    if all_ids:
+        clauses.append(ExternalRecipe.ingredient_ids.contains(all_ids))
+    if any_ids:
+        clauses.append(ExternalRecipe.ingredient_ids.overlap(any_ids))
+    if none_ids:
+        clauses.append(~ExternalRecipe.ingredient_ids.overlap(none_ids))
+    if after_id is not None:
+        clauses.append(keyset_after([ExternalRecipe.id], [after_id]))
+    
+    return select_recipe_cards().add_columns(
+        RecipeTranslation.title.label("title_translated")
+    ).outerjoin(RecipeTranslation, and_(
+        RecipeTranslation.recipe_id == ExternalRecipe.id,
+        RecipeTranslation.lang == lang
+    )).where(*clauses).order_by(ExternalRecipe.id)
+
+
+@router.get("/by-ingredients", response_model=dict)
+async def get_recipes_by_ingredients(
+    request: Request,
+    response: Response,
+    all_ids: Optional[str] = Query(None, alias="all", description="Comma-separated ingredient ids the recipe must contain, e.g. 3,17"),
+    any_ids: Optional[str] = Query(None, alias="any", description="Comma-separated ingredient ids, at least one must be used"),
+    none_ids: Optional[str] = Query(None, alias="none", description="Comma-separated ingredient ids the recipe must not use"),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    diet_type: str = None,
+    exclude_intolerances: List[str] = Query(None),
+    use_user_profile: bool = False,
+    lang: str = Depends(deps.get_lang),
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user: CurrentUser = Depends(deps.get_current_user)
+) -> Any:
+    """
+    Recipes by ingredient set, in one query on the GIN-indexed ingredient_ids array.
+    
+    - all: Recipe uses every one of these ingredients (@>)
+    - any: Recipe uses at least one of these ingredients (&&)
+    - none: Recipe uses none of these ingredients (NOT &&)
+    - diet_type / exclude_intolerances / use_user_profile: same filters as GET /recipes/
+    - cursor: Opaque cursor from a previous page's next_cursor
+    """
+    all_ids = parse_id_list(all_ids, "all")
+    any_ids = parse_id_list(any_ids, "any")
+    none_ids = parse_id_list(none_ids, "none")
+    if not all_ids and not any_ids:
+        raise HTTPException(status_code=400, detail="At least one of all / any is required")
+    
+    not_modified = check_not_modified(request, response, profile_hash(current_user))
+    if not_modified:
+        return not_modified
+    
+    effective_diet, effective_intolerances = resolve_filters(
+        diet_type, exclude_intolerances, use_user_profile, current_user
+    )
+    
+    after_id = decode_cursor(cursor, int)[0] if cursor else None
+    stmt = recipes_by_ingredients_stmt(
+        all_ids, any_ids, none_ids, lang, effective_diet, effective_intolerances, after_id
+    )
+    
+    rows = (await db.execute(stmt.limit(limit + 1))).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].id)
+    
+    output = []
+    for row in rows:
+        is_compatible, intolerance_warnings = get_user_compatibility(row, current_user)
         
-    return RecipeDetail(
-        id=recipe.id,
-        title=title,
-        image_url=recipe.image_url,
-        servings=recipe.servings,
-        nutrition_totals_per_serving=recipe.nutrition_totals_per_serving,
-        instructions=instructions,
-        summary=summary,
-        ingredients=ing_list,
-        is_compatible_with_user=is_compatible,
-        intolerance_warnings=intolerance_warnings,
-        diets=recipe.diets or []
+        output.append(RecipeList(
+            id=row.id,
+            title=row.title_translated or row.title_original,
+            image_url=row.image_url,
+            servings=row.servings,
+            nutrition_totals_per_serving=row.nutrition_totals_per_serving,
+            is_compatible_with_user=is_compatible,
+            intolerance_warnings=intolerance_warnings,
+            diets=row.diets or []
+        ))
+    
+    return {"recipes": output, "next_cursor": next_cursor}
+
+
+@router.get("/{recipe_id}", response_model=RecipeDetail)
+async def get_recipe_detail(
+    request: Request,
+    response: Response,
+    recipe_id: int,
+    lang: str = Depends(deps.get_lang),
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user: CurrentUser = Depends(deps.get_current_user)
+) -> Any:
+    # Conditional GET: availability depends on the pantry, compatibility on the profile
+    not_modified = check_not_modified(
+        request, response, profile_hash(current_user), current_user.pantry_version
     )
+    if not_modified:
+        return not_modified
+    
+    # Recipe header (title, image, macros, diets) comes from the catalog snapshot
+    recipe = await recipe_catalog.lookup(db, recipe_id)
+    if not recipe:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+    
+    details = await build_recipe_details(db, [recipe], current_user, lang)
+    return details[0]
+
+
+@router.get("/{recipe_id}/similar", response_model=List[RecipeSimilar])
+async def get_similar_recipes(
+    request: Request,
+    response: Response,
+    recipe_id: int,
+    limit: int = Query(10, ge=1, le=50),
+    lang: str = Depends(deps.get_lang),
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user: CurrentUser = Depends(deps.get_current_user)
+) -> Any:
+    """
+    Recipes with the most similar ingredient sets (estimated Jaccard, MinHash/LSH index).
+    """
+    not_modified = check_not_modified(request, response, profile_hash(current_user))
+    if not_modified:
+        return not_modified
+    
+    similar = await similarity_index.similar(db, recipe_id, limit)
+    if similar is None:
+        if not await recipe_catalog.lookup(db, recipe_id):
+            raise HTTPException(status_code=404, detail="Recipe not found")
+        similar = await similarity_index.similar(db, recipe_id, limit) or []
+    
+    output = []
+    for item in similar:
+        r = item.recipe
+        is_compatible, intolerance_warnings = get_user_compatibility(r, current_user)
+        output.append(RecipeSimilar(
+            id=r.id,
+            title=r.title(lang),
+            image_url=r.image_url,
+            servings=r.servings,
+            nutrition_totals_per_serving=r.nutrition_totals_per_serving,
+            is_compatible_with_user=is_compatible,
+            intolerance_warnings=intolerance_warnings,
+            diets=list(r.diets),
+            similarity=item.similarity
+        ))
+    
+    return output
 
 
 @router.post("/{recipe_id}/shopping-list/add-missing", response_model=List[AddedItemResponse])
 async def add_missing_ingredients_to_shopping_list(
     recipe_id: int,
     body: AddMissingRequest = AddMissingRequest(),
+    lang: str = Depends(deps.get_lang),
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: CurrentUser = Depends(deps.get_current_user)
 ) -> Any:
     """
     Add all missing ingredients from a recipe to the shopping list.
     """
-    # Fetch recipe with ingredients
-    stmt = select(ExternalRecipe).where(ExternalRecipe.id == recipe_id).options(
-        selectinload(ExternalRecipe.ingredients).selectinload(RecipeIngredient.ingredient).selectinload(Ingredient.translations)
-    )
-    result = await db.execute(stmt)
-    recipe = result.scalar_one_or_none()
+    # Validate recipe and fetch its ingredient rows
+    recipe = await recipe_catalog.lookup(db, recipe_id)
     
     if not recipe:
         raise HTTPException(status_code=404, detail="Recipe not found")
     
+    recipe_ingredients = await _get_recipe_ingredients(db, recipe_id)
+    
     # Get ingredient IDs
-    ingredient_ids = [ri.ingredient_id for ri in recipe.ingredients]
+    ingredient_ids = [ri.ingredient_id for ri in recipe_ingredients]
     
-    # Get pantry availability
+    # Get pantry availability and ingredient names
     pantry_map = await get_pantry_for_ingredients(db, current_user.id, ingredient_ids)
+    ingredients = await ingredient_cache.get_many(db, ingredient_ids)
     
     added_items = []
     
-    for ri in recipe.ingredients:
-        ing = ri.ingredient
+    for ri in recipe_ingredients:
+        ing = ingredients[ri.ingredient_id]
         ing_pantry = pantry_map.get(ing.id, {})
         pantry_qty, pantry_unit, is_available, missing = calculate_availability(
-            ri.amount, ri.unit, ing_pantry
+            ri.amount, ri.unit, ing_pantry, ing.density_g_per_ml, ing.piece_weight_g
         )
         
         # Skip if fully available
@@ -366,8 +718,7 @@ async def add_missing_ingredients_to_shopping_list(
         quantity_to_add = missing if missing else (ri.amount or 1.0)
         
         # Get ingredient name
-        i_trans = next((t for t in ing.translations if t.lang == "es"), None)
-        name = i_trans.name if i_trans else (ing.display_name or ing.canonical_name)
+        name = ing.name(lang)
         
         # Create shopping list item
         new_item = ShoppingListItem(
@@ -395,46 +746,44 @@ async def add_missing_ingredients_to_shopping_list(
 async def add_single_ingredient_to_shopping_list(
     recipe_id: int,
     body: AddIngredientRequest,
+    lang: str = Depends(deps.get_lang),
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: CurrentUser = Depends(deps.get_current_user)
 ) -> Any:
     """
     Add a single ingredient from a recipe to the shopping list.
     """
-    # Fetch recipe with ingredients
-    stmt = select(ExternalRecipe).where(ExternalRecipe.id == recipe_id).options(
-        selectinload(ExternalRecipe.ingredients).selectinload(RecipeIngredient.ingredient).selectinload(Ingredient.translations)
-    )
-    result = await db.execute(stmt)
-    recipe = result.scalar_one_or_none()
+    # Validate recipe
+    recipe = await recipe_catalog.lookup(db, recipe_id)
     
     if not recipe:
         raise HTTPException(status_code=404, detail="Recipe not found")
     
     # Find the specific ingredient in recipe
-    recipe_ingredient = next(
-        (ri for ri in recipe.ingredients if ri.ingredient_id == body.ingredient_id), 
-        None
-    )
+    stmt = select(RecipeIngredient).where(
+        RecipeIngredient.recipe_id == recipe_id,
+        RecipeIngredient.ingredient_id == body.ingredient_id
+    ).order_by(RecipeIngredient.id).limit(1)
+    recipe_ingredient = (await db.execute(stmt)).scalar_one_or_none()
     
     if not recipe_ingredient:
         raise HTTPException(status_code=404, detail="Ingredient not found in this recipe")
     
-    ing = recipe_ingredient.ingredient
+    ing = await ingredient_cache.get(db, recipe_ingredient.ingredient_id)
     
     # Get pantry availability
     pantry_map = await get_pantry_for_ingredients(db, current_user.id, [ing.id])
     ing_pantry = pantry_map.get(ing.id, {})
     pantry_qty, pantry_unit, is_available, missing = calculate_availability(
-        recipe_ingredient.amount, recipe_ingredient.unit, ing_pantry
+        recipe_ingredient.amount, recipe_ingredient.unit, ing_pantry,
+        ing.density_g_per_ml, ing.piece_weight_g
     )
     
     # Determine quantity to add
     quantity_to_add = missing if missing else (recipe_ingredient.amount or 1.0)
     
     # Get ingredient name
-    i_trans = next((t for t in ing.translations if t.lang == "es"), None)
-    name = i_trans.name if i_trans else (ing.display_name or ing.canonical_name)
+    name = ing.name(lang)
     
     # Create shopping list item
     new_item = ShoppingListItem(
@@ -457,7 +806,7 @@ async def add_single_ingredient_to_shopping_list(
 
 # --- Expiring Ingredients Recommendations ---
 
-from datetime import datetime, timedelta
+from datetime import date, datetime, time, timedelta, timezone
 
 class ExpiringIngredientInfo(BaseModel):
     ingredient_id: int
@@ -478,146 +827,256 @@ class RecipeExpiringRecommendation(BaseModel):
     expiring_ingredients: List[ExpiringIngredientInfo]
 
 
+def expiring_recommendations_stmt(user_id: int, today: date, days: int, limit: int, lang: str):
+    """
+    Recipes using the user's pantry items that expire within `days` UTC days of today,
+    most expiring ingredients first, with parallel arrays of their ids and expiry dates.
+    """
+    start = datetime.combine(today, time.min, tzinfo=timezone.utc)
+    end_date = start + timedelta(days=days)
+    
+    # Expiring pantry ingredients of this user (earliest expiry date per ingredient)
+    expiring = select(
+        PantryItem.ingredient_id,
+        cast(func.timezone("UTC", func.min(PantryItem.expires_at)), Date).label("expires_on")
+    ).where(
+        PantryItem.user_id == user_id,
+        PantryItem.expires_at.isnot(None),
+        PantryItem.expires_at >= start,
+        PantryItem.expires_at <= end_date
+    ).group_by(PantryItem.ingredient_id).cte("expiring")
+    
+    # Metrics per recipe, sorted and limited in SQL; the expiring ingredients
+    # travel as parallel arrays of ids and dates
+    expiring_count = func.count(distinct(expiring.c.ingredient_id))
+    coverage = cast(expiring_count, Float) / cast(func.nullif(ExternalRecipe.ingredient_count, 0), Float)
+    earliest_expiry = func.min(expiring.c.expires_on)
+    
+    top = select(
+        ExternalRecipe.id,
+        expiring_count.label("expiring_count"),
+        func.coalesce(coverage, 0).label("coverage"),
+        earliest_expiry.label("earliest_expiry"),
+        func.array_agg(aggregate_order_by(expiring.c.ingredient_id, expiring.c.ingredient_id)).label("ingredient_ids"),
+        func.array_agg(aggregate_order_by(expiring.c.expires_on, expiring.c.ingredient_id)).label("expiry_dates")
+    ).select_from(expiring).join(
+        RecipeIngredient, RecipeIngredient.ingredient_id == expiring.c.ingredient_id
+    ).join(
+        ExternalRecipe, ExternalRecipe.id == RecipeIngredient.recipe_id
+    ).group_by(
+        ExternalRecipe.id
+    ).order_by(
+        # expiring_count desc, then coverage desc, then soonest expiry
+        expiring_count.desc(), coverage.desc().nulls_last(), earliest_expiry.asc(), ExternalRecipe.id
+    ).limit(limit).subquery("top")
+    
+    # Card columns and localized title only for the returned rows
+    return select(
+        ExternalRecipe.id,
+        ExternalRecipe.title_original,
+        ExternalRecipe.image_url,
+        ExternalRecipe.servings,
+        ExternalRecipe.nutrition_totals_per_serving,
+        ExternalRecipe.ingredient_count,
+        RecipeTranslation.title.label("title_translated"),
+        top.c.expiring_count,
+        top.c.coverage,
+        top.c.ingredient_ids,
+        top.c.expiry_dates
+    ).select_from(top).join(
+        ExternalRecipe, ExternalRecipe.id == top.c.id
+    ).outerjoin(RecipeTranslation, and_(
+        RecipeTranslation.recipe_id == ExternalRecipe.id,
+        RecipeTranslation.lang == lang
+    )).order_by(
+        top.c.expiring_count.desc(), top.c.coverage.desc().nulls_last(), top.c.earliest_expiry.asc(), top.c.id
+    )
+
+
 @router.get("/recommendations/expiring", response_model=List[RecipeExpiringRecommendation])
 async def get_expiring_recommendations(
     days: int = 3,
     limit: int = 20,
-    db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user)
+    lang: str = Depends(deps.get_lang),
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user: CurrentUser = Depends(deps.get_current_user)
 ) -> Any:
     """
     Get recipe recommendations based on pantry items that are expiring soon.
     Helps reduce food waste by suggesting recipes that use expiring ingredients.
     """
-    # 1. Get current date range
-    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-    end_date = today + timedelta(days=days)
-    
-    # 2. Find expiring pantry items for this user
-    stmt = select(PantryItem).where(
-        PantryItem.user_id == current_user.id,
-        PantryItem.expires_at.isnot(None),
-        PantryItem.expires_at >= today,
-        PantryItem.expires_at <= end_date
-    ).options(
-        selectinload(PantryItem.ingredient).selectinload(Ingredient.translations)
-    )
-    result = await db.execute(stmt)
-    expiring_items = result.scalars().all()
+    # Days are UTC so that neither the server clock nor the session TimeZone
+    # decides which day an expiry falls on
+    today = datetime.now(timezone.utc).date()
+    stmt = expiring_recommendations_stmt(current_user.id, today, days, limit, lang)
     
-    if not expiring_items:
+    rows = (await db.execute(stmt)).all()
+    if not rows:
         return []
     
-    # Build map of expiring ingredients with their info
-    expiring_map = {}  # ingredient_id -> {name_es, expires_at, days_until}
-    expiring_ids = set()
+    # Ingredient names for the returned recipes only
+    ingredient_ids = {i for row in rows for i in row.ingredient_ids}
+    ingredients = await ingredient_cache.get_many(db, ingredient_ids)
     
-    for item in expiring_items:
-        ing = item.ingredient
-        i_trans = next((t for t in ing.translations if t.lang == "es"), None)
-        name = i_trans.name if i_trans else (ing.display_name or ing.canonical_name)
+    # Build response
+    output = []
+    for row in rows:
+        exp_ingredients_info = []
+        for ing_id, expires_on in zip(row.ingredient_ids, row.expiry_dates):
+            exp_ingredients_info.append(ExpiringIngredientInfo(
+                ingredient_id=ing_id,
+                ingredient_name_es=ingredients[ing_id].name(lang) if ing_id in ingredients else str(ing_id),
+                expires_at=expires_on.isoformat(),
+                days_until_expiry=(expires_on - today).days
+            ))
         
-        exp_date = item.expires_at
-        if hasattr(exp_date, 'date'):
-            exp_date = exp_date.date() if hasattr(exp_date, 'date') else exp_date
-        days_until = (item.expires_at.replace(tzinfo=None) - today).days
+        # Sort expiring ingredients by days until expiry
+        exp_ingredients_info.sort(key=lambda x: x.days_until_expiry)
         
-        # Keep the one with earliest expiry if multiple
-        if ing.id not in expiring_map or days_until < expiring_map[ing.id]['days_until']:
-            expiring_map[ing.id] = {
-                'name_es': name,
-                'expires_at': item.expires_at.strftime('%Y-%m-%d'),
-                'days_until': days_until
-            }
-        expiring_ids.add(ing.id)
-    
-    # 3. Find recipes that use these ingredients
-    stmt = select(RecipeIngredient).where(
-        RecipeIngredient.ingredient_id.in_(expiring_ids)
-    )
-    result = await db.execute(stmt)
-    recipe_ingredients = result.scalars().all()
+        output.append(RecipeExpiringRecommendation(
+            id=row.id,
+            title=row.title_translated or row.title_original,
+            image_url=row.image_url,
+            servings=row.servings,
+            nutrition_totals_per_serving=row.nutrition_totals_per_serving,
+            expiring_ingredients_count=row.expiring_count,
+            total_ingredients_count=row.ingredient_count,
+            coverage_ratio=round(row.coverage, 2),
+            expiring_ingredients=exp_ingredients_info
+        ))
     
-    if not recipe_ingredients:
-        return []
+    return output
+
+
+# --- Cookable Recommendations ---
+
+# Candidates ranked by pantry coverage that get the quantity check, per requested result
+COOKABLE_CANDIDATE_FACTOR = 3
+
+
+class CookableMissingIngredient(BaseModel):
+    ingredient_id: int
+    name: str
+    missing_quantity: float | None = None
+    unit: str | None = None
+
+
+class RecipeCookableRecommendation(BaseModel):
+    id: int
+    title: str
+    image_url: str | None = None
+    servings: int | None = 1
+    nutrition_totals_per_serving: dict | None = None
+    matched_ingredients_count: int  # In the pantry, any quantity
+    available_ingredients_count: int  # In the pantry with enough quantity
+    total_ingredients_count: int
+    coverage_ratio: float
+    missing_ingredients: List[CookableMissingIngredient]
+
+
+@router.get("/recommendations/cookable", response_model=List[RecipeCookableRecommendation])
+async def get_cookable_recommendations(
+    limit: int = Query(20, ge=1, le=100),
+    min_coverage: float = Query(0, ge=0, le=1),
+    diet_type: str = None,
+    exclude_intolerances: List[str] = Query(None),
+    use_user_profile: bool = False,
+    lang: str = Depends(deps.get_lang),
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user: CurrentUser = Depends(deps.get_current_user)
+) -> Any:
+    """
+    Rank the whole catalog by how much of each recipe the user's pantry covers.
     
-    # Get unique recipe IDs
-    recipe_ids = set(ri.recipe_id for ri in recipe_ingredients)
+    Coverage is computed for every recipe from the in-memory index; the quantity check
+    (calculate_availability) only runs for the best candidates. Results are ordered by
+    ingredients available in enough quantity, then by coverage.
+    """
+    # 1. Whole pantry of the user: {ingredient_id: {unit: quantity}}
+    pantry_map = await get_pantry_for_ingredients(db, current_user.id)
+    if not pantry_map:
+        return []
     
-    # Map recipe_id -> list of expiring ingredient_ids used
-    recipe_expiring_map = {}
-    for ri in recipe_ingredients:
-        if ri.recipe_id not in recipe_expiring_map:
-            recipe_expiring_map[ri.recipe_id] = []
-        recipe_expiring_map[ri.recipe_id].append(ri.ingredient_id)
-    
-    # 4. Fetch full recipe data
-    stmt = select(ExternalRecipe).where(
-        ExternalRecipe.id.in_(recipe_ids)
-    ).options(
-        selectinload(ExternalRecipe.translations),
-        selectinload(ExternalRecipe.ingredients)
+    # 2. Coverage ranking over the catalog index
+    effective_diet, effective_intolerances = resolve_filters(
+        diet_type, exclude_intolerances, use_user_profile, current_user
     )
-    result = await db.execute(stmt)
-    recipes = result.scalars().all()
+    index = await cookable_engine.get_index(db)
+    candidates = index.rank(
+        pantry_map.keys(),
+        acceptable_diet_mask(effective_diet),
+        compute_intolerance_mask(effective_intolerances),
+        top_n=limit * COOKABLE_CANDIDATE_FACTOR,
+        min_coverage=min_coverage
+    )
+    if not candidates:
+        return []
     
-    # 5. Calculate metrics and build response
-    recommendations = []
+    # 3. Quantity check for the candidates only (one query for their ingredient rows)
+    stmt = select(
+        RecipeIngredient.recipe_id,
+        RecipeIngredient.ingredient_id,
+        RecipeIngredient.amount,
+        RecipeIngredient.unit
+    ).where(
+        RecipeIngredient.recipe_id.in_([c.recipe.id for c in candidates])
+    ).order_by(RecipeIngredient.id)
+    rows_by_recipe = {}
+    for row in (await db.execute(stmt)).all():
+        rows_by_recipe.setdefault(row.recipe_id, []).append(row)
     
-    for recipe in recipes:
-        # Get translation
-        r_trans = next((t for t in recipe.translations if t.lang == "es"), None)
-        title = r_trans.title if r_trans else recipe.title_original
-        
-        # Calculate counts
-        total_ingredients = len(recipe.ingredients)
-        expiring_ing_ids = recipe_expiring_map.get(recipe.id, [])
-        expiring_count = len(expiring_ing_ids)
-        coverage = expiring_count / total_ingredients if total_ingredients > 0 else 0
-        
-        # Build expiring ingredients info list
-        exp_ingredients_info = []
-        for ing_id in expiring_ing_ids:
-            if ing_id in expiring_map:
-                info = expiring_map[ing_id]
-                exp_ingredients_info.append(ExpiringIngredientInfo(
-                    ingredient_id=ing_id,
-                    ingredient_name_es=info['name_es'],
-                    expires_at=info['expires_at'],
-                    days_until_expiry=info['days_until']
-                ))
-        
-        # Sort expiring ingredients by days until expiry
-        exp_ingredients_info.sort(key=lambda x: x.days_until_expiry)
+    # Names and unit-conversion data of every candidate ingredient
+    ingredients = await ingredient_cache.get_many(
+        db, {row.ingredient_id for rows in rows_by_recipe.values() for row in rows}
+    )
+    
+    scored = []
+    for candidate in candidates:
+        available = 0
+        missing = []
+        for row in rows_by_recipe.get(candidate.recipe.id, []):
+            if row.ingredient_id in candidate.matched_ingredient_ids:
+                ing = ingredients.get(row.ingredient_id)
+                _, _, is_available, missing_qty = calculate_availability(
+                    row.amount, row.unit, pantry_map.get(row.ingredient_id, {}),
+                    ing.density_g_per_ml if ing else None, ing.piece_weight_g if ing else None
+                )
+            else:
+                is_available, missing_qty = False, row.amount
+            
+            if is_available:
+                available += 1
+            else:
+                missing.append((row.ingredient_id, missing_qty, row.unit))
         
-        recommendations.append({
-            'recipe': recipe,
-            'title': title,
-            'expiring_count': expiring_count,
-            'total_count': total_ingredients,
-            'coverage': coverage,
-            'exp_ingredients': exp_ingredients_info,
-            'min_days': min(e.days_until_expiry for e in exp_ingredients_info) if exp_ingredients_info else 999
-        })
-    
-    # 6. Sort: by expiring_count desc, then coverage desc, then min_days asc
-    recommendations.sort(key=lambda x: (-x['expiring_count'], -x['coverage'], x['min_days']))
-    
-    # 7. Build final response
+        total = candidate.recipe.ingredient_count or len(candidate.recipe.ingredient_ids)
+        scored.append((candidate, available, total, missing))
+    
+    # 4. Final order: share available in enough quantity, then coverage, then id
+    scored.sort(key=lambda x: (-(x[1] / x[2] if x[2] else 0), -x[0].coverage, x[0].recipe.id))
+    
     output = []
-    for rec in recommendations[:limit]:
-        r = rec['recipe']
-        output.append(RecipeExpiringRecommendation(
+    for candidate, available, total, missing in scored[:limit]:
+        r = candidate.recipe
+        output.append(RecipeCookableRecommendation(
             id=r.id,
-            title=rec['title'],
+            title=r.title(lang),
             image_url=r.image_url,
             servings=r.servings,
             nutrition_totals_per_serving=r.nutrition_totals_per_serving,
-            expiring_ingredients_count=rec['expiring_count'],
-            total_ingredients_count=rec['total_count'],
-            coverage_ratio=round(rec['coverage'], 2),
-            expiring_ingredients=rec['exp_ingredients']
+            matched_ingredients_count=candidate.matched_count,
+            available_ingredients_count=available,
+            total_ingredients_count=total,
+            coverage_ratio=round(candidate.coverage, 2),
+            missing_ingredients=[
+                CookableMissingIngredient(
+                    ingredient_id=ing_id,
+                    name=ingredients[ing_id].name(lang) if ing_id in ingredients else str(ing_id),
+                    missing_quantity=qty,
+                    unit=unit
+                )
+                for ing_id, qty, unit in missing
+            ]
         ))
     
     return output
-
@@ -1,82 +1,101 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
-from typing import List
+from typing import List, Optional
 
 from app.api import deps
-from app.models.user_pantry_log import User, ShoppingListItem
-from app.models.ingredient import Ingredient, IngredientTranslation
+from app.api.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, encode_cursor, decode_cursor, keyset_after
+from app.models.user_pantry_log import ShoppingListItem
+from app.services.user_cache import CurrentUser
 from app.schemas.shopping import (
     ShoppingListItemCreate,
     ShoppingListItemUpdate,
     ShoppingListItemRead,
 )
+from app.services.ingredient_cache import ingredient_cache
 
 router = APIRouter()
 
 
-def _resolve_ingredient_name_es(ingredient: Ingredient) -> str:
-    """Resolve Spanish name for an ingredient, falling back to display_name or canonical_name."""
-    trans = next((t for t in ingredient.translations if t.lang == "es"), None)
-    return trans.name if trans else (ingredient.display_name or ingredient.canonical_name)
+def _to_read(item: ShoppingListItem, name: str) -> ShoppingListItemRead:
+    return ShoppingListItemRead(
+        id=item.id,
+        ingredient_id=item.ingredient_id,
+        ingredient_name_es=name,
+        quantity=item.quantity,
+        unit=item.unit,
+        is_done=item.is_checked,
+        created_at=item.created_at,
+        updated_at=item.updated_at,
+    )
+
+
+def shopping_list_stmt(user_id: int, only_pending: bool = False, after_id: Optional[int] = None):
+    """The user's shopping list items ordered by id, after the cursor's id if given."""
+    stmt = (
+        select(ShoppingListItem)
+        .where(ShoppingListItem.user_id == user_id)
+        .order_by(ShoppingListItem.id)
+    )
+
+    if only_pending:
+        stmt = stmt.where(ShoppingListItem.is_checked == False)
+    if after_id is not None:
+        stmt = stmt.where(keyset_after([ShoppingListItem.id], [after_id]))
+    return stmt
 
 
 @router.get("/", response_model=List[ShoppingListItemRead])
 async def get_shopping_list(
+    response: Response,
     only_pending: bool = Query(False, description="If true, only return items where is_done is False"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    paginate: bool = Query(True, description="false returns the whole list in one response"),
+    lang: str = Depends(deps.get_lang),
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: CurrentUser = Depends(deps.get_current_user),
 ):
     """
-    Retrieve the shopping list for the current user.
+    Retrieve the shopping list for the current user, ordered by id.
     Optionally filter to only pending (not yet purchased) items.
+    Returned one page of `limit` items at a time; the cursor for the next page is
+    returned in the X-Next-Cursor header.
     """
-    stmt = (
-        select(ShoppingListItem)
-        .where(ShoppingListItem.user_id == current_user.id)
-        .options(selectinload(ShoppingListItem.ingredient).selectinload(Ingredient.translations))
-    )
-
-    if only_pending:
-        stmt = stmt.where(ShoppingListItem.is_checked == False)
+    after_id = decode_cursor(cursor, int)[0] if cursor else None
+    stmt = shopping_list_stmt(current_user.id, only_pending, after_id)
+    if paginate:
+        stmt = stmt.limit(limit + 1)
 
     result = await db.execute(stmt)
     items = result.scalars().all()
 
-    response = []
-    for item in items:
-        ing = item.ingredient
-        name_es = _resolve_ingredient_name_es(ing)
+    if paginate and len(items) > limit:
+        items = items[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(items[-1].id)
 
-        response.append(
-            ShoppingListItemRead(
-                id=item.id,
-                ingredient_id=item.ingredient_id,
-                ingredient_name_es=name_es,
-                quantity=item.quantity,
-                unit=item.unit,
-                is_done=item.is_checked,
-                created_at=item.created_at,
-                updated_at=item.updated_at,
-            )
-        )
+    # Names come from the ingredient cache instead of eager-loaded translations
+    ingredients = await ingredient_cache.get_many(db, {item.ingredient_id for item in items})
 
-    return response
+    return [
+        _to_read(item, ingredients[item.ingredient_id].name(lang))
+        for item in items
+    ]
 
 
 @router.post("/", response_model=ShoppingListItemRead, status_code=status.HTTP_201_CREATED)
 async def create_shopping_list_item(
     item_in: ShoppingListItemCreate,
+    lang: str = Depends(deps.get_lang),
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: CurrentUser = Depends(deps.get_current_user),
 ):
     """
     Add a new item to the shopping list.
     Does not enforce uniqueness – multiple items for the same ingredient are allowed.
     """
     # 1. Validate Ingredient Exists
-    ing = await db.get(Ingredient, item_in.ingredient_id)
+    ing = await ingredient_cache.get(db, item_in.ingredient_id)
     if not ing:
         raise HTTPException(status_code=404, detail="Ingredient not found")
 
@@ -92,36 +111,16 @@ async def create_shopping_list_item(
     await db.commit()
     await db.refresh(new_item)
 
-    # 3. Reload with ingredient translations for response
-    stmt_refetch = (
-        select(ShoppingListItem)
-        .where(ShoppingListItem.id == new_item.id)
-        .options(selectinload(ShoppingListItem.ingredient).selectinload(Ingredient.translations))
-    )
-    res_refetch = await db.execute(stmt_refetch)
-    final_item = res_refetch.scalar_one()
-
-    ing = final_item.ingredient
-    name_es = _resolve_ingredient_name_es(ing)
-
-    return ShoppingListItemRead(
-        id=final_item.id,
-        ingredient_id=final_item.ingredient_id,
-        ingredient_name_es=name_es,
-        quantity=final_item.quantity,
-        unit=final_item.unit,
-        is_done=final_item.is_checked,
-        created_at=final_item.created_at,
-        updated_at=final_item.updated_at,
-    )
+    return _to_read(new_item, ing.name(lang))
 
 
 @router.patch("/{item_id}", response_model=ShoppingListItemRead)
 async def update_shopping_list_item(
     item_id: int,
     item_update: ShoppingListItemUpdate,
+    lang: str = Depends(deps.get_lang),
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: CurrentUser = Depends(deps.get_current_user),
 ):
     """
     Update an existing shopping list item (quantity, unit, or is_done status).
@@ -130,7 +129,6 @@ async def update_shopping_list_item(
     stmt = (
         select(ShoppingListItem)
         .where(ShoppingListItem.id == item_id, ShoppingListItem.user_id == current_user.id)
-        .options(selectinload(ShoppingListItem.ingredient).selectinload(Ingredient.translations))
     )
     result = await db.execute(stmt)
     item = result.scalar_one_or_none()
@@ -148,26 +146,15 @@ async def update_shopping_list_item(
     await db.commit()
     await db.refresh(item)
 
-    ing = item.ingredient
-    name_es = _resolve_ingredient_name_es(ing)
-
-    return ShoppingListItemRead(
-        id=item.id,
-        ingredient_id=item.ingredient_id,
-        ingredient_name_es=name_es,
-        quantity=item.quantity,
-        unit=item.unit,
-        is_done=item.is_checked,
-        created_at=item.created_at,
-        updated_at=item.updated_at,
-    )
+    ing = await ingredient_cache.get(db, item.ingredient_id)
+    return _to_read(item, ing.name(lang))
 
 
 @router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_shopping_list_item(
     item_id: int,
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: CurrentUser = Depends(deps.get_current_user),
 ):
     """
     Delete an item from the shopping list.
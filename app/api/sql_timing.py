@@ -0,0 +1,70 @@
+"""
+Per-request SQL instrumentation: Server-Timing header and one log line per request.
+
+Pure ASGI middleware (no extra task per request, unlike BaseHTTPMiddleware). The
+statistics come from app.db.instrumentation; a statement text repeated
+SQL_REPEAT_THRESHOLD times or more in one request is logged as a likely N+1.
+"""
+import logging
+import time
+
+from app.core.config import settings
+from app.db.instrumentation import RequestSqlStats, current_sql_stats
+
+logger = logging.getLogger("app.sql")
+
+# Repeated statements are logged up to this length
+_MAX_LOGGED_SQL = 300
+
+
+class SqlTimingMiddleware:
+    def __init__(self, app, repeat_threshold: int = settings.SQL_REPEAT_THRESHOLD):
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestSqlStats()
+        token = current_sql_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                total_ms = (time.perf_counter() - started) * 1000
+                header = (
+                    f'db;dur={stats.db_seconds * 1000:.2f};desc="{stats.statements} queries", '
+                    f"app;dur={total_ms:.2f}"
+                )
+                message.setdefault("headers", []).append((b"server-timing", header.encode()))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_sql_stats.reset(token)
+            self._log(scope, status_code, stats, time.perf_counter() - started)
+
+    def _log(self, scope, status_code: int, stats: RequestSqlStats, elapsed: float) -> None:
+        repeated = stats.repeated(self.repeat_threshold)
+        fields = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "status": status_code,
+            "queries": stats.statements,
+            "db_ms": round(stats.db_seconds * 1000, 2),
+            "total_ms": round(elapsed * 1000, 2),
+            "repeated_statements": len(repeated),
+        }
+        logger.info(" ".join(f"{k}={v}" for k, v in fields.items()), extra={"sql_stats": fields})
+
+        for sql, count in repeated:
+            logger.warning(
+                f"Possible N+1: statement ran {count} times in {scope['method']} {scope['path']}: "
+                f"{' '.join(sql.split())[:_MAX_LOGGED_SQL]}"
+            )
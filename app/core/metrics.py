@@ -0,0 +1,91 @@
+"""
+Prometheus metrics shared by the API, the integrations and the scripts.
+
+Multi-worker: when PROMETHEUS_MULTIPROC_DIR is set (to an empty directory, before the
+workers start), prometheus_client writes every process's samples there and /metrics
+aggregates them, so any worker answers the scrape with totals for all of them. Gauges
+declare how worker values combine (livesum: summed over live workers). Without the
+variable the default single-process registry is used.
+"""
+import os
+import re
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest
+from prometheus_client import multiprocess
+
+# Latency buckets (seconds) for API routes and external calls
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1, 2.5, 5, 10, 30)
+
+HTTP_REQUESTS = Counter(
+    "cooky_http_requests_total", "HTTP requests by route template and status.",
+    ["method", "route", "status"],
+)
+HTTP_LATENCY = Histogram(
+    "cooky_http_request_duration_seconds", "HTTP request latency by route template.",
+    ["method", "route"], buckets=LATENCY_BUCKETS,
+)
+HTTP_IN_PROGRESS = Gauge(
+    "cooky_http_requests_in_progress", "HTTP requests being served.",
+    ["method", "route"], multiprocess_mode="livesum",
+)
+
+DB_POOL_CONNECTIONS = Gauge(
+    "cooky_db_pool_connections", "Pooled connections by state (checked_out, checked_in, overflow).",
+    ["engine", "state"], multiprocess_mode="livesum",
+)
+DB_POOL_SIZE = Gauge(
+    "cooky_db_pool_size", "Configured pool size.", ["engine"], multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUT_WAITS = Counter(
+    "cooky_db_pool_checkout_waits_total", "Checkouts that found the pool exhausted.", ["engine"],
+)
+DB_POOL_CHECKOUT_TIMEOUTS = Counter(
+    "cooky_db_pool_checkout_timeouts_total", "Checkouts that timed out waiting for a connection.", ["engine"],
+)
+
+EXTERNAL_LATENCY = Histogram(
+    "cooky_external_request_duration_seconds", "Latency of calls to external APIs.",
+    ["service", "operation"], buckets=LATENCY_BUCKETS,
+)
+EXTERNAL_REQUESTS = Counter(
+    "cooky_external_requests_total", "Calls to external APIs by outcome (ok, http_error, error).",
+    ["service", "operation", "outcome"],
+)
+SPOONACULAR_QUOTA_POINTS = Counter(
+    "cooky_spoonacular_quota_points_total", "Spoonacular quota points spent (X-API-Quota-Request).",
+)
+SPOONACULAR_QUOTA_USED = Gauge(
+    "cooky_spoonacular_quota_used", "Spoonacular quota points used today, as last reported (X-API-Quota-Used).",
+    multiprocess_mode="mostrecent",
+)
+DEEPL_CHARACTERS = Counter(
+    "cooky_deepl_characters_total", "Characters sent to DeepL for translation (its quota unit).",
+)
+
+TRANSLATION_QUEUE = Gauge(
+    "cooky_translation_jobs", "Translation jobs not done yet, by status (read at scrape time).",
+    ["status"], multiprocess_mode="mostrecent",
+)
+
+_ID_SEGMENT = re.compile(r"/\d+")
+
+
+def operation_label(endpoint: str) -> str:
+    """Endpoint path with numeric segments collapsed, to keep label cardinality bounded."""
+    return _ID_SEGMENT.sub("/{id}", endpoint)
+
+
+def render_latest() -> tuple[bytes, str]:
+    """Exposition of every metric (aggregated over all workers in multiprocess mode)."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drop the live gauges of an exiting worker (multiprocess mode only)."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid)
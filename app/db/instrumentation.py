@@ -0,0 +1,65 @@
+"""
+Per-request SQL statistics collected from engine cursor events.
+
+The HTTP middleware (app.api.sql_timing) opens a RequestSqlStats in a context variable;
+the events below add every statement run while it is active: count, time in the
+database, and how many times each statement text ran. Statements are already
+parameterized, so the same text repeated in one request is almost always a query
+issued from a loop (N+1). Outside a request (scripts, startup) nothing is recorded.
+"""
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+_STARTED_KEY = "sql_instrumentation_started"
+
+
+@dataclass
+class RequestSqlStats:
+    statements: int = 0
+    db_seconds: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement texts run at least `threshold` times, most repeated first."""
+        return [(sql, n) for sql, n in self.shapes.most_common() if n >= threshold]
+
+
+current_sql_stats: ContextVar[Optional[RequestSqlStats]] = ContextVar("current_sql_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if current_sql_stats.get() is not None:
+        conn.info.setdefault(_STARTED_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = current_sql_stats.get()
+    started = conn.info.get(_STARTED_KEY)
+    if stats is None or not started:
+        return
+    stats.db_seconds += time.perf_counter() - started.pop()
+    stats.statements += 1
+    stats.shapes[statement] += 1
+
+
+def _handle_error(exception_context) -> None:
+    # after_cursor_execute is skipped for failed statements
+    conn = exception_context.connection
+    started = conn.info.get(_STARTED_KEY) if conn is not None else None
+    if started:
+        started.pop()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    sync_engine = engine.sync_engine
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
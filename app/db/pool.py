@@ -0,0 +1,54 @@
+"""
+Connection pool with checkout counters, to size pools per worker under load.
+
+SQLAlchemy's QueuePool only reports its current state (checked out, overflow); this
+subclass also counts checkouts, how many had to wait for a free connection, the time
+spent waiting and the timeouts. Counters are per process.
+"""
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.timeouts = 0
+
+    def _do_get(self):
+        # Pool and overflow both used up: this checkout blocks until a connection is returned
+        exhausted = self.checkedin() == 0 and 0 <= self._max_overflow <= self._overflow
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            if exhausted:
+                waited = time.perf_counter() - started
+                self.waits += 1
+                self.wait_seconds_total += waited
+                self.wait_seconds_max = max(self.wait_seconds_max, waited)
+        self.checkouts += 1
+        return connection
+
+    def stats(self) -> dict:
+        return {
+            "pool_size": self.size(),
+            "max_overflow": self._max_overflow,
+            "timeout_seconds": self.timeout(),
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "checkouts": self.checkouts,
+            "waits": self.waits,
+            "wait_seconds_total": round(self.wait_seconds_total, 3),
+            "wait_seconds_max": round(self.wait_seconds_max, 3),
+            "timeouts": self.timeouts,
+        }
@@ -0,0 +1,34 @@
+"""
+Read-your-writes for replica routing.
+
+Pantry writes mark the user (in every worker, through the user events of
+app.services.catalog_events); for READ_YOUR_WRITES_SECONDS afterwards deps.get_read_db
+gives that user a primary session, so recipe availability never lags the pantry.
+"""
+import time
+from typing import Dict
+
+from app.core.config import settings
+
+# Drop expired marks once this many users are tracked
+_PRUNE_THRESHOLD = 10000
+
+_primary_until: Dict[int, float] = {}
+
+
+def mark_user_write(user_id: int) -> None:
+    now = time.monotonic()
+    if len(_primary_until) >= _PRUNE_THRESHOLD:
+        for expired in [u for u, until in _primary_until.items() if until <= now]:
+            del _primary_until[expired]
+    _primary_until[user_id] = now + settings.READ_YOUR_WRITES_SECONDS
+
+
+def wrote_recently(user_id: int) -> bool:
+    until = _primary_until.get(user_id)
+    if until is None:
+        return False
+    if until <= time.monotonic():
+        _primary_until.pop(user_id, None)
+        return False
+    return True
@@ -1,13 +1,56 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.instrumentation import instrument_engine
+from app.db.pool import InstrumentedAsyncAdaptedQueuePool
 
-engine = create_async_engine(settings.DATABASE_URL, echo=True)
+
+def _create_engine(url: str):
+    new_engine = create_async_engine(
+        url,
+        echo=settings.db_echo,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE},
+    )
+    if settings.SQL_INSTRUMENTATION:
+        instrument_engine(new_engine)
+    return new_engine
+
+
+engine = _create_engine(settings.DATABASE_URL)
+
+# Read replica when DATABASE_URL_READ is set, otherwise the primary itself
+read_engine = _create_engine(settings.DATABASE_URL_READ) if settings.DATABASE_URL_READ else engine
 
 AsyncSessionLocal = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
 
+ReadSessionLocal = sessionmaker(
+    read_engine, class_=AsyncSession, expire_on_commit=False
+)
+
+@asynccontextmanager
+async def primary_session(db: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """
+    db itself unless it is a replica session, else a short-lived primary session.
+    For filling process-wide caches after a change notification: the replica may
+    not have applied the change yet, and the cache would keep the old rows.
+    """
+    if read_engine is engine or db.bind is not read_engine:
+        yield db
+    else:
+        async with AsyncSessionLocal() as session:
+            yield session
+
+
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
@@ -1,6 +1,8 @@
 import httpx
 from app.core.config import settings
+from app.core import metrics
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +17,9 @@ class SpoonacularClient:
         await self.client.aclose()
 
     async def _get(self, endpoint: str, params: dict = None) -> dict:
+        operation = metrics.operation_label(endpoint)
+        started = time.perf_counter()
+        outcome = "error"
         try:
             response = await self.client.get(endpoint, params=params)
             
@@ -22,15 +27,23 @@ class SpoonacularClient:
             if "X-API-Quota-Used" in response.headers:
                 quota_used = response.headers["X-API-Quota-Used"]
                 logger.info(f"Spoonacular Quota Used: {quota_used}")
+                metrics.SPOONACULAR_QUOTA_USED.set(float(quota_used))
+            if "X-API-Quota-Request" in response.headers:
+                metrics.SPOONACULAR_QUOTA_POINTS.inc(float(response.headers["X-API-Quota-Request"]))
 
             response.raise_for_status()
+            outcome = "ok"
             return response.json()
         except httpx.HTTPStatusError as e:
+            outcome = "http_error"
             logger.error(f"Spoonacular API Error: {e.response.status_code} - {e.response.text}")
             raise e
         except Exception as e:
             logger.error(f"Spoonacular Connection Error: {str(e)}")
             raise e
+        finally:
+            metrics.EXTERNAL_LATENCY.labels("spoonacular", operation).observe(time.perf_counter() - started)
+            metrics.EXTERNAL_REQUESTS.labels("spoonacular", operation, outcome).inc()
 
     async def search_recipes(
         self,
@@ -1,6 +1,16 @@
+import os
 from fastapi import FastAPI
-from app.api.routes import recipes, import_spoonacular, pantry, ingredients, shopping, log, profile
+from app.api.routes import auth, recipes, import_spoonacular, pantry, ingredients, shopping, log, profile, admin, meal_plan
 from app.core.config import settings
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.api.sql_timing import SqlTimingMiddleware
+from app.api import metrics as metrics_api
+from app.core.metrics import mark_process_dead
+from app.db.routing import mark_user_write
+from app.services import catalog_events
+from app.services.recipe_catalog import recipe_catalog
+from app.services.ingredient_cache import ingredient_cache
+from app.services.user_cache import user_cache
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -15,16 +25,49 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", "Server-Timing"],
 )
 
+if settings.SQL_INSTRUMENTATION:
+    # Query count / DB time per request (Server-Timing header, N+1 warnings in the log)
+    app.add_middleware(SqlTimingMiddleware)
+
+# Per-route counts / latency histograms / in-flight gauges, served by GET /metrics
+app.add_middleware(metrics_api.PrometheusMiddleware, openapi=app.openapi)
+
 # Include Routers
+app.include_router(metrics_api.router, tags=["metrics"])
+app.include_router(auth.router, prefix="/auth", tags=["auth"])
 app.include_router(recipes.router, prefix="/recipes", tags=["recipes"])
 app.include_router(pantry.router, prefix="/pantry", tags=["pantry"])
 app.include_router(ingredients.router, prefix="/ingredients", tags=["ingredients"])
 app.include_router(shopping.router, prefix="/shopping-list", tags=["shopping-list"])
 app.include_router(log.router, prefix="/log", tags=["log"])
 app.include_router(profile.router, prefix="/profile", tags=["profile"])
+app.include_router(meal_plan.router, prefix="/meal-plan", tags=["meal-plan"])
 app.include_router(import_spoonacular.router, prefix="/admin/spoonacular", tags=["admin"])
+app.include_router(admin.router, prefix="/admin", tags=["admin"])
+
+
+@app.on_event("startup")
+async def start_catalog_events():
+    # Other processes announce catalog changes (imports, translations) over LISTEN/NOTIFY
+    catalog_events.subscribe(recipe_catalog.invalidate)
+    catalog_events.subscribe(ingredient_cache.invalidate)
+    # Profile / pantry changes, from any worker
+    catalog_events.subscribe_user(user_cache.invalidate)
+    catalog_events.subscribe_user(mark_user_write)
+    # On every listener (re)connect: events sent while it was down were lost
+    catalog_events.subscribe_reset(recipe_catalog.invalidate)
+    catalog_events.subscribe_reset(ingredient_cache.invalidate)
+    catalog_events.subscribe_reset(user_cache.clear)
+    await catalog_events.start_catalog_listener()
+
+
+@app.on_event("shutdown")
+async def stop_catalog_events():
+    await catalog_events.stop_catalog_listener()
+    mark_process_dead(os.getpid())
 
 @app.get("/")
 def root():
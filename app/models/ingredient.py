@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, UniqueConstraint, Index
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
@@ -14,6 +14,9 @@ class Ingredient(Base):
     category = Column(String, nullable=True)
     default_unit = Column(String, nullable=True)
     nutrition_per_100g = Column(JSONB, nullable=True)
+    # Unit conversion overrides (see app.services.units): volume <-> mass and pieces <-> mass
+    density_g_per_ml = Column(Float, nullable=True)
+    piece_weight_g = Column(Float, nullable=True)
     source_ids = Column(JSONB, nullable=True)
     source_priority = Column(Integer, default=2)
     is_verified = Column(Boolean, default=False)
@@ -25,6 +28,11 @@ class Ingredient(Base):
     # Indexes for JSONB fields can be added via Alembic or generic Index here if needed, 
     # but specific JSONB path indexes often need raw SQL or specific constructs. 
     # For now, we rely on standard indexes.
+    __table_args__ = (
+        # Substring (ILIKE '%q%') search; needs the pg_trgm extension
+        Index('ix_ingredients_display_name_trgm', 'display_name',
+              postgresql_using='gin', postgresql_ops={'display_name': 'gin_trgm_ops'}),
+    )
 
 class IngredientTranslation(Base):
     __tablename__ = "ingredient_translations"
@@ -46,4 +54,6 @@ class IngredientTranslation(Base):
 
     __table_args__ = (
         UniqueConstraint('ingredient_id', 'lang', name='uq_ingredient_lang'),
+        Index('ix_ingredient_translations_name_trgm', 'name',
+              postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
     )
@@ -1,10 +1,13 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, Text, Boolean, DateTime, UniqueConstraint, ForeignKey
-from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, Text, Boolean, DateTime, UniqueConstraint, ForeignKey, Index, Sequence
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, ARRAY
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from app.db.base import Base
 
+# Bumped by every catalog write (imports, translations); see app.services.catalog_events
+catalog_version_seq = Sequence("catalog_version_seq", metadata=Base.metadata)
+
 class ExternalRecipe(Base):
     __tablename__ = "external_recipes"
 
@@ -16,10 +19,19 @@ class ExternalRecipe(Base):
     servings = Column(Integer, default=1)
     diets = Column(JSONB, nullable=True)
     intolerances_warn = Column(JSONB, nullable=True)
+    # Derived from diets / intolerances_warn at import time (see app.services.diet_mask)
+    diet_mask = Column(Integer, default=0, nullable=False)
+    intolerance_mask = Column(Integer, default=0, nullable=False)
+    # Denormalized count of recipe_ingredients rows, maintained by the import paths
+    ingredient_count = Column(Integer, default=0, nullable=False)
+    # Denormalized distinct ingredient ids (GIN-indexed for @> / && searches), same maintainers
+    ingredient_ids = Column(ARRAY(Integer), default=list, server_default='{}', nullable=False)
     nutrition_totals_per_serving = Column(JSONB, nullable=True)
     instructions_raw = Column(Text, nullable=True)
     instructions_steps_original = Column(JSONB, nullable=True)
     raw_json = Column(JSONB, nullable=True)
+    # Full-text document, maintained by app.services.recipe_search (not loaded with the ORM row)
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
     created_at = Column(DateTime(timezone=True), default=func.now())
     updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
 
@@ -28,6 +40,8 @@ class ExternalRecipe(Base):
 
     __table_args__ = (
         UniqueConstraint('source', 'external_id', name='uq_source_external_id'),
+        Index('ix_external_recipes_search_vector_gin', 'search_vector', postgresql_using='gin'),
+        Index('ix_external_recipes_ingredient_ids_gin', 'ingredient_ids', postgresql_using='gin'),
     )
 
 class RecipeTranslation(Base):
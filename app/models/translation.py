@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, func
+from sqlalchemy import Column, Integer, String, DateTime, Index, func, text
 from app.db.base import Base
 
 class TranslationJob(Base):
@@ -12,3 +12,8 @@ class TranslationJob(Base):
     error_message = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), default=func.now())
     updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        # Open jobs only (the batch picks pending ones per language); done jobs accumulate
+        Index('ix_translation_jobs_open', 'status', 'target_lang', 'id', postgresql_where=text("status <> 'done'")),
+    )
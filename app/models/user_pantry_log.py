@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Date, Boolean, UniqueConstraint, func
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Date, Boolean, UniqueConstraint, Index, func, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import JSONB
 from app.db.base import Base
@@ -13,6 +13,8 @@ class User(Base):
     name = Column(String, nullable=True)
     diet_type = Column(String, nullable=True)
     intolerances = Column(JSONB, nullable=True)
+    # Bumped on every pantry write; part of the ETag of pantry-dependent responses
+    pantry_version = Column(Integer, default=0, nullable=False)
     created_at = Column(DateTime(timezone=True), default=func.now())
     updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
 
@@ -34,6 +36,8 @@ class PantryItem(Base):
 
     __table_args__ = (
         UniqueConstraint('user_id', 'ingredient_id', 'unit', name='uq_pantry_user_ingredient_unit'),
+        # Expiring-soon lookups (recommendations, meal plan)
+        Index('ix_pantry_items_user_expires_at', 'user_id', 'expires_at', postgresql_where=text('expires_at IS NOT NULL')),
     )
 
 class ShoppingListItem(Base):
@@ -52,6 +56,11 @@ class ShoppingListItem(Base):
     ingredient = relationship("Ingredient")
     user = relationship("User")
 
+    __table_args__ = (
+        # Pending items of a user in list order (only_pending=true)
+        Index('ix_shopping_list_items_user_pending', 'user_id', 'id', postgresql_where=text('is_checked = false')),
+    )
+
 class UserFoodLog(Base):
     __tablename__ = "user_food_logs"
 
@@ -70,3 +79,8 @@ class UserFoodLog(Base):
     ingredient = relationship("Ingredient")
     recipe = relationship("ExternalRecipe")
     user = relationship("User")
+
+    __table_args__ = (
+        # Daily log of a user in (created_at, id) cursor order
+        Index('ix_user_food_logs_user_date_created', 'user_id', 'date', 'created_at', 'id'),
+    )
@@ -45,3 +45,4 @@ class DailySummary(BaseModel):
     date: date
     totals: MacroTotals
     entries: List[FoodLogEntryRead]
+    next_cursor: Optional[str] = None  # Set when the entries were paged and more remain
@@ -0,0 +1,33 @@
+from pydantic import BaseModel
+from datetime import date
+from typing import List, Optional
+
+from app.schemas.log import MacroTotals
+
+
+class MealPlanTargets(BaseModel):
+    calories: float
+    protein: Optional[float] = None
+    carbs: Optional[float] = None
+    fat: Optional[float] = None
+
+
+class MealPlanMeal(BaseModel):
+    id: int
+    title: str
+    image_url: str | None = None
+    servings: int | None = None
+    nutrition_totals_per_serving: dict | None = None
+    pantry_coverage: float = 0  # Share of the recipe's ingredients in the pantry
+    expiring_ingredients_count: int = 0
+
+
+class MealPlanDay(BaseModel):
+    date: date
+    meals: List[MealPlanMeal]
+    totals: MacroTotals
+
+
+class MealPlan(BaseModel):
+    targets: MealPlanTargets
+    days: List[MealPlanDay]
@@ -17,6 +17,9 @@ class RecipeList(RecipeBase):
     
     model_config = ConfigDict(from_attributes=True)
 
+class RecipeSimilar(RecipeList):
+    similarity: float  # Estimated Jaccard similarity of the ingredient sets
+
 class RecipeDetail(RecipeList):
     ingredients: List[IngredientInRecipe] = []
     instructions: str | None = None
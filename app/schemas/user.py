@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List
 
 # Valid diet types for reference (not strictly enforced)
@@ -20,3 +20,19 @@ class UserProfileUpdate(BaseModel):
     diet_type: Optional[str] = None
     intolerances: Optional[List[str]] = None
     name: Optional[str] = None
+
+
+class UserRegister(BaseModel):
+    email: str
+    password: str = Field(..., min_length=8)
+    name: Optional[str] = None
+
+
+class LoginRequest(BaseModel):
+    email: str
+    password: str
+
+
+class Token(BaseModel):
+    access_token: str
+    token_type: str = "bearer"
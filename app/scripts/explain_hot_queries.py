@@ -0,0 +1,150 @@
+"""
+EXPLAIN the hot queries of the API and fail if any of them needs a sequential scan.
+
+Each statement below is built by the same function the route (or script) runs it
+from, with parameters taken from the seeded database: a user that has pantry items,
+today's date, a few recipes and their ingredients.
+
+Sequential scans are disabled for the check (enable_seqscan = off): the planner then
+only falls back to one when no index can serve the query, so the result does not
+depend on the size of the seeded tables.
+
+Usage:
+    python -m app.scripts.explain_hot_queries [--verbose]
+
+Exit code 1 if a query plans a Seq Scan.
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+from datetime import date, datetime, timezone
+
+# Add project root to sys.path
+sys.path.append(os.getcwd())
+
+from sqlalchemy import select
+
+from app.api.routes.ingredients import search_ingredients_stmt
+from app.api.routes.log import daily_log_stmt, daily_snapshot_totals_stmt
+from app.api.routes.pantry import pantry_items_stmt
+from app.api.routes.recipes import (
+    expiring_recommendations_stmt,
+    recipes_by_ingredients_stmt,
+    search_recipes_stmt,
+    select_recipe_ingredient_rows,
+)
+from app.api.routes.shopping import shopping_list_stmt
+from app.db.session import AsyncSessionLocal
+from app.models.recipe import ExternalRecipe, RecipeIngredient
+from app.models.user_pantry_log import PantryItem, User
+from app.scripts.run_translation_batch import pending_jobs_stmt
+
+PAGE = 51  # limit + 1, as the paginated routes fetch it
+
+
+def hot_queries(user_id: int, recipe_ids: list, ingredient_ids: list) -> list:
+    # Same day as the routes: log dates use the local date, expiry days are UTC
+    today = date.today()
+    utc_today = datetime.now(timezone.utc).date()
+    return [
+        ("GET /pantry/", pantry_items_stmt(user_id).limit(PAGE)),
+        ("GET /recipes/recommendations/expiring",
+            expiring_recommendations_stmt(user_id, utc_today, 3, 20, "es")),
+        ("GET /log/daily-summary (entries)", daily_log_stmt(user_id, today).limit(PAGE)),
+        ("GET /log/daily-summary (totals)", daily_snapshot_totals_stmt(user_id, today)),
+        ("GET /shopping-list/?only_pending=true", shopping_list_stmt(user_id, only_pending=True).limit(PAGE)),
+        ("run_translation_batch (pending jobs)", pending_jobs_stmt("es")),
+        ("GET /ingredients/search", search_ingredients_stmt("tom", 20, 0)),
+        ("GET /recipes/search", search_recipes_stmt("tomate", "es", None, None).limit(PAGE)),
+        ("GET /recipes/by-ingredients",
+            recipes_by_ingredients_stmt(ingredient_ids[:2], [], [], "es", None, None).limit(PAGE)),
+        ("GET /recipes/{id} (ingredient rows)", select_recipe_ingredient_rows(recipe_ids, user_id, "es")),
+    ]
+
+
+def _literal(value) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, (date, datetime)):
+        return f"'{value.isoformat()}'"
+    if isinstance(value, (list, tuple)):
+        return f"ARRAY[{', '.join(_literal(v) for v in value)}]"
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def inline_sql(stmt, dialect) -> str:
+    """
+    SQL of stmt with its parameters inlined: EXPLAIN is a utility statement and
+    takes no bind parameters (literal_binds can't render every type, e.g. regconfig).
+    """
+    compiled = stmt.compile(dialect=dialect, compile_kwargs={"render_postcompile": True})
+    params = compiled.construct_params()
+    values = [_literal(params[name]) for name in compiled.positiontup]
+    return re.sub(r"\$(\d+)", lambda m: values[int(m.group(1)) - 1], compiled.string)
+
+
+def seq_scans(plan: dict) -> list:
+    """Relations read with a Seq Scan anywhere in the plan tree."""
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name"))
+    for child in plan.get("Plans", []):
+        found.extend(seq_scans(child))
+    return found
+
+
+async def explain_hot_queries(verbose: bool = False) -> int:
+    async with AsyncSessionLocal() as session:
+        user_id = (await session.execute(
+            select(PantryItem.user_id).limit(1)
+        )).scalar_one_or_none() or (await session.execute(select(User.id).limit(1))).scalar_one_or_none()
+        recipe_ids = list((await session.execute(
+            select(ExternalRecipe.id).where(ExternalRecipe.ingredient_count > 0).limit(5)
+        )).scalars())
+        if user_id is None or not recipe_ids:
+            print("The database needs at least one user and one recipe with ingredients (seed it first).")
+            return 1
+        ingredient_ids = list((await session.execute(
+            select(RecipeIngredient.ingredient_id).where(RecipeIngredient.recipe_id == recipe_ids[0])
+        )).scalars())
+
+        connection = await session.connection()
+        # Transaction-scoped: the pooled connection gets its defaults back on rollback
+        await connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+
+        queries = hot_queries(user_id, recipe_ids, ingredient_ids)
+        failures = 0
+        for name, stmt in queries:
+            sql = inline_sql(stmt, connection.dialect)
+            result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+            raw = result.scalar_one()
+            plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+
+            scanned = seq_scans(plan)
+            status = f"SEQ SCAN on {', '.join(scanned)}" if scanned else "ok"
+            failures += bool(scanned)
+            print(f"{'FAIL' if scanned else 'ok  '}  {name}: {status} (cost {plan['Total Cost']:.0f})")
+            if verbose or scanned:
+                print(json.dumps(plan, indent=2))
+
+        await session.rollback()
+
+    print(f"{failures} of {len(queries)} queries need a sequential scan")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fail if a hot API query plans a sequential scan")
+    parser.add_argument("--verbose", action="store_true", help="Print every plan, not only failing ones")
+    args = parser.parse_args()
+
+    if sys.platform == 'win32':
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    sys.exit(asyncio.run(explain_hot_queries(verbose=args.verbose)))
@@ -0,0 +1,458 @@
+"""
+Generate a large, reproducible data set for profiling and benchmarks.
+
+- ingredients: English names with Spanish translations, nutrition per 100 g and unit
+  conversions, drawn from a table of base ingredients by category;
+- recipes: log-normal ingredient counts (median ~9), popularity-skewed ingredient
+  choice, a diet class (omnivore / pescatarian / vegetarian / vegan) restricting the
+  ingredient categories, diet labels and intolerance warnings derived from the chosen
+  ingredients, Spanish translations, nutrition computed with app.services.nutrition;
+- users: diet and intolerances, a pantry (expiry dates around --today), a shopping
+  list and --log-days days of food log.
+
+Rows are written with COPY (asyncpg copy_records_to_table) in a single transaction,
+then search vectors are built, sequences moved past the new ids and the tables
+analyzed. The same --seed and --today give the same rows; each section has its own
+random stream, so changing --users does not change the recipes (only the password
+salt differs between runs).
+
+Users are scale-<n>@cooky.test, all sharing the password USER_PASSWORD.
+
+Usage:
+    python -m app.scripts.generate_scale_data --reset [--recipes 100000] [--users 10000] [--ingredients 2000]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from itertools import accumulate
+from typing import Dict, List, Optional, Sequence
+
+# Add project root to sys.path
+sys.path.append(os.getcwd())
+
+from sqlalchemy import text
+
+from app.core.security import hash_password
+from app.db.session import AsyncSessionLocal
+from app.services.catalog_events import notify_catalog_changed
+from app.services.diet_mask import compute_diet_mask, compute_intolerance_mask
+from app.services.nutrition import calculate_recipe_macros, compute_nutrition, macros_for_grams, nutrition_dict
+from app.services.recipe_search import refresh_search_vectors
+
+USER_EMAIL = "scale-{}@cooky.test"
+USER_PASSWORD = "scale-password"
+
+# Recipes / users generated and written per batch
+RECIPE_BATCH = 10_000
+USER_BATCH = 1_000
+
+# category -> (calories, protein, carbohydrates, fat per 100 g), default unit, density g/ml, piece weight g
+CATEGORIES = {
+    "vegetable": ((30, 1.5, 6, 0.3), "g", None, 120),
+    "fruit": ((55, 0.8, 13, 0.3), "unit", None, 150),
+    "grain": ((350, 10, 72, 2), "g", None, None),
+    "legume": ((120, 8, 20, 1), "g", None, None),
+    "meat": ((220, 24, 0, 14), "g", None, None),
+    "fish": ((150, 22, 0, 6), "g", None, None),
+    "dairy": ((150, 8, 5, 10), "ml", 1.03, None),
+    "egg": ((155, 13, 1, 11), "unit", None, 55),
+    "nut": ((600, 20, 18, 52), "g", None, None),
+    "oil": ((884, 0, 0, 100), "tbsp", 0.92, None),
+    "spice": ((250, 10, 50, 5), "tsp", 0.6, None),
+    "sweet": ((400, 2, 90, 5), "g", None, None),
+}
+
+# (english, spanish, category), most used first: popularity follows this order
+BASE_INGREDIENTS = [
+    ("salt", "sal", "spice"), ("olive oil", "aceite de oliva", "oil"), ("garlic", "ajo", "vegetable"),
+    ("onion", "cebolla", "vegetable"), ("black pepper", "pimienta negra", "spice"), ("egg", "huevo", "egg"),
+    ("tomato", "tomate", "vegetable"), ("butter", "mantequilla", "dairy"), ("flour", "harina", "grain"),
+    ("milk", "leche", "dairy"), ("sugar", "azúcar", "sweet"), ("chicken breast", "pechuga de pollo", "meat"),
+    ("lemon", "limón", "fruit"), ("carrot", "zanahoria", "vegetable"), ("potato", "patata", "vegetable"),
+    ("parsley", "perejil", "spice"), ("rice", "arroz", "grain"), ("cheese", "queso", "dairy"),
+    ("bell pepper", "pimiento", "vegetable"), ("paprika", "pimentón", "spice"), ("pasta", "pasta", "grain"),
+    ("ground beef", "carne picada", "meat"), ("cumin", "comino", "spice"), ("spinach", "espinaca", "vegetable"),
+    ("mushroom", "champiñón", "vegetable"), ("salmon", "salmón", "fish"), ("zucchini", "calabacín", "vegetable"),
+    ("chickpea", "garbanzo", "legume"), ("yogurt", "yogur", "dairy"), ("cream", "nata", "dairy"),
+    ("oregano", "orégano", "spice"), ("basil", "albahaca", "spice"), ("honey", "miel", "sweet"),
+    ("lentil", "lenteja", "legume"), ("bread", "pan", "grain"), ("tuna", "atún", "fish"),
+    ("pork loin", "lomo de cerdo", "meat"), ("cucumber", "pepino", "vegetable"), ("eggplant", "berenjena", "vegetable"),
+    ("almond", "almendra", "nut"), ("broccoli", "brócoli", "vegetable"), ("apple", "manzana", "fruit"),
+    ("shrimp", "gamba", "fish"), ("oat", "avena", "grain"), ("black bean", "alubia negra", "legume"),
+    ("cinnamon", "canela", "spice"), ("leek", "puerro", "vegetable"), ("walnut", "nuez", "nut"),
+    ("banana", "plátano", "fruit"), ("cod", "bacalao", "fish"), ("lamb", "cordero", "meat"),
+    ("tofu", "tofu", "legume"), ("avocado", "aguacate", "fruit"), ("pumpkin", "calabaza", "vegetable"),
+    ("quinoa", "quinoa", "grain"), ("turkey", "pavo", "meat"), ("dark chocolate", "chocolate negro", "sweet"),
+    ("sunflower oil", "aceite de girasol", "oil"), ("hazelnut", "avellana", "nut"), ("strawberry", "fresa", "fruit"),
+    ("celery", "apio", "vegetable"), ("cauliflower", "coliflor", "vegetable"), ("pea", "guisante", "legume"),
+    ("orange", "naranja", "fruit"), ("bacon", "panceta", "meat"), ("sardine", "sardina", "fish"),
+]
+
+# (english prefix, spanish suffix), combined with BASE_INGREDIENTS into distinct ingredients
+VARIANTS = [
+    ("", ""), ("organic", "ecológico"), ("fresh", "fresco"), ("red", "rojo"), ("green", "verde"),
+    ("smoked", "ahumado"), ("dried", "seco"), ("frozen", "congelado"), ("baby", "baby"), ("wild", "silvestre"),
+]
+
+# Recipe intolerance warnings implied by an ingredient category
+CATEGORY_INTOLERANCES = {
+    "dairy": ("dairy",), "egg": ("egg",), "grain": ("gluten", "wheat"), "nut": ("tree nut",), "fish": ("fish", "seafood"),
+}
+
+# Recipe diet class -> (weight, excluded ingredient categories)
+DIET_CLASSES = {
+    "omnivore": (55, frozenset()),
+    "pescatarian": (15, frozenset({"meat"})),
+    "vegetarian": (20, frozenset({"meat", "fish"})),
+    "vegan": (10, frozenset({"meat", "fish", "dairy", "egg"})),
+}
+
+# (english, spanish) dish names for titles
+DISHES = [
+    ("stew", "Guiso"), ("salad", "Ensalada"), ("soup", "Sopa"), ("roast", "Asado"), ("curry", "Curry"),
+    ("bake", "Horneado"), ("stir-fry", "Salteado"), ("skillet", "Sartén"), ("bowl", "Bol"), ("tart", "Tarta"),
+]
+
+# Profile diets (see app.services.diet_mask.DIET_COMPATIBILITY) and their weights
+USER_DIETS = [(None, 55), ("omnivore", 7), ("vegetarian", 15), ("vegan", 7), ("pescatarian", 8), ("keto", 5), ("paleo", 3)]
+USER_INTOLERANCES = ["gluten", "dairy", "egg", "tree nut", "seafood"]
+
+# unit -> (min, max, step) of generated amounts
+AMOUNTS = {"g": (20, 300, 10), "ml": (50, 500, 25), "unit": (1, 4, 1), "tbsp": (1, 4, 1), "tsp": (0.5, 3, 0.5)}
+
+# Columns written per table (COPY needs every value the ORM defaults would fill)
+COLUMNS = {
+    "ingredients": ["id", "canonical_name", "display_name", "category", "default_unit", "nutrition_per_100g",
+                    "density_g_per_ml", "piece_weight_g", "source_priority", "is_verified", "created_at", "updated_at"],
+    "ingredient_translations": ["id", "ingredient_id", "lang", "name", "is_verified", "created_at", "updated_at"],
+    "external_recipes": ["id", "source", "external_id", "title_original", "servings", "diets", "intolerances_warn",
+                         "diet_mask", "intolerance_mask", "ingredient_count", "ingredient_ids",
+                         "nutrition_totals_per_serving", "instructions_raw", "created_at", "updated_at"],
+    "recipe_translations": ["id", "recipe_id", "lang", "title", "instructions", "is_verified", "created_at",
+                            "updated_at"],
+    "recipe_ingredients": ["id", "recipe_id", "ingredient_id", "amount", "unit", "position", "nutrition_for_amount",
+                           "created_at", "updated_at"],
+    "users": ["id", "email", "password_hash", "name", "diet_type", "intolerances", "pantry_version", "created_at",
+              "updated_at"],
+    "pantry_items": ["id", "user_id", "ingredient_id", "quantity", "unit", "expires_at", "created_at", "updated_at"],
+    "shopping_list_items": ["id", "user_id", "ingredient_id", "quantity", "unit", "linked_recipe_id", "is_checked",
+                            "created_at", "updated_at"],
+    "user_food_logs": ["id", "user_id", "date", "type", "recipe_id", "ingredient_id", "quantity", "unit",
+                       "nutrition_snapshot", "created_at", "updated_at"],
+}
+
+
+@dataclass(frozen=True, slots=True)
+class _Ingredient:
+    id: int
+    name: str
+    name_es: str
+    category: str
+    unit: str
+    nutrition: dict
+    density: Optional[float]
+    piece_weight: Optional[float]
+
+
+class _Picker:
+    """Weighted choice of distinct ingredients (weight 1 / rank^1.1: a few staples, a long tail)."""
+
+    def __init__(self, ingredients: Sequence[_Ingredient], ranks: Sequence[int]):
+        self.ingredients = list(ingredients)
+        self.cum_weights = list(accumulate(1 / (rank + 1) ** 1.1 for rank in ranks))
+
+    def pick(self, rng: random.Random, k: int) -> List[_Ingredient]:
+        k = min(k, len(self.ingredients))
+        chosen: Dict[int, _Ingredient] = {}
+        total = self.cum_weights[-1]
+        while len(chosen) < k:
+            ingredient = self.ingredients[bisect_left(self.cum_weights, rng.random() * total)]
+            chosen.setdefault(ingredient.id, ingredient)
+        return list(chosen.values())
+
+
+def _amount(rng: random.Random, unit: str) -> float:
+    low, high, step = AMOUNTS[unit]
+    return round(low + step * rng.randint(0, int((high - low) / step)), 2)
+
+
+def _weighted(rng: random.Random, options: Sequence[tuple]):
+    return rng.choices([o[0] for o in options], weights=[o[1] for o in options])[0]
+
+
+def _at(day: date, rng: random.Random) -> datetime:
+    return datetime.combine(day, dt_time(rng.randint(7, 22), rng.randint(0, 59)), tzinfo=timezone.utc)
+
+
+def _diet_labels(categories: frozenset, rng: random.Random) -> List[str]:
+    """Spoonacular-style diet labels consistent with the recipe's ingredient categories."""
+    labels = []
+    if "grain" not in categories:
+        labels.append("gluten free")
+    if "dairy" not in categories:
+        labels.append("dairy free")
+    if not categories & {"meat", "fish"}:
+        labels += ["lacto ovo vegetarian", "vegetarian"]
+        if not categories & {"dairy", "egg"}:
+            labels.append("vegan")
+    elif "meat" not in categories:
+        labels.append("pescatarian")
+    if not categories & {"grain", "sweet", "fruit", "legume"} and rng.random() < 0.5:
+        labels.append("ketogenic")
+    if not categories & {"grain", "legume", "dairy"} and rng.random() < 0.3:
+        labels += ["paleolithic", "primal"]
+    return labels
+
+
+def generate_ingredients(count: int, first_id: int, rng: random.Random) -> List[_Ingredient]:
+    ingredients = []
+    for i in range(count):
+        en, es, category = BASE_INGREDIENTS[i % len(BASE_INGREDIENTS)]
+        prefix, suffix = VARIANTS[(i // len(BASE_INGREDIENTS)) % len(VARIANTS)]
+        generation = i // (len(BASE_INGREDIENTS) * len(VARIANTS))
+        number = f" {generation + 1}" if generation else ""
+        macros, unit, density, piece_weight = CATEGORIES[category]
+        ingredients.append(_Ingredient(
+            id=first_id + i,
+            name=f"{prefix} {en}".strip() + number,
+            name_es=f"{es} {suffix}".strip() + number,
+            category=category,
+            unit=unit,
+            nutrition={key: round(value * rng.uniform(0.7, 1.3), 1)
+                       for key, value in zip(("calories", "protein", "carbohydrates", "fat"), macros)},
+            density=density,
+            piece_weight=round(piece_weight * rng.uniform(0.6, 1.4)) if piece_weight else None,
+        ))
+    return ingredients
+
+
+def ingredient_records(ingredients: Sequence[_Ingredient], first_translation_id: int, now: datetime):
+    rows, translations = [], []
+    for n, ingredient in enumerate(ingredients):
+        rows.append((ingredient.id, ingredient.name, ingredient.name, ingredient.category, ingredient.unit,
+                     json.dumps(ingredient.nutrition), ingredient.density, ingredient.piece_weight, 2, True, now, now))
+        translations.append((first_translation_id + n, ingredient.id, "es", ingredient.name_es, True, now, now))
+    return rows, translations
+
+
+def generate_recipes(recipe_ids: range, first_ids: Dict[str, int], pickers: Dict[str, _Picker],
+                     ingredients: Sequence[_Ingredient], rng: random.Random, today: date):
+    """Records of one batch of recipes, their translations and ingredient rows; plus per-serving nutrition by id."""
+    class_names = list(DIET_CLASSES)
+    class_weights = [DIET_CLASSES[name][0] for name in class_names]
+    recipes, translation_rows, rows, row_ingredients = [], [], [], []
+
+    for recipe_id in recipe_ids:
+        diet_class = rng.choices(class_names, weights=class_weights)[0]
+        size = max(2, min(30, round(rng.lognormvariate(2.2, 0.4))))
+        picked = pickers[diet_class].pick(rng, size)
+        # Main ingredients first, seasoning last (row positions and titles)
+        picked.sort(key=lambda i: i.category in ("spice", "oil", "sweet"))
+        categories = frozenset(i.category for i in picked)
+        diets = _diet_labels(categories, rng)
+        warnings = sorted({w for c in categories for w in CATEGORY_INTOLERANCES.get(c, ())})
+        dish_en, dish_es = rng.choice(DISHES)
+        main, second = picked[0], picked[1]
+        created = _at(today - timedelta(days=rng.randint(0, 730)), rng)
+        servings = rng.choice([1, 2, 2, 4, 4, 4, 6, 8])
+
+        recipes.append([
+            recipe_id, "synthetic", str(recipe_id), f"{main.name.capitalize()} and {second.name} {dish_en}", servings,
+            json.dumps(diets), json.dumps(warnings), compute_diet_mask(diets), compute_intolerance_mask(warnings),
+            len(picked), sorted(i.id for i in picked), None,
+            f"Prepare the {main.name} and the {second.name}, combine everything and cook for "
+            f"{rng.randint(2, 12) * 5} minutes.",
+            created, created,
+        ])
+        translation_rows.append((
+            first_ids["recipe_translations"] + len(translation_rows), recipe_id, "es",
+            f"{dish_es} de {main.name_es} con {second.name_es}",
+            f"Preparar {main.name_es} y {second.name_es}, mezclar todo y cocinar.", True, created, created,
+        ))
+        for position, ingredient in enumerate(picked):
+            rows.append([
+                first_ids["recipe_ingredients"] + len(rows), recipe_id, ingredient.id,
+                _amount(rng, ingredient.unit), ingredient.unit, position, None, created, created,
+            ])
+            row_ingredients.append(ingredient)
+
+    # Row and per-serving nutrition, as recompute_nutrition computes them
+    result = compute_nutrition(
+        [(i.id, i.nutrition, i.density, i.piece_weight) for i in ingredients],
+        [(row[1], row[2], row[3], row[4]) for row in rows],
+        list(recipe_ids),
+    )
+    for row, values, ok in zip(rows, result.row_nutrition, result.row_ok.tolist()):
+        row[6] = json.dumps(nutrition_dict(values)) if ok else None
+    per_serving = {}
+    for recipe, totals in zip(recipes, result.recipe_totals):
+        per_serving[recipe[0]] = nutrition_dict(totals / recipe[4])
+        recipe[11] = json.dumps(per_serving[recipe[0]])
+    return recipes, translation_rows, rows, per_serving
+
+
+def generate_user(user_id: int, first_ids: Dict[str, int], password_hash: str, ingredients: Sequence[_Ingredient],
+                  picker: _Picker, recipe_nutrition: Dict[int, dict], recipe_ids: Sequence[int], log_days: int,
+                  rng: random.Random, today: date):
+    """Records of one user: (user, pantry items, shopping list items, food log entries)."""
+    diet = _weighted(rng, USER_DIETS)
+    intolerances = rng.sample(USER_INTOLERANCES, rng.choice([0, 0, 0, 1, 1, 2]))
+    created = _at(today - timedelta(days=rng.randint(log_days, log_days + 365)), rng)
+    user = (user_id, USER_EMAIL.format(user_id), password_hash, f"User {user_id}", diet, json.dumps(intolerances),
+            0, created, created)
+
+    pantry = []
+    for ingredient in picker.pick(rng, max(3, min(120, round(rng.lognormvariate(3.0, 0.5))))):
+        expires = _at(today + timedelta(days=int(rng.expovariate(1 / 20)) - 5), rng) if rng.random() < 0.65 else None
+        added = _at(today - timedelta(days=rng.randint(0, 60)), rng)
+        pantry.append((first_ids["pantry_items"] + len(pantry), user_id, ingredient.id,
+                       _amount(rng, ingredient.unit) * rng.randint(1, 4), ingredient.unit, expires, added, added))
+
+    shopping = []
+    for ingredient in picker.pick(rng, rng.randint(0, 25)):
+        added = _at(today - timedelta(days=rng.randint(0, 14)), rng)
+        shopping.append((first_ids["shopping_list_items"] + len(shopping), user_id, ingredient.id,
+                         _amount(rng, ingredient.unit), ingredient.unit,
+                         rng.choice(recipe_ids) if rng.random() < 0.3 else None, rng.random() < 0.3, added, added))
+
+    logs = []
+    for days_ago in range(log_days):
+        if rng.random() >= 0.85:
+            continue
+        day = today - timedelta(days=days_ago)
+        for _ in range(rng.randint(1, 5)):
+            logged = _at(day, rng)
+            if rng.random() < 0.7:
+                recipe_id = rng.choice(recipe_ids)
+                servings = rng.choice([0.5, 1, 1, 1, 1.5, 2])
+                macros = calculate_recipe_macros(recipe_nutrition[recipe_id], servings)
+                entry = ("recipe", recipe_id, None, servings, "serving")
+            else:
+                ingredient = rng.choice(ingredients)
+                grams = float(rng.choice([50, 100, 150, 200, 250]))
+                macros = macros_for_grams(ingredient.nutrition, grams)
+                entry = ("ingredient", None, ingredient.id, grams, "g")
+            logs.append((first_ids["user_food_logs"] + len(logs), user_id, day, *entry,
+                         json.dumps(macros.model_dump()), logged, logged))
+    return user, pantry, shopping, logs
+
+
+async def generate(recipes: int, ingredients: int, users: int, log_days: int, seed: int, today: date,
+                   reset: bool) -> None:
+    started = time.perf_counter()
+    now = datetime.combine(today, dt_time(12), tzinfo=timezone.utc)
+
+    async with AsyncSessionLocal() as session:
+        if reset:
+            await session.execute(text(
+                "TRUNCATE user_food_logs, shopping_list_items, pantry_items, recipe_ingredients, "
+                "recipe_translations, external_recipes, ingredient_translations, ingredients, "
+                "translation_jobs, users RESTART IDENTITY CASCADE"
+            ))
+        # Ids are assigned here (COPY bypasses the sequences); executing a statement also
+        # opens the transaction the COPYs below run in
+        next_ids = {}
+        for table in COLUMNS:
+            next_ids[table] = (await session.execute(text(f"SELECT coalesce(max(id), 0) + 1 FROM {table}"))).scalar_one()
+        connection = await (await session.connection()).get_raw_connection()
+        driver = connection.driver_connection
+
+        async def copy(table: str, records: list) -> None:
+            if records:
+                await driver.copy_records_to_table(table, records=records, columns=COLUMNS[table])
+                next_ids[table] += len(records)
+
+        # 1. Ingredients
+        generated = generate_ingredients(ingredients, next_ids["ingredients"], random.Random(f"{seed}-ingredients"))
+        rows, translations = ingredient_records(generated, next_ids["ingredient_translations"], now)
+        await copy("ingredients", rows)
+        await copy("ingredient_translations", translations)
+        print(f"{len(generated)} ingredients ({time.perf_counter() - started:.1f}s)")
+
+        ranks = range(len(generated))
+        pickers = {
+            name: _Picker([i for i in generated if i.category not in excluded],
+                          [r for r, i in zip(ranks, generated) if i.category not in excluded])
+            for name, (_, excluded) in DIET_CLASSES.items()
+        }
+
+        # 2. Recipes, in batches (translations and ingredient rows of a batch reference its ids)
+        rng = random.Random(f"{seed}-recipes")
+        recipe_nutrition: Dict[int, dict] = {}
+        first_recipe = next_ids["external_recipes"]
+        for batch_start in range(first_recipe, first_recipe + recipes, RECIPE_BATCH):
+            batch = range(batch_start, min(batch_start + RECIPE_BATCH, first_recipe + recipes))
+            recipe_rows, translation_rows, ingredient_rows, per_serving = generate_recipes(
+                batch, next_ids, pickers, generated, rng, today
+            )
+            await copy("external_recipes", recipe_rows)
+            await copy("recipe_translations", translation_rows)
+            await copy("recipe_ingredients", ingredient_rows)
+            await refresh_search_vectors(session, batch)
+            recipe_nutrition.update(per_serving)
+            print(f"{batch.stop - first_recipe} recipes ({time.perf_counter() - started:.1f}s)")
+        recipe_ids = list(recipe_nutrition)
+
+        # 3. Users with pantries, shopping lists and food logs (one random stream per user)
+        if users and recipe_ids:
+            # One hash for every user: pbkdf2 per row would dominate the run
+            password_hash = hash_password(USER_PASSWORD)
+            first_user = next_ids["users"]
+            for batch_start in range(first_user, first_user + users, USER_BATCH):
+                user_rows, pantry, shopping, logs = [], [], [], []
+                for user_id in range(batch_start, min(batch_start + USER_BATCH, first_user + users)):
+                    user, *owned = generate_user(
+                        user_id, {t: next_ids[t] + len(r) for t, r in (
+                            ("pantry_items", pantry), ("shopping_list_items", shopping), ("user_food_logs", logs)
+                        )},
+                        password_hash, generated, pickers["omnivore"], recipe_nutrition, recipe_ids, log_days,
+                        random.Random(f"{seed}-user-{user_id - first_user}"), today,
+                    )
+                    user_rows.append(user)
+                    for records, new in zip((pantry, shopping, logs), owned):
+                        records.extend(new)
+                await copy("users", user_rows)
+                await copy("pantry_items", pantry)
+                await copy("shopping_list_items", shopping)
+                await copy("user_food_logs", logs)
+                print(f"{user_id - first_user + 1} users ({time.perf_counter() - started:.1f}s)")
+
+        # 4. Sequences past the copied ids, planner statistics, catalog reload in running workers
+        for table in COLUMNS:
+            await session.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), {next_ids[table]}, false)"
+            ))
+        await session.execute(text("ANALYZE"))
+        await notify_catalog_changed(session, "recipes")
+        await session.commit()
+
+    print(f"Generated in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a large, reproducible data set")
+    parser.add_argument("--recipes", type=int, default=100_000)
+    parser.add_argument("--ingredients", type=int, default=2_000)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--log-days", type=int, default=90, help="Days of food log per user")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--today", type=date.fromisoformat, default=date.today(),
+                        help="Reference date for expiry dates and logs (YYYY-MM-DD, default: today)")
+    parser.add_argument("--reset", action="store_true", help="Empty every table first")
+    args = parser.parse_args()
+
+    if args.ingredients < 2:
+        parser.error("--ingredients must be at least 2")
+    if sys.platform == 'win32':
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    asyncio.run(generate(
+        recipes=args.recipes, ingredients=args.ingredients, users=args.users, log_days=args.log_days,
+        seed=args.seed, today=args.today, reset=args.reset,
+    ))
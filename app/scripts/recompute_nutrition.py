@@ -0,0 +1,130 @@
+"""
+Recompute recipe nutrition from ingredient data for the whole catalog.
+
+- recipe_ingredients.nutrition_for_amount: nutrition of each row's amount
+  (rows whose unit can't be converted to grams, e.g. a volume of an ingredient with no
+  density, or whose ingredient has no nutrition_per_100g, are set to NULL)
+- external_recipes.nutrition_totals_per_serving: sum of the rows / servings, only for
+  recipes where every row could be computed (others keep their Spoonacular values,
+  unless --allow-partial)
+
+Usage:
+    python -m app.scripts.recompute_nutrition [--dry-run] [--allow-partial]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+# Add project root to sys.path
+sys.path.append(os.getcwd())
+
+import numpy as np
+from sqlalchemy import select, text
+
+from app.db.session import AsyncSessionLocal
+from app.models.ingredient import Ingredient
+from app.models.recipe import ExternalRecipe, RecipeIngredient
+from app.services.catalog_events import notify_catalog_changed
+from app.services.nutrition import compute_nutrition, nutrition_dict
+from app.services.units import UNITS, VOLUME, normalize_unit
+
+# Rows per bulk UPDATE statement
+WRITE_CHUNK_SIZE = 5000
+
+_UPDATE_ROWS_SQL = text("""
+    UPDATE recipe_ingredients ri SET nutrition_for_amount = v.nutrition::jsonb
+    FROM unnest(CAST(:ids AS integer[]), CAST(:nutrition AS text[])) AS v(id, nutrition)
+    WHERE ri.id = v.id
+""")
+
+_UPDATE_RECIPES_SQL = text("""
+    UPDATE external_recipes er SET nutrition_totals_per_serving = v.nutrition::jsonb
+    FROM unnest(CAST(:ids AS integer[]), CAST(:nutrition AS text[])) AS v(id, nutrition)
+    WHERE er.id = v.id
+""")
+
+
+async def _bulk_update(session, statement, ids, payloads):
+    for start in range(0, len(ids), WRITE_CHUNK_SIZE):
+        await session.execute(statement, {
+            "ids": ids[start:start + WRITE_CHUNK_SIZE],
+            "nutrition": payloads[start:start + WRITE_CHUNK_SIZE],
+        })
+
+
+async def recompute_nutrition(dry_run: bool = False, allow_partial: bool = False):
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as session:
+        # 1. Column-only loads (no ORM objects)
+        ingredients = (await session.execute(select(
+            Ingredient.id, Ingredient.nutrition_per_100g, Ingredient.density_g_per_ml, Ingredient.piece_weight_g
+        ))).all()
+        recipes = (await session.execute(select(ExternalRecipe.id, ExternalRecipe.servings))).all()
+        rows = (await session.execute(select(
+            RecipeIngredient.id, RecipeIngredient.recipe_id, RecipeIngredient.ingredient_id,
+            RecipeIngredient.amount, RecipeIngredient.unit
+        ))).all()
+        loaded = time.perf_counter()
+
+        # 2. Matrix computation
+        result = compute_nutrition(
+            ingredients,
+            [(r.recipe_id, r.ingredient_id, r.amount, r.unit) for r in rows],
+            [r.id for r in recipes],
+        )
+        servings = np.fromiter((r.servings or 1 for r in recipes), dtype=np.float64, count=len(recipes))
+        per_serving = result.recipe_totals / servings[:, None] if len(recipes) else result.recipe_totals
+        writable = result.recipe_complete if not allow_partial else result.recipe_totals.any(axis=1)
+        computed = time.perf_counter()
+
+        print(f"Ingredients: {len(ingredients)}, recipes: {len(recipes)}, recipe ingredient rows: {len(rows)}")
+        print(f"Rows computed: {int(result.row_ok.sum())}/{len(rows)}")
+        # Volume amounts are only converted with the ingredient's own density
+        densities = {i.id: i.density_g_per_ml for i in ingredients}
+        no_density = sum(
+            1 for r in rows
+            if normalize_unit(r.unit) in UNITS and UNITS[normalize_unit(r.unit)][0] == VOLUME
+            and not densities.get(r.ingredient_id)
+        )
+        if no_density:
+            print(f"Rows in a volume unit whose ingredient has no density_g_per_ml: {no_density}")
+        print(f"Recipes with complete data: {int(result.recipe_complete.sum())}/{len(recipes)}")
+        print(f"Load {loaded - started:.2f}s, compute {computed - loaded:.2f}s")
+
+        if dry_run:
+            print("Dry run: nothing written.")
+            return
+
+        # 3. Bulk writes
+        row_payloads = [
+            json.dumps(nutrition_dict(values)) if ok else None
+            for values, ok in zip(result.row_nutrition, result.row_ok.tolist())
+        ]
+        await _bulk_update(session, _UPDATE_ROWS_SQL, [r.id for r in rows], row_payloads)
+
+        recipe_positions = np.flatnonzero(writable).tolist()
+        await _bulk_update(
+            session, _UPDATE_RECIPES_SQL,
+            [recipes[i].id for i in recipe_positions],
+            [json.dumps(nutrition_dict(per_serving[i])) for i in recipe_positions],
+        )
+
+        # Running API workers reload their catalog snapshot (per-serving macros) on commit
+        await notify_catalog_changed(session, "recipes")
+        await session.commit()
+        print(f"Written {len(rows)} rows and {len(recipe_positions)} recipes in {time.perf_counter() - computed:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute recipe nutrition from ingredient data")
+    parser.add_argument("--dry-run", action="store_true", help="Compute and report, don't write")
+    parser.add_argument("--allow-partial", action="store_true",
+                        help="Also overwrite per-serving totals of recipes with rows that couldn't be computed")
+    args = parser.parse_args()
+
+    if sys.platform == 'win32':
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    asyncio.run(recompute_nutrition(dry_run=args.dry_run, allow_partial=args.allow_partial))
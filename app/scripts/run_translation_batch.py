@@ -6,15 +6,19 @@ from app.models.translation import TranslationJob
 from app.models.ingredient import Ingredient, IngredientTranslation
 from app.models.recipe import ExternalRecipe, RecipeTranslation
 from app.services.translation import translate_text
+from app.services.catalog_events import notify_catalog_changed
+from app.services.recipe_search import refresh_search_vectors, refresh_search_vectors_for_ingredient
+
+def pending_jobs_stmt(target_lang: str, batch_size: int = 20):
+    """The next batch of pending translation jobs for target_lang."""
+    return select(TranslationJob).where(
+        and_(TranslationJob.status == "pending", TranslationJob.target_lang == target_lang)
+    ).limit(batch_size)
 
 async def process_translation_jobs():
     async with AsyncSessionLocal() as session:
         # Fetch pending jobs
-        result = await session.execute(
-            select(TranslationJob).where(
-                and_(TranslationJob.status == "pending", TranslationJob.target_lang == "es")
-            ).limit(20) # Process in batches
-        )
+        result = await session.execute(pending_jobs_stmt("es"))
         jobs = result.scalars().all()
         
         if not jobs:
@@ -54,6 +58,10 @@ async def process_translation_jobs():
                             )
                             session.add(new_trans)
                         
+                        # Recipes using this ingredient are searchable by its Spanish name
+                        await session.flush()
+                        await refresh_search_vectors_for_ingredient(session, ingredient.id)
+                        
                         job.status = "done"
 
                 elif job.entity_type == "recipe":
@@ -80,6 +88,9 @@ async def process_translation_jobs():
                             )
                             session.add(new_trans)
                         
+                        await session.flush()
+                        await refresh_search_vectors(session, [recipe.id])
+                        
                         job.status = "done"
                 
                 else:
@@ -92,6 +103,10 @@ async def process_translation_jobs():
                 print(f"Error processing job {job.id}: {e}")
             
             await session.commit()
+        
+        # Running API workers drop cached titles/names when this commits
+        await notify_catalog_changed(session, "translations")
+        await session.commit()
 
 if __name__ == "__main__":
     from datetime import datetime
@@ -0,0 +1,216 @@
+"""
+Catalog change notifications between processes.
+
+Writers (recipe imports, translation batches) call notify_catalog_changed() inside
+their transaction; Postgres delivers the NOTIFY on commit. Every API worker keeps one
+LISTEN connection and dispatches the events to the in-process caches subscribed here.
+
+Each event also carries the next value of the catalog_version_seq sequence. Workers
+track the highest version seen (including their own events) so HTTP ETags can be
+built from it without touching the database.
+
+User events (profile or pantry changes, see notify_user_changed) share the channel but
+carry no version; they are applied in every worker, the sender included.
+
+The LISTEN connection is kept up by a background task that reconnects with backoff.
+Events sent while it was down are lost, so every (re)connect runs the reset handlers
+(subscribe_reset), which drop everything the caches may have missed.
+"""
+import asyncio
+import json
+import logging
+import os
+import uuid
+from typing import Callable, List, Optional
+
+import asyncpg
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CATALOG_CHANNEL = "cooky_catalog"
+
+# Identifies this process so a worker can skip the events it sent itself
+PROCESS_TOKEN = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+_handlers: List[Callable[[str], None]] = []
+_user_handlers: List[Callable[[int], None]] = []
+_reset_handlers: List[Callable[[], None]] = []
+_listener_conn: Optional[asyncpg.Connection] = None
+_listener_task: Optional[asyncio.Task] = None
+_listener_lost: Optional[asyncio.Event] = None
+_catalog_version: Optional[int] = None
+
+# Delay between reconnect attempts, doubled after each failure up to the max
+RECONNECT_MIN_SECONDS = 1.0
+RECONNECT_MAX_SECONDS = 30.0
+
+
+def subscribe(handler: Callable[[str], None]) -> None:
+    """Register a handler called with the event kind (e.g. "recipes") for events from other processes."""
+    _handlers.append(handler)
+
+
+def subscribe_user(handler: Callable[[int], None]) -> None:
+    """Register a handler called with the user id of every user event, this process's included."""
+    _user_handlers.append(handler)
+
+
+def subscribe_reset(handler: Callable[[], None]) -> None:
+    """
+    Register a handler called whenever the listener (re)connects: events sent while it
+    was down were lost, so the handler must drop everything they could have invalidated.
+    """
+    _reset_handlers.append(handler)
+
+
+def catalog_version() -> Optional[int]:
+    """
+    Version of the catalog as last announced over NOTIFY.
+    None when the listener is not running (the version would not be kept up to date).
+    """
+    if _listener_conn is None:
+        return None
+    return _catalog_version
+
+
+async def notify_catalog_changed(db: AsyncSession, kind: str) -> int:
+    """
+    Bump the catalog version and queue a change event; the event is delivered when the
+    surrounding transaction commits. Returns the new version.
+    """
+    version = (await db.execute(select(func.nextval("catalog_version_seq")))).scalar_one()
+    payload = json.dumps({"kind": kind, "origin": PROCESS_TOKEN, "version": version})
+    await db.execute(select(func.pg_notify(CATALOG_CHANNEL, payload)))
+    return version
+
+
+async def notify_user_changed(db: AsyncSession, user_id: int) -> None:
+    """Queue a user event (delivered on commit) so every worker drops its cached copy of the user."""
+    payload = json.dumps({"kind": "user", "origin": PROCESS_TOKEN, "user_id": user_id})
+    await db.execute(select(func.pg_notify(CATALOG_CHANNEL, payload)))
+
+
+def _dispatch(connection, pid, channel, payload) -> None:
+    global _catalog_version
+    try:
+        event = json.loads(payload)
+    except ValueError:
+        logger.warning(f"Ignoring malformed catalog event: {payload!r}")
+        return
+
+    # Our own events still advance the version: NOTIFY is only delivered after commit
+    version = event.get("version")
+    if isinstance(version, int) and (_catalog_version is None or version > _catalog_version):
+        _catalog_version = version
+
+    if event.get("kind") == "user":
+        # Delivered after commit, so a reader in this process cannot re-cache the old row
+        for handler in _user_handlers:
+            try:
+                handler(event.get("user_id"))
+            except Exception as e:
+                logger.error(f"User event handler failed: {e}")
+        return
+
+    if event.get("origin") == PROCESS_TOKEN:
+        return
+
+    for handler in _handlers:
+        try:
+            handler(event.get("kind", ""))
+        except Exception as e:
+            logger.error(f"Catalog event handler failed: {e}")
+
+
+def _on_listener_lost(connection) -> None:
+    # Without the listener, versions and invalidations are no longer seen
+    global _listener_conn
+    if connection is _listener_conn:
+        logger.warning("Catalog listener connection lost")
+        _listener_conn = None
+        if _listener_lost is not None:
+            _listener_lost.set()
+
+
+def _listener_dsn() -> str:
+    # asyncpg wants a plain libpq URL, without the SQLAlchemy driver suffix
+    return settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+
+async def _connect_listener() -> None:
+    """Open the LISTEN connection, read the current catalog version and run the reset handlers."""
+    global _listener_conn, _catalog_version
+    _listener_lost.clear()
+    connection = await asyncpg.connect(_listener_dsn())
+    try:
+        # Listen first so no bump between the read and the LISTEN is missed
+        await connection.add_listener(CATALOG_CHANNEL, _dispatch)
+        connection.add_termination_listener(_on_listener_lost)
+        last_value = await connection.fetchval(
+            "SELECT CASE WHEN is_called THEN last_value ELSE 0 END FROM catalog_version_seq"
+        )
+    except BaseException:
+        await connection.close()
+        raise
+    _catalog_version = max(_catalog_version or 0, last_value)
+    _listener_conn = connection
+    if connection.is_closed():
+        # Lost before it was registered, so _on_listener_lost ignored it
+        _on_listener_lost(connection)
+
+    for handler in _reset_handlers:
+        try:
+            handler()
+        except Exception as e:
+            logger.error(f"Catalog reset handler failed: {e}")
+
+
+async def _run_listener() -> None:
+    """Keep the LISTEN connection up: reconnect with exponential backoff whenever it drops."""
+    delay = RECONNECT_MIN_SECONDS
+    while True:
+        try:
+            await _connect_listener()
+        except Exception as e:
+            logger.warning(f"Catalog listener not connected, retrying in {delay:g} s: {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+            continue
+        logger.info("Catalog listener connected")
+        delay = RECONNECT_MIN_SECONDS
+        await _listener_lost.wait()
+
+
+async def start_catalog_listener() -> None:
+    """
+    Start the task that keeps the LISTEN connection up. The first connection is awaited
+    briefly so ETags are available right away; failures are logged and retried, and
+    meanwhile caches rely on their max age and ETags are disabled.
+    """
+    global _listener_task, _listener_lost
+    if _listener_task is not None:
+        return
+    _listener_lost = asyncio.Event()
+    _listener_task = asyncio.create_task(_run_listener())
+    for _ in range(50):
+        if _listener_conn is not None or _listener_task.done():
+            break
+        await asyncio.sleep(0.1)
+
+
+async def stop_catalog_listener() -> None:
+    global _listener_conn, _listener_task
+    if _listener_task is not None:
+        _listener_task.cancel()
+        try:
+            await _listener_task
+        except asyncio.CancelledError:
+            pass
+        _listener_task = None
+    if _listener_conn is not None:
+        connection, _listener_conn = _listener_conn, None
+        await connection.close()
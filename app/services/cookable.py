@@ -0,0 +1,162 @@
+"""
+"What can I cook now": rank the whole catalog by pantry coverage.
+
+Built once per catalog snapshot (app.services.recipe_catalog):
+  - an inverted index ingredient_id -> positions of the recipes using it (views into
+    one numpy array), so counting how many of each recipe's ingredients are in the
+    pantry is one np.bincount over the postings of the pantry's ingredients;
+  - per-position sizes and diet / intolerance masks as numpy arrays.
+The matched ingredients of the top candidates are read from CatalogRecipe.ingredient_ids.
+The build runs in a worker thread so a large catalog does not block the event loop.
+Quantity checks (calculate_availability) are left to the caller for the top candidates only.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.services.recipe_catalog import CatalogRecipe, CatalogSnapshot, recipe_catalog
+
+logger = logging.getLogger(__name__)
+
+_EMPTY_POSTINGS = np.empty(0, dtype=np.int32)
+
+
+@dataclass(frozen=True, slots=True)
+class CookableCandidate:
+    recipe: CatalogRecipe
+    matched_count: int  # recipe ingredient rows whose ingredient is in the pantry
+    coverage: float  # matched_count / ingredient rows
+    matched_ingredient_ids: frozenset
+
+
+@dataclass(frozen=True)
+class CookableIndex:
+    snapshot: CatalogSnapshot
+    recipes: Tuple[CatalogRecipe, ...]  # position -> recipe
+    sizes: np.ndarray  # ingredient rows per recipe
+    diet_masks: np.ndarray
+    intolerance_masks: np.ndarray
+    postings: Dict[int, np.ndarray]  # ingredient_id -> recipe positions (one per ingredient row)
+
+    def matched_counts(self, ingredient_ids: Iterable[int]) -> np.ndarray:
+        """Per recipe position, how many ingredient rows use one of the given ingredients."""
+        postings = [self.postings.get(i, _EMPTY_POSTINGS) for i in set(ingredient_ids)]
+        if not postings:
+            return np.zeros(len(self.recipes), dtype=np.int64)
+        return np.bincount(np.concatenate(postings), minlength=len(self.recipes))
+
+    def coverage_of(self, matched: np.ndarray) -> np.ndarray:
+        """matched / ingredient rows per recipe position."""
+        coverage = np.zeros(len(self.recipes), dtype=np.float64)
+        np.divide(matched, self.sizes, out=coverage, where=self.sizes > 0)
+        return coverage
+
+    def diet_filter(self, required_diet_mask: Optional[int], excluded_intolerance_mask: int) -> np.ndarray:
+        """Boolean mask of recipe positions passing the diet / intolerance masks."""
+        eligible = np.ones(len(self.recipes), dtype=bool)
+        if required_diet_mask is not None:
+            eligible &= (self.diet_masks & required_diet_mask) != 0
+        if excluded_intolerance_mask:
+            eligible &= (self.intolerance_masks & excluded_intolerance_mask) == 0
+        return eligible
+
+    def rank(
+        self,
+        pantry_ingredient_ids: Iterable[int],
+        required_diet_mask: Optional[int],
+        excluded_intolerance_mask: int,
+        top_n: int,
+        min_coverage: float = 0.0,
+    ) -> List[CookableCandidate]:
+        """
+        Top recipes by pantry coverage (ties: more matched ingredients, then lower id).
+        Only recipes with at least one pantry ingredient are returned.
+        """
+        pantry_ids = set(pantry_ingredient_ids)
+        if not pantry_ids or not self.recipes:
+            return []
+
+        matched = self.matched_counts(pantry_ids)
+        eligible = (matched > 0) & self.diet_filter(required_diet_mask, excluded_intolerance_mask)
+
+        coverage = self.coverage_of(matched)
+        if min_coverage > 0:
+            eligible &= coverage >= min_coverage
+
+        candidates = np.flatnonzero(eligible)
+        if len(candidates) > top_n:
+            keep = np.argpartition(-coverage[candidates], top_n - 1)[:top_n]
+            candidates = candidates[keep]
+
+        # Positions follow recipe id order, so the last key breaks ties by id
+        order = np.lexsort((candidates, -matched[candidates], -coverage[candidates]))
+
+        return [
+            CookableCandidate(
+                recipe=self.recipes[pos],
+                matched_count=int(matched[pos]),
+                coverage=float(coverage[pos]),
+                matched_ingredient_ids=frozenset(pantry_ids.intersection(self.recipes[pos].ingredient_ids)),
+            )
+            for pos in candidates[order].tolist()
+        ]
+
+
+def build_index(snapshot: CatalogSnapshot) -> CookableIndex:
+    recipes = tuple(r for r in snapshot.recipes if r.ingredient_ids)
+    sizes = np.fromiter((len(r.ingredient_ids) for r in recipes), dtype=np.int32, count=len(recipes))
+
+    # One (ingredient_id, position) pair per ingredient row, grouped by ingredient
+    ingredient_ids = np.fromiter(
+        (i for r in recipes for i in r.ingredient_ids), dtype=np.int64, count=int(sizes.sum())
+    )
+    positions = np.repeat(np.arange(len(recipes), dtype=np.int32), sizes)
+    order = np.argsort(ingredient_ids, kind="stable")
+    ingredient_ids, positions = ingredient_ids[order], positions[order]
+    unique_ids, starts = np.unique(ingredient_ids, return_index=True)
+
+    return CookableIndex(
+        snapshot=snapshot,
+        recipes=recipes,
+        sizes=sizes,
+        diet_masks=np.fromiter((r.diet_mask for r in recipes), dtype=np.int64, count=len(recipes)),
+        intolerance_masks=np.fromiter((r.intolerance_mask for r in recipes), dtype=np.int64, count=len(recipes)),
+        postings=dict(zip(unique_ids.tolist(), np.split(positions, starts[1:]))),
+    )
+
+
+class CookableEngine:
+    """Keeps the index of the current catalog snapshot, rebuilt when the snapshot changes."""
+
+    def __init__(self):
+        self._index: Optional[CookableIndex] = None
+        self._lock = asyncio.Lock()
+
+    async def get_index(self, db: AsyncSession) -> CookableIndex:
+        snapshot = await recipe_catalog.get(db)
+        index = self._index
+        if index is not None and index.snapshot is snapshot:
+            return index
+
+        async with self._lock:
+            # Another request may have built it while we waited
+            index = self._index
+            if index is None or index.snapshot is not snapshot:
+                started = time.perf_counter()
+                index = await run_in_threadpool(build_index, snapshot)
+                # Single reference assignment: readers see either the old or the new index
+                self._index = index
+                logger.info(
+                    f"Cookable index built: {len(index.recipes)} recipes, {len(index.postings)} ingredients "
+                    f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+                )
+        return index
+
+
+cookable_engine = CookableEngine()
@@ -0,0 +1,127 @@
+"""
+Integer bitmasks for recipe diet labels and intolerance warnings.
+
+Each known label owns one bit. The masks are stored on ExternalRecipe
+(diet_mask / intolerance_mask) so diet filtering is a single integer AND,
+both in SQL and in Python.
+
+IMPORTANT: bit positions are persisted. Only ever append new labels at the end
+of the lists below; never reorder or remove entries (a migration would be
+needed to rewrite existing masks).
+"""
+import logging
+from typing import Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Spoonacular diet labels (plus a few aliases used by DIET_COMPATIBILITY)
+DIET_LABELS = [
+    "gluten free",
+    "ketogenic",
+    "keto",
+    "vegetarian",
+    "lacto vegetarian",
+    "ovo vegetarian",
+    "lacto ovo vegetarian",
+    "vegan",
+    "pescatarian",
+    "paleo",
+    "paleolithic",
+    "primal",
+    "low fodmap",
+    "whole30",
+    "dairy free",
+]
+
+# Spoonacular intolerances plus the ones offered in the profile screen
+INTOLERANCE_LABELS = [
+    "dairy",
+    "egg",
+    "gluten",
+    "grain",
+    "peanut",
+    "seafood",
+    "sesame",
+    "shellfish",
+    "soy",
+    "sulfite",
+    "tree nut",
+    "wheat",
+    "nut",
+    "fish",
+]
+
+DIET_LABEL_BITS = {label: 1 << i for i, label in enumerate(DIET_LABELS)}
+INTOLERANCE_BITS = {label: 1 << i for i, label in enumerate(INTOLERANCE_LABELS)}
+
+# Diet compatibility mapping: diet_type -> acceptable recipe diet labels
+DIET_COMPATIBILITY = {
+    "vegan": ["vegan"],
+    "vegetarian": ["vegetarian", "vegan"],
+    "pescatarian": ["pescatarian", "vegetarian", "vegan"],
+    "omnivore": None,  # None means all diets are ok
+    "keto": ["ketogenic", "keto"],
+    "paleo": ["paleo", "whole30"],
+}
+
+
+# Unknown intolerance labels already logged by this process (warned once each)
+_unknown_intolerances: set = set()
+
+
+def _labels_to_mask(labels: Optional[Iterable[str]], bits: dict, unknown: Optional[list] = None) -> int:
+    mask = 0
+    for label in labels or []:
+        bit = bits.get(label.lower())
+        if bit is None:
+            if unknown is not None:
+                unknown.append(label)
+            continue
+        mask |= bit
+    return mask
+
+
+def compute_diet_mask(diets: Optional[Iterable[str]]) -> int:
+    """Mask of the recipe's diet labels. Unknown labels are ignored."""
+    return _labels_to_mask(diets, DIET_LABEL_BITS)
+
+
+def compute_intolerance_mask(intolerances: Optional[Iterable[str]]) -> int:
+    """
+    Mask of intolerance labels (recipe warnings or user intolerances).
+    An unknown label has no bit and can't be filtered on: it is logged (once per label)
+    so it can be appended to INTOLERANCE_LABELS.
+    """
+    unknown: list = []
+    mask = _labels_to_mask(intolerances, INTOLERANCE_BITS, unknown)
+    for label in unknown:
+        if label.lower() not in _unknown_intolerances:
+            _unknown_intolerances.add(label.lower())
+            logger.warning(f"Unknown intolerance label {label!r} is not filtered on (not in INTOLERANCE_LABELS)")
+    return mask
+
+
+def acceptable_diet_mask(user_diet: Optional[str]) -> Optional[int]:
+    """
+    Mask of recipe diet labels acceptable for a user diet.
+    Returns None when every recipe is acceptable (omnivore, empty or unknown diet).
+    """
+    if not user_diet:
+        return None
+    acceptable_labels = DIET_COMPATIBILITY.get(user_diet.lower())
+    if acceptable_labels is None:
+        return None
+    return _labels_to_mask(acceptable_labels, DIET_LABEL_BITS)
+
+
+def is_diet_compatible(recipe_diet_mask: int, user_diet: Optional[str]) -> bool:
+    """Recipe passes if it has at least one acceptable label (no labels -> only omnivore)."""
+    required = acceptable_diet_mask(user_diet)
+    if required is None:
+        return True
+    return bool((recipe_diet_mask or 0) & required)
+
+
+def intolerance_labels(mask: int) -> List[str]:
+    """Labels whose bits are set in an intolerance mask."""
+    return [label for label, bit in INTOLERANCE_BITS.items() if mask & bit]
@@ -0,0 +1,136 @@
+"""
+Process-wide LRU cache of ingredient names and nutrition.
+
+Routes used to eager-load Ingredient.translations for every pantry/shopping/log/recipe
+item just to pick the Spanish name. This cache maps ingredient_id to its canonical name,
+display name, per-language names, nutrition and unit-conversion overrides, and loads any
+misses in one query.
+It is cleared when a translation batch or an import commits (see app.services.catalog_events);
+entries older than INGREDIENT_CACHE_MAX_AGE_SECONDS are reloaded in case a notification was missed.
+"""
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import primary_session
+from app.models.ingredient import Ingredient, IngredientTranslation
+
+
+@dataclass(frozen=True, slots=True)
+class IngredientEntry:
+    id: int
+    canonical_name: str
+    display_name: Optional[str]
+    names: Dict[str, str]  # lang -> translated name
+    nutrition_per_100g: Optional[dict]
+    density_g_per_ml: Optional[float] = None
+    piece_weight_g: Optional[float] = None
+
+    def name(self, lang: str = settings.DEFAULT_LANG) -> str:
+        """Translated name, falling back to display_name or canonical_name."""
+        return self.names.get(lang) or self.display_name or self.canonical_name
+
+
+class IngredientCache:
+    def __init__(self, max_size: int, max_age_seconds: float):
+        self.max_size = max_size
+        self.max_age_seconds = max_age_seconds
+        # ingredient_id -> (expires at on the monotonic clock, entry)
+        self._entries: "OrderedDict[int, Tuple[float, IngredientEntry]]" = OrderedDict()
+        self._invalidations = 0
+        self.hits = 0
+        self.misses = 0
+
+    async def get_many(self, db: AsyncSession, ingredient_ids: Iterable[int]) -> Dict[int, IngredientEntry]:
+        """Entries for the given ids (unknown ids are absent). Misses are loaded in a single query."""
+        found: Dict[int, IngredientEntry] = {}
+        missing = set()
+        now = time.monotonic()
+        for ingredient_id in ingredient_ids:
+            cached = self._entries.get(ingredient_id)
+            if cached is not None and cached[0] > now:
+                self._entries.move_to_end(ingredient_id)
+                found[ingredient_id] = cached[1]
+            elif ingredient_id is not None:
+                missing.add(ingredient_id)
+
+        self.hits += len(found)
+        if missing:
+            self.misses += len(missing)
+            invalidations = self._invalidations
+            entries = await self._load(db, missing)
+            # An invalidation that arrived while loading may not be reflected in these rows:
+            # return them to this caller but don't cache them
+            keep = invalidations == self._invalidations
+            for entry in entries:
+                if keep:
+                    self._store(entry)
+                found[entry.id] = entry
+        return found
+
+    async def get(self, db: AsyncSession, ingredient_id: int) -> Optional[IngredientEntry]:
+        return (await self.get_many(db, [ingredient_id])).get(ingredient_id)
+
+    async def _load(self, db: AsyncSession, ingredient_ids: set) -> list:
+        stmt = select(
+            Ingredient.id,
+            Ingredient.canonical_name,
+            Ingredient.display_name,
+            Ingredient.nutrition_per_100g,
+            Ingredient.density_g_per_ml,
+            Ingredient.piece_weight_g,
+            IngredientTranslation.lang,
+            IngredientTranslation.name,
+        ).outerjoin(
+            IngredientTranslation, IngredientTranslation.ingredient_id == Ingredient.id
+        ).where(Ingredient.id.in_(ingredient_ids))
+
+        rows: Dict[int, dict] = {}
+        async with primary_session(db) as session:
+            result = (await session.execute(stmt)).all()
+        for ing_id, canonical, display, nutrition, density, piece_weight, lang, name in result:
+            row = rows.setdefault(ing_id, {
+                "id": ing_id,
+                "canonical_name": canonical,
+                "display_name": display,
+                "nutrition_per_100g": nutrition,
+                "density_g_per_ml": density,
+                "piece_weight_g": piece_weight,
+                "names": {},
+            })
+            if lang and name:
+                row["names"][lang] = name
+
+        return [IngredientEntry(**row) for row in rows.values()]
+
+    def _store(self, entry: IngredientEntry) -> None:
+        self._entries[entry.id] = (time.monotonic() + self.max_age_seconds, entry)
+        self._entries.move_to_end(entry.id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, kind: str = "translations") -> None:
+        """Drop every entry; names are reloaded on the next access."""
+        if kind in ("recipes", "translations"):
+            self._invalidations += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_size": self.max_size,
+            "max_age_seconds": self.max_age_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+ingredient_cache = IngredientCache(
+    max_size=settings.INGREDIENT_CACHE_SIZE,
+    max_age_seconds=settings.INGREDIENT_CACHE_MAX_AGE_SECONDS,
+)
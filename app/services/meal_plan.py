@@ -0,0 +1,136 @@
+"""
+Meal-plan generation against daily macro targets.
+
+Recipes are rows of a (recipes x [calories, protein, carbohydrates, fat]) per-serving
+matrix built from the cookable index (app.services.cookable), so diet/intolerance masks
+and pantry coverage line up with it. For each day:
+  1. a pool of recipes that individually fit a per-meal share of the targets (and use
+     pantry / expiring ingredients) is picked with argpartition;
+  2. SAMPLED_COMBOS random partial combinations of meals_per_day - 1 pool recipes are
+     completed with every pool recipe at once, as a (combos x pool x nutrients) array,
+     and the combination with the lowest target error minus pantry bonus wins.
+Recipes already planned in the week are left out of later days while the pool allows it.
+"""
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from app.services.cookable import CookableIndex
+from app.services.nutrition import NUTRIENTS, nutrition_vector
+
+POOL_SIZE = 400
+SAMPLED_COMBOS = 512
+
+# Relative squared error weight per nutrient (calories matter most)
+NUTRIENT_WEIGHTS = np.array([2.0, 1.0, 1.0, 1.0])
+# Bonus per meal for pantry coverage and for each expiring ingredient used
+PANTRY_WEIGHT = 0.05
+EXPIRING_WEIGHT = 0.03
+
+
+@dataclass(frozen=True)
+class MacroMatrix:
+    index: CookableIndex
+    macros: np.ndarray  # (recipes, nutrients) per serving
+    has_macros: np.ndarray  # recipe has calories per serving
+
+
+def build_macro_matrix(index: CookableIndex) -> MacroMatrix:
+    macros = np.zeros((len(index.recipes), len(NUTRIENTS)), dtype=np.float64)
+    for pos, recipe in enumerate(index.recipes):
+        vector = nutrition_vector(recipe.nutrition_totals_per_serving)
+        if vector is not None:
+            macros[pos] = vector
+    return MacroMatrix(index=index, macros=macros, has_macros=macros[:, 0] > 0)
+
+
+@dataclass(frozen=True, slots=True)
+class PlannedDay:
+    positions: List[int]  # recipe positions in the cookable index
+    totals: np.ndarray  # nutrients
+
+
+def _error(totals: np.ndarray, targets: np.ndarray, targeted: np.ndarray) -> np.ndarray:
+    """Weighted relative squared error over the last axis (targeted nutrients only)."""
+    relative = (totals - targets) / np.where(targeted, targets, 1.0)
+    return (relative ** 2 * np.where(targeted, NUTRIENT_WEIGHTS, 0.0)).sum(axis=-1)
+
+
+def plan_meals(
+    matrix: MacroMatrix,
+    eligible: np.ndarray,
+    targets: Sequence[Optional[float]],
+    days: int,
+    meals_per_day: int,
+    bonus: np.ndarray,
+    seed: int,
+) -> List[PlannedDay]:
+    """
+    eligible: boolean mask over recipe positions (diet / intolerances already applied)
+    targets: daily [calories, protein, carbohydrates, fat]; None entries are not scored
+    bonus: per recipe position preference (pantry / expiring), subtracted from the error
+    """
+    targeted = np.array([t is not None and t > 0 for t in targets])
+    daily = np.array([t if t else 0.0 for t in targets], dtype=np.float64)
+    per_meal = daily / meals_per_day
+
+    candidates = np.flatnonzero(eligible & matrix.has_macros)
+    if len(candidates) < meals_per_day:
+        return []
+
+    rng = np.random.default_rng(seed)
+    used = np.zeros(len(matrix.macros), dtype=bool)
+    plan = []
+
+    for _ in range(days):
+        # 1. Pool: recipes that fit a per-meal share, preferring not yet planned ones
+        available = candidates[~used[candidates]]
+        if len(available) < meals_per_day:
+            available = candidates
+        fit = _error(matrix.macros[available], per_meal, targeted) - bonus[available]
+        if len(available) > POOL_SIZE:
+            available = available[np.argpartition(fit, POOL_SIZE - 1)[:POOL_SIZE]]
+        pool_macros = matrix.macros[available]
+        pool_bonus = bonus[available]
+        pool = len(available)
+
+        # 2. Random partial combinations (meals_per_day - 1 distinct pool recipes each)
+        picks = meals_per_day - 1
+        combos = min(SAMPLED_COMBOS, max(1, pool ** picks)) if picks else 1
+        partial = np.argsort(rng.random((combos, pool)), axis=1)[:, :picks]
+        partial_macros = pool_macros[partial].sum(axis=1)  # (combos, nutrients)
+        partial_bonus = pool_bonus[partial].sum(axis=1)
+
+        # 3. Complete every partial combination with every pool recipe at once
+        totals = partial_macros[:, None, :] + pool_macros[None, :, :]  # (combos, pool, nutrients)
+        score = _error(totals, daily, targeted) - (partial_bonus[:, None] + pool_bonus[None, :])
+        if picks:
+            # A recipe can't appear twice in the same day
+            duplicate = np.zeros((combos, pool), dtype=bool)
+            np.put_along_axis(duplicate, partial, True, axis=1)
+            score[duplicate] = np.inf
+
+        best_combo, best_last = np.unravel_index(np.argmin(score), score.shape)
+        chosen = available[np.append(partial[best_combo], best_last)]
+        used[chosen] = True
+        plan.append(PlannedDay(positions=chosen.tolist(), totals=totals[best_combo, best_last]))
+
+    return plan
+
+
+class MacroMatrixCache:
+    """Keeps the macro matrix of the current cookable index (one catalog snapshot)."""
+
+    def __init__(self):
+        self._matrix: Optional[MacroMatrix] = None
+
+    def get(self, index: CookableIndex) -> MacroMatrix:
+        matrix = self._matrix
+        if matrix is None or matrix.index is not index:
+            matrix = build_macro_matrix(index)
+            self._matrix = matrix
+        return matrix
+
+
+macro_matrix_cache = MacroMatrixCache()
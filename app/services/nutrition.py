@@ -0,0 +1,141 @@
+"""
+Nutrition math: macros of single food-log entries, and vectorized nutrition for the
+whole catalog.
+
+For the catalog, ingredients become rows of an ingredient x nutrient matrix (per 100 g). Recipe ingredient
+rows become a sparse recipe x ingredient matrix of gram amounts, kept as COO arrays
+(recipe index, ingredient index, grams). Per-row nutrition is one gather-and-scale,
+recipe totals are a scatter-add per nutrient (the sparse matrix product), so the cost
+is a few NumPy passes over the catalog instead of one ORM round trip per row.
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.schemas.log import MacroTotals
+from app.services.units import to_grams_many
+
+# Stored keys, as written by the Spoonacular imports
+NUTRIENTS = ("calories", "protein", "carbohydrates", "fat")
+
+# Alternative spellings accepted when reading nutrition_per_100g
+_NUTRIENT_ALIASES = {"calories": ("calories", "kcal"), "carbohydrates": ("carbohydrates", "carbs")}
+
+
+def nutrition_vector(nutrition: Optional[dict]) -> Optional[np.ndarray]:
+    """NUTRIENTS values of a nutrition dict (missing keys count as 0); None if there is no data."""
+    if not nutrition:
+        return None
+    values = []
+    for key in NUTRIENTS:
+        value = 0.0
+        for alias in _NUTRIENT_ALIASES.get(key, (key,)):
+            if nutrition.get(alias):
+                value = float(nutrition[alias])
+                break
+        values.append(value)
+    return np.asarray(values, dtype=np.float64)
+
+
+def nutrition_dict(values: np.ndarray) -> dict:
+    return {key: round(float(v), 2) for key, v in zip(NUTRIENTS, values)}
+
+
+def calculate_recipe_macros(nutrition: dict, servings: float) -> MacroTotals:
+    """Calculate macros for a recipe based on servings."""
+    if not nutrition:
+        return MacroTotals()
+    
+    return MacroTotals(
+        calories=round((nutrition.get('calories', 0) or 0) * servings, 1),
+        protein=round((nutrition.get('protein', 0) or 0) * servings, 1),
+        carbs=round((nutrition.get('carbohydrates', 0) or nutrition.get('carbs', 0) or 0) * servings, 1),
+        fat=round((nutrition.get('fat', 0) or 0) * servings, 1)
+    )
+
+
+def macros_for_grams(nutrition_per_100g: dict, grams: float) -> MacroTotals:
+    """Macros of `grams` of an ingredient given its nutrition per 100 g."""
+    if not nutrition_per_100g:
+        return MacroTotals()
+    
+    multiplier = grams / 100.0
+    
+    return MacroTotals(
+        calories=round((nutrition_per_100g.get('calories', 0) or nutrition_per_100g.get('kcal', 0) or 0) * multiplier, 1),
+        protein=round((nutrition_per_100g.get('protein', 0) or 0) * multiplier, 1),
+        carbs=round((nutrition_per_100g.get('carbohydrates', 0) or nutrition_per_100g.get('carbs', 0) or 0) * multiplier, 1),
+        fat=round((nutrition_per_100g.get('fat', 0) or 0) * multiplier, 1)
+    )
+
+
+@dataclass
+class NutritionResult:
+    row_nutrition: np.ndarray  # (rows, nutrients); meaningful where row_ok
+    row_ok: np.ndarray  # row converted to grams and its ingredient has nutrition
+    recipe_totals: np.ndarray  # (recipes, nutrients), sum over the recipe's ok rows
+    recipe_complete: np.ndarray  # every row of the recipe is ok (and it has rows)
+
+
+def compute_nutrition(
+    ingredients: Sequence[Tuple[int, Optional[dict], Optional[float], Optional[float]]],
+    rows: Sequence[Tuple[int, int, Optional[float], Optional[str]]],
+    recipe_ids: Sequence[int],
+) -> NutritionResult:
+    """
+    ingredients: (ingredient_id, nutrition_per_100g, density_g_per_ml, piece_weight_g)
+    rows: recipe ingredient rows as (recipe_id, ingredient_id, amount, unit)
+    recipe_ids: recipes to total (row order of recipe_totals)
+    """
+    # Ingredient x nutrient matrix (per gram), plus the unit-conversion overrides
+    ingredient_index: Dict[int, int] = {}
+    per_gram = np.zeros((len(ingredients), len(NUTRIENTS)), dtype=np.float64)
+    has_nutrition = np.zeros(len(ingredients), dtype=bool)
+    overrides: List[Tuple[Optional[float], Optional[float]]] = []
+    for i, (ingredient_id, nutrition, density, piece_weight) in enumerate(ingredients):
+        ingredient_index[ingredient_id] = i
+        vector = nutrition_vector(nutrition)
+        if vector is not None:
+            per_gram[i] = vector / 100.0
+            has_nutrition[i] = True
+        overrides.append((density, piece_weight))
+
+    # Sparse recipe x ingredient gram matrix as COO arrays
+    recipe_index = {recipe_id: i for i, recipe_id in enumerate(recipe_ids)}
+    row_recipe = np.fromiter((recipe_index.get(r[0], -1) for r in rows), dtype=np.int64, count=len(rows))
+    row_ingredient = np.fromiter((ingredient_index.get(r[1], -1) for r in rows), dtype=np.int64, count=len(rows))
+
+    grams = to_grams_many(
+        (amount, unit, *(overrides[ingredient_index[ing_id]] if ing_id in ingredient_index else (None, None)))
+        for _, ing_id, amount, unit in rows
+    )
+    row_grams = np.fromiter((np.nan if g is None else g for g in grams), dtype=np.float64, count=len(rows))
+
+    known_ingredient = row_ingredient >= 0
+    row_ok = known_ingredient & ~np.isnan(row_grams)
+    row_ok[known_ingredient] &= has_nutrition[row_ingredient[known_ingredient]]
+
+    # Per-row nutrition: gather the ingredient row and scale by grams
+    row_nutrition = np.zeros((len(rows), len(NUTRIENTS)), dtype=np.float64)
+    row_nutrition[row_ok] = per_gram[row_ingredient[row_ok]] * row_grams[row_ok, None]
+
+    # Recipe totals: scatter-add of the ok rows per recipe (= sparse matrix product)
+    in_scope = row_ok & (row_recipe >= 0)
+    recipe_totals = np.column_stack([
+        np.bincount(row_recipe[in_scope], weights=row_nutrition[in_scope, k], minlength=len(recipe_ids))
+        for k in range(len(NUTRIENTS))
+    ]) if len(recipe_ids) else np.zeros((0, len(NUTRIENTS)))
+
+    # A recipe is complete when it has rows and none of them failed
+    counted = row_recipe >= 0
+    row_counts = np.bincount(row_recipe[counted], minlength=len(recipe_ids))
+    failed_counts = np.bincount(row_recipe[counted & ~row_ok], minlength=len(recipe_ids))
+    recipe_complete = (row_counts > 0) & (failed_counts == 0)
+
+    return NutritionResult(
+        row_nutrition=row_nutrition,
+        row_ok=row_ok,
+        recipe_totals=recipe_totals,
+        recipe_complete=recipe_complete,
+    )
@@ -0,0 +1,244 @@
+"""
+In-process, read-mostly snapshot of the recipe catalog.
+
+The catalog only changes when imports run, so each worker keeps an immutable snapshot
+of compact per-recipe records and serves list/detail headers from memory. A new snapshot
+is built and swapped in atomically after an import commits (or when another process
+announces a change through app.services.catalog_events).
+"""
+import asyncio
+import logging
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import primary_session
+from app.models.recipe import ExternalRecipe, RecipeTranslation, RecipeIngredient
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogRecipe:
+    id: int
+    title_original: str
+    titles: Dict[str, str]  # lang -> translated title
+    image_url: Optional[str]
+    servings: Optional[int]
+    nutrition_totals_per_serving: Optional[dict]
+    diets: Tuple[str, ...]
+    diet_mask: int
+    intolerance_mask: int
+    ingredient_count: int
+    ingredient_ids: Tuple[int, ...]
+
+    def title(self, lang: str = settings.DEFAULT_LANG) -> str:
+        return self.titles.get(lang, self.title_original)
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    recipes: Tuple[CatalogRecipe, ...]  # Sorted by id
+    by_id: Dict[int, CatalogRecipe]
+    loaded_at: float
+    memory_bytes: int
+    # Memoized filter results keyed by (required_diet_mask, excluded_intolerance_mask)
+    _filtered: Dict[tuple, Tuple[Tuple[int, ...], Tuple[CatalogRecipe, ...]]] = field(default_factory=dict, repr=False)
+
+    def get(self, recipe_id: int) -> Optional[CatalogRecipe]:
+        return self.by_id.get(recipe_id)
+
+    def filtered(
+        self, required_diet_mask: Optional[int], excluded_intolerance_mask: int
+    ) -> Tuple[Tuple[int, ...], Tuple[CatalogRecipe, ...]]:
+        """
+        Recipes with ingredients that pass the diet/intolerance masks, sorted by id.
+        Returns (ids, recipes); ids is kept for bisecting cursors.
+        """
+        key = (required_diet_mask, excluded_intolerance_mask)
+        cached = self._filtered.get(key)
+        if cached is not None:
+            return cached
+
+        matches = tuple(
+            r for r in self.recipes
+            if r.ingredient_count
+            and (required_diet_mask is None or r.diet_mask & required_diet_mask)
+            and not (r.intolerance_mask & excluded_intolerance_mask)
+        )
+        cached = (tuple(r.id for r in matches), matches)
+        self._filtered[key] = cached
+        return cached
+
+
+def _deep_sizeof(obj, seen: set) -> int:
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_sizeof(k, seen) + _deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_sizeof(i, seen) for i in obj)
+    elif hasattr(obj, "__slots__"):
+        size += sum(_deep_sizeof(getattr(obj, s), seen) for s in obj.__slots__)
+    return size
+
+
+def select_recipe_cards():
+    """
+    Card-only projection of ExternalRecipe: just the columns a recipe card shows, plus
+    the filter masks and the denormalized ingredient_count. Skips the large raw_json /
+    instructions_raw blobs and never touches recipe_ingredients.
+    """
+    return select(
+        ExternalRecipe.id,
+        ExternalRecipe.title_original,
+        ExternalRecipe.image_url,
+        ExternalRecipe.servings,
+        ExternalRecipe.nutrition_totals_per_serving,
+        ExternalRecipe.diets,
+        ExternalRecipe.diet_mask,
+        ExternalRecipe.intolerance_mask,
+        ExternalRecipe.ingredient_count,
+    )
+
+
+async def load_snapshot(db: AsyncSession) -> CatalogSnapshot:
+    """Build a snapshot with three column-only queries (no raw_json / instructions)."""
+    recipe_rows = (await db.execute(
+        select_recipe_cards().order_by(ExternalRecipe.id)
+    )).all()
+
+    titles: Dict[int, Dict[str, str]] = {}
+    for recipe_id, lang, title in (await db.execute(
+        select(RecipeTranslation.recipe_id, RecipeTranslation.lang, RecipeTranslation.title)
+    )).all():
+        titles.setdefault(recipe_id, {})[lang] = title
+
+    ingredient_ids: Dict[int, list] = {}
+    for recipe_id, ingredient_id in (await db.execute(
+        select(RecipeIngredient.recipe_id, RecipeIngredient.ingredient_id).order_by(RecipeIngredient.id)
+    )).all():
+        ingredient_ids.setdefault(recipe_id, []).append(ingredient_id)
+
+    recipes = tuple(
+        CatalogRecipe(
+            id=row.id,
+            title_original=row.title_original,
+            titles=titles.get(row.id, {}),
+            image_url=row.image_url,
+            servings=row.servings,
+            nutrition_totals_per_serving=row.nutrition_totals_per_serving,
+            diets=tuple(row.diets or ()),
+            diet_mask=row.diet_mask or 0,
+            intolerance_mask=row.intolerance_mask or 0,
+            ingredient_count=row.ingredient_count or 0,
+            ingredient_ids=tuple(ingredient_ids.get(row.id, ())),
+        )
+        for row in recipe_rows
+    )
+    by_id = {r.id: r for r in recipes}
+
+    return CatalogSnapshot(
+        recipes=recipes,
+        by_id=by_id,
+        loaded_at=time.monotonic(),
+        memory_bytes=_deep_sizeof(recipes, set()) + sys.getsizeof(by_id),
+    )
+
+
+class RecipeCatalog:
+    """Holds the current snapshot for this worker, plus hit/miss counters."""
+
+    def __init__(self, max_age_seconds: float):
+        self.max_age_seconds = max_age_seconds
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._stale = True
+        self._invalidations = 0
+        self._lock = asyncio.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._snapshot is not None
+            and not self._stale
+            and time.monotonic() - self._snapshot.loaded_at < self.max_age_seconds
+        )
+
+    async def get(self, db: AsyncSession) -> CatalogSnapshot:
+        """Return the current snapshot, loading it first if missing or stale."""
+        if self._is_fresh():
+            self.hits += 1
+            return self._snapshot
+
+        self.misses += 1
+        async with self._lock:
+            # Another request may have reloaded while we waited
+            if not self._is_fresh():
+                await self._reload(db)
+            return self._snapshot
+
+    async def lookup(self, db: AsyncSession, recipe_id: int) -> Optional[CatalogRecipe]:
+        """
+        Look a recipe up in the snapshot. If it is missing but exists in the DB
+        (imported by another process, notification not seen yet), reload the snapshot once.
+        """
+        recipe = (await self.get(db)).get(recipe_id)
+        if recipe is None:
+            exists_in_db = (await db.execute(
+                select(ExternalRecipe.id).where(ExternalRecipe.id == recipe_id)
+            )).scalar_one_or_none()
+            if exists_in_db:
+                await self.refresh(db)
+                recipe = self._snapshot.get(recipe_id)
+        return recipe
+
+    async def refresh(self, db: AsyncSession) -> None:
+        """Rebuild and swap the snapshot now (called after an import commits)."""
+        async with self._lock:
+            await self._reload(db)
+
+    async def _reload(self, db: AsyncSession) -> None:
+        started = time.perf_counter()
+        invalidations = self._invalidations
+        async with primary_session(db) as session:
+            snapshot = await load_snapshot(session)
+        # Single reference assignment: readers see either the old or the new snapshot
+        self._snapshot = snapshot
+        # An invalidation that arrived while loading may not be reflected in this snapshot
+        self._stale = invalidations != self._invalidations
+        self.loads += 1
+        logger.info(
+            f"Recipe catalog loaded: {len(snapshot.recipes)} recipes, "
+            f"{snapshot.memory_bytes / 1024:.0f} KiB in {(time.perf_counter() - started) * 1000:.0f} ms"
+        )
+
+    def invalidate(self, kind: str = "recipes") -> None:
+        """Mark the snapshot stale; the next reader reloads it."""
+        if kind in ("recipes", "translations"):
+            self._invalidations += 1
+            self._stale = True
+
+    def stats(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            "loaded": snapshot is not None,
+            "stale": self._stale,
+            "recipes": len(snapshot.recipes) if snapshot else 0,
+            "memory_bytes": snapshot.memory_bytes if snapshot else 0,
+            "age_seconds": round(time.monotonic() - snapshot.loaded_at, 1) if snapshot else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "loads": self.loads,
+        }
+
+
+recipe_catalog = RecipeCatalog(max_age_seconds=settings.RECIPE_CATALOG_MAX_AGE_SECONDS)
@@ -0,0 +1,53 @@
+"""
+Full-text search over recipes.
+
+external_recipes.search_vector is a stored tsvector built with the 'spanish' config from:
+  A: Spanish title + title_original
+  B: ingredient names (Spanish translation + display/canonical name)
+  C: Spanish instructions
+Documents and queries use the same config, so stemming always matches. The vector is
+refreshed by the import paths and by the translation batch, not by triggers.
+"""
+from typing import Iterable
+
+from sqlalchemy import func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+SEARCH_CONFIG = "spanish"
+
+_SEARCH_VECTOR_SQL = """
+    UPDATE external_recipes er SET search_vector =
+        setweight(to_tsvector('spanish',
+            coalesce((SELECT rt.title FROM recipe_translations rt
+                      WHERE rt.recipe_id = er.id AND rt.lang = 'es'), '')
+            || ' ' || er.title_original), 'A')
+        || setweight(to_tsvector('spanish', coalesce((
+            SELECT string_agg(coalesce(it.name, '') || ' ' || coalesce(i.display_name, i.canonical_name), ' ')
+            FROM recipe_ingredients ri
+            JOIN ingredients i ON i.id = ri.ingredient_id
+            LEFT JOIN ingredient_translations it ON it.ingredient_id = i.id AND it.lang = 'es'
+            WHERE ri.recipe_id = er.id), '')), 'B')
+        || setweight(to_tsvector('spanish',
+            coalesce((SELECT rt.instructions FROM recipe_translations rt
+                      WHERE rt.recipe_id = er.id AND rt.lang = 'es'), '')), 'C')
+"""
+
+
+async def refresh_search_vectors(db: AsyncSession, recipe_ids: Iterable[int]) -> None:
+    """Rebuild search_vector for the given recipes (call before committing an import/translation)."""
+    ids = list(recipe_ids)
+    if ids:
+        await db.execute(text(_SEARCH_VECTOR_SQL + " WHERE er.id = ANY(:ids)"), {"ids": ids})
+
+
+async def refresh_search_vectors_for_ingredient(db: AsyncSession, ingredient_id: int) -> None:
+    """Rebuild search_vector for every recipe using an ingredient (its name changed)."""
+    await db.execute(text(
+        _SEARCH_VECTOR_SQL
+        + " WHERE er.id IN (SELECT recipe_id FROM recipe_ingredients WHERE ingredient_id = :ingredient_id)"
+    ), {"ingredient_id": ingredient_id})
+
+
+def search_query(q: str):
+    """tsquery for user input: quoted phrases, OR and -negation (websearch syntax)."""
+    return func.websearch_to_tsquery(SEARCH_CONFIG, q)
@@ -0,0 +1,224 @@
+"""
+"More like this": MinHash signatures of recipe ingredient sets with an LSH index.
+
+Each recipe's ingredient ids get a MinHash signature of NUM_PERM values; the estimated
+Jaccard similarity of two recipes is the share of equal signature values. Signatures are
+cut into BANDS bands of ROWS values; recipes sharing any band key are candidates, so a
+query only compares against a few buckets instead of the whole catalog.
+
+The index follows the catalog snapshot (app.services.recipe_catalog). When a new snapshot
+appears, only recipes that were added or whose ingredients changed are hashed, into a
+small delta block; the main block is rebuilt once the delta or the removed rows grow
+past REBUILD_FRACTION of the catalog.
+"""
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.recipe_catalog import CatalogRecipe, CatalogSnapshot, recipe_catalog
+
+logger = logging.getLogger(__name__)
+
+BANDS = 32
+ROWS = 3
+NUM_PERM = BANDS * ROWS
+
+# Rebuild the main block when delta/removed rows exceed this share of it
+REBUILD_FRACTION = 0.05
+
+_PRIME = (1 << 31) - 1  # Mersenne prime for the universal hash family
+_rng = np.random.default_rng(20240611)  # Fixed seed: signatures are stable across processes
+_HASH_A = _rng.integers(1, _PRIME, size=NUM_PERM, dtype=np.int64)
+_HASH_B = _rng.integers(0, _PRIME, size=NUM_PERM, dtype=np.int64)
+_BAND_WEIGHTS = np.array([0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9][:ROWS], dtype=np.uint64)
+
+
+def minhash_signatures(ingredient_sets: Sequence[Sequence[int]]) -> np.ndarray:
+    """(len(sets), NUM_PERM) uint32 signatures. Every set must be non-empty."""
+    lengths = np.fromiter((len(s) for s in ingredient_sets), dtype=np.int64, count=len(ingredient_sets))
+    if not len(lengths):
+        return np.zeros((0, NUM_PERM), dtype=np.uint32)
+    flat = np.fromiter((i for s in ingredient_sets for i in s), dtype=np.int64, count=int(lengths.sum()))
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+    signatures = np.empty((len(lengths), NUM_PERM), dtype=np.uint32)
+    for p in range(NUM_PERM):
+        hashed = (_HASH_A[p] * flat + _HASH_B[p]) % _PRIME
+        signatures[:, p] = np.minimum.reduceat(hashed, offsets)
+    return signatures
+
+
+def band_keys(signatures: np.ndarray) -> np.ndarray:
+    """(n, BANDS) uint64 bucket keys, one per band of ROWS signature values."""
+    bands = signatures.reshape(len(signatures), BANDS, ROWS).astype(np.uint64)
+    with np.errstate(over="ignore"):
+        return (bands * _BAND_WEIGHTS).sum(axis=2, dtype=np.uint64)
+
+
+@dataclass
+class _Block:
+    ids: np.ndarray  # recipe ids
+    signatures: np.ndarray  # (n, NUM_PERM)
+    keys: np.ndarray  # (n, BANDS)
+    alive: np.ndarray  # False once the recipe was removed or re-hashed into the delta
+    # Main block only: per band, keys sorted for binary search and the matching positions
+    sorted_keys: Optional[np.ndarray] = None
+    order: Optional[np.ndarray] = None
+
+    @classmethod
+    def build(cls, recipes: Sequence[CatalogRecipe], sorted_index: bool) -> "_Block":
+        signatures = minhash_signatures([r.ingredient_ids for r in recipes])
+        keys = band_keys(signatures)
+        block = cls(
+            ids=np.fromiter((r.id for r in recipes), dtype=np.int64, count=len(recipes)),
+            signatures=signatures,
+            keys=keys,
+            alive=np.ones(len(recipes), dtype=bool),
+        )
+        if sorted_index:
+            block.order = np.argsort(keys, axis=0, kind="stable").T  # (BANDS, n)
+            block.sorted_keys = np.take_along_axis(keys, block.order.T, axis=0).T
+        return block
+
+    def candidates(self, query_keys: np.ndarray) -> np.ndarray:
+        """Positions sharing at least one band key with the query."""
+        if self.sorted_keys is None:
+            return np.flatnonzero((self.keys == query_keys).any(axis=1) & self.alive)
+        found = []
+        for band in range(BANDS):
+            column = self.sorted_keys[band]
+            lo = np.searchsorted(column, query_keys[band], side="left")
+            hi = np.searchsorted(column, query_keys[band], side="right")
+            if hi > lo:
+                found.append(self.order[band][lo:hi])
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        positions = np.unique(np.concatenate(found))
+        return positions[self.alive[positions]]
+
+
+@dataclass(frozen=True, slots=True)
+class SimilarRecipe:
+    recipe: CatalogRecipe
+    similarity: float  # Estimated Jaccard similarity of the ingredient sets
+
+
+class SimilarityIndex:
+    def __init__(self):
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._main: Optional[_Block] = None
+        self._delta: Optional[_Block] = None
+        self._where: Dict[int, Tuple[_Block, int]] = {}  # recipe id -> (block, position)
+        self._indexed: Dict[int, Tuple[int, ...]] = {}  # recipe id -> ingredient ids it was hashed with
+        self._removed = 0
+        self.rebuilds = 0
+        self.incremental_updates = 0
+
+    async def similar(self, db: AsyncSession, recipe_id: int, limit: int) -> Optional[List[SimilarRecipe]]:
+        """Top recipes by estimated Jaccard similarity; None if the recipe is unknown."""
+        snapshot = await recipe_catalog.get(db)
+        self._sync(snapshot)
+
+        located = self._where.get(recipe_id)
+        if located is None:
+            return None
+        block, position = located
+        query_signature = block.signatures[position]
+        query_keys = block.keys[position]
+
+        ids, scores = [], []
+        for candidate_block in (self._main, self._delta):
+            if candidate_block is None:
+                continue
+            positions = candidate_block.candidates(query_keys)
+            if not len(positions):
+                continue
+            ids.append(candidate_block.ids[positions])
+            scores.append((candidate_block.signatures[positions] == query_signature).mean(axis=1))
+        if not ids:
+            return []
+
+        ids = np.concatenate(ids)
+        scores = np.concatenate(scores)
+        keep = ids != recipe_id
+        ids, scores = ids[keep], scores[keep]
+
+        if len(ids) > limit:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            ids, scores = ids[top], scores[top]
+        order = np.lexsort((ids, -scores))
+
+        return [
+            SimilarRecipe(recipe=snapshot.get(int(i)), similarity=round(float(s), 3))
+            for i, s in zip(ids[order].tolist(), scores[order].tolist())
+            if snapshot.get(int(i)) is not None
+        ]
+
+    def _sync(self, snapshot: CatalogSnapshot) -> None:
+        """Bring the index up to date with the snapshot (no awaits: never seen half-updated)."""
+        if snapshot is self._snapshot:
+            return
+        started = time.perf_counter()
+        indexable = [r for r in snapshot.recipes if r.ingredient_ids]
+
+        if self._main is None:
+            self._rebuild(indexable)
+        else:
+            current = {r.id: r for r in indexable}
+            changed = [r for r in indexable if self._indexed.get(r.id) != r.ingredient_ids]
+            gone = [i for i in self._indexed if i not in current]
+
+            for recipe_id in gone + [r.id for r in changed if r.id in self._indexed]:
+                block, position = self._where.pop(recipe_id)
+                block.alive[position] = False
+                self._indexed.pop(recipe_id, None)
+                self._removed += 1
+
+            if changed:
+                pending = [current[i] for i in self._delta.ids[self._delta.alive].tolist()] if self._delta else []
+                self._set_delta(pending + changed)
+
+            delta_size = len(self._delta.ids) if self._delta else 0
+            if delta_size + self._removed > REBUILD_FRACTION * max(len(self._main.ids), 1):
+                self._rebuild(indexable)
+            elif changed or gone:
+                self.incremental_updates += 1
+
+        self._snapshot = snapshot
+        logger.info(
+            f"Similarity index synced: {len(self._indexed)} recipes "
+            f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+        )
+
+    def _rebuild(self, recipes: List[CatalogRecipe]) -> None:
+        self._main = _Block.build(recipes, sorted_index=True)
+        self._delta = None
+        self._removed = 0
+        self._where = {r.id: (self._main, pos) for pos, r in enumerate(recipes)}
+        self._indexed = {r.id: r.ingredient_ids for r in recipes}
+        self.rebuilds += 1
+
+    def _set_delta(self, recipes: List[CatalogRecipe]) -> None:
+        if self._delta is not None:
+            self._removed -= int((~self._delta.alive).sum())
+        self._delta = _Block.build(recipes, sorted_index=False)
+        for pos, r in enumerate(recipes):
+            self._where[r.id] = (self._delta, pos)
+            self._indexed[r.id] = r.ingredient_ids
+
+    def stats(self) -> dict:
+        return {
+            "recipes": len(self._indexed),
+            "main_block": len(self._main.ids) if self._main is not None else 0,
+            "delta_block": len(self._delta.ids) if self._delta is not None else 0,
+            "removed": self._removed,
+            "rebuilds": self.rebuilds,
+            "incremental_updates": self.incremental_updates,
+        }
+
+
+similarity_index = SimilarityIndex()
@@ -1,6 +1,8 @@
 import httpx
 from app.core.config import settings
+from app.core import metrics
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +20,8 @@ async def translate_text(text: str, target_lang: str = "es", source_lang: str =
         logger.warning("DeepL API key not configured, returning original text")
         return text
     
+    started = time.perf_counter()
+    outcome = "error"
     try:
         async with httpx.AsyncClient(timeout=30.0) as client:
             response = await client.post(
@@ -32,15 +36,21 @@ async def translate_text(text: str, target_lang: str = "es", source_lang: str =
             )
             response.raise_for_status()
             result = response.json()
+            outcome = "ok"
+            metrics.DEEPL_CHARACTERS.inc(len(text))
             
             translated = result["translations"][0]["text"]
             logger.info(f"Translated: '{text[:50]}...' -> '{translated[:50]}...'")
             return translated
             
     except httpx.HTTPStatusError as e:
+        outcome = "http_error"
         logger.error(f"DeepL API error: {e.response.status_code} - {e.response.text}")
         return text  # Fallback to original
     except Exception as e:
         logger.error(f"Translation error: {str(e)}")
         return text  # Fallback to original
+    finally:
+        metrics.EXTERNAL_LATENCY.labels("deepl", "translate").observe(time.perf_counter() - started)
+        metrics.EXTERNAL_REQUESTS.labels("deepl", "translate", outcome).inc()
 
@@ -0,0 +1,134 @@
+"""
+Unit conversion for pantry availability, shopping and nutrition.
+
+Every known spelling of a unit (English, Spanish, plural, abbreviated) is mapped once,
+at import time, to a canonical unit with a dimension and a factor to the base unit of
+that dimension (g, ml or piece). Converting across dimensions goes through grams and
+needs the ingredient's density (g/ml) or piece weight (g): without it the amounts are
+not convertible (a cup of flour is not 236 g).
+
+Conversions are batched: callers pass many (amount, unit, ...) tuples in one call and
+get a list back, with None for anything that cannot be converted.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+MASS = "mass"
+VOLUME = "volume"
+COUNT = "count"
+
+# canonical unit -> (dimension, factor to the dimension's base unit: g / ml / piece)
+UNITS: Dict[str, Tuple[str, float]] = {
+    "g": (MASS, 1.0),
+    "kg": (MASS, 1000.0),
+    "oz": (MASS, 28.349523125),
+    "lb": (MASS, 453.59237),
+    "ml": (VOLUME, 1.0),
+    "l": (VOLUME, 1000.0),
+    "cup": (VOLUME, 236.5882365),
+    "tbsp": (VOLUME, 14.78676478125),
+    "tsp": (VOLUME, 4.92892159375),
+    "piece": (COUNT, 1.0),
+}
+
+_ALIASES = {
+    "g": ["g", "gr", "grs", "gram", "grams", "gramo", "gramos"],
+    "kg": ["kg", "kgs", "kilo", "kilos", "kilogram", "kilograms", "kilogramo", "kilogramos"],
+    "oz": ["oz", "ounce", "ounces", "onza", "onzas"],
+    "lb": ["lb", "lbs", "pound", "pounds", "libra", "libras"],
+    "ml": ["ml", "milliliter", "milliliters", "millilitre", "millilitres", "mililitro", "mililitros", "cc"],
+    "l": ["l", "lt", "liter", "liters", "litre", "litres", "litro", "litros"],
+    "cup": ["cup", "cups", "c", "taza", "tazas"],
+    "tbsp": ["tbsp", "tbsps", "tbs", "tablespoon", "tablespoons", "T", "cucharada", "cucharadas"],
+    "tsp": ["tsp", "tsps", "teaspoon", "teaspoons", "t", "cucharadita", "cucharaditas"],
+    "piece": [
+        "", "piece", "pieces", "pc", "pcs", "unit", "units", "ud", "uds", "unidad", "unidades",
+        "pieza", "piezas", "whole", "large", "medium", "small", "serving", "servings",
+    ],
+}
+
+# Precompiled alias table: spelling -> canonical unit.
+# "T"/"t" (tablespoon/teaspoon) are the only case-sensitive spellings.
+UNIT_ALIASES: Dict[str, str] = {}
+for _canonical, _spellings in _ALIASES.items():
+    for _spelling in _spellings:
+        UNIT_ALIASES[_spelling if _spelling in ("T", "t") else _spelling.lower()] = _canonical
+
+
+def normalize_unit(unit: Optional[str]) -> Optional[str]:
+    """Canonical unit for a spelling, or None if unknown."""
+    unit = (unit or "").strip().rstrip(".")
+    canonical = UNIT_ALIASES.get(unit)
+    if canonical is None:
+        canonical = UNIT_ALIASES.get(unit.lower())
+    return canonical
+
+
+def unit_key(unit: Optional[str]) -> str:
+    """Key for grouping quantities: the canonical unit if known, else the raw spelling."""
+    return normalize_unit(unit) or (unit or "")
+
+
+def _grams_per(canonical: str, density_g_per_ml: Optional[float], piece_weight_g: Optional[float]) -> Optional[float]:
+    dimension, factor = UNITS[canonical]
+    if dimension == MASS:
+        return factor
+    if dimension == VOLUME:
+        return factor * density_g_per_ml if density_g_per_ml else None
+    return factor * piece_weight_g if piece_weight_g else None
+
+
+def conversion_factor(
+    from_unit: Optional[str],
+    to_unit: Optional[str],
+    density_g_per_ml: Optional[float] = None,
+    piece_weight_g: Optional[float] = None,
+) -> Optional[float]:
+    """Multiplier taking an amount in from_unit to to_unit, or None if not convertible."""
+    source, target = normalize_unit(from_unit), normalize_unit(to_unit)
+    if source is None or target is None:
+        # Unknown spellings still match themselves
+        return 1.0 if (from_unit or "").strip().lower() == (to_unit or "").strip().lower() else None
+
+    (source_dim, source_factor), (target_dim, target_factor) = UNITS[source], UNITS[target]
+    if source_dim == target_dim:
+        return source_factor / target_factor
+
+    source_grams = _grams_per(source, density_g_per_ml, piece_weight_g)
+    target_grams = _grams_per(target, density_g_per_ml, piece_weight_g)
+    if not source_grams or not target_grams:
+        return None
+    return source_grams / target_grams
+
+
+def convert_many(
+    items: Iterable[Tuple[Optional[float], Optional[str], Optional[str], Optional[float], Optional[float]]]
+) -> List[Optional[float]]:
+    """
+    Convert (amount, from_unit, to_unit, density_g_per_ml, piece_weight_g) tuples.
+    Returns the converted amounts in order; None where the units are not convertible.
+    """
+    factors: Dict[tuple, Optional[float]] = {}
+    converted = []
+    for amount, from_unit, to_unit, density, piece_weight in items:
+        key = (from_unit, to_unit, density, piece_weight)
+        if key not in factors:
+            factors[key] = conversion_factor(from_unit, to_unit, density, piece_weight)
+        factor = factors[key]
+        converted.append(None if factor is None or amount is None else amount * factor)
+    return converted
+
+
+def to_grams_many(
+    items: Iterable[Tuple[Optional[float], Optional[str], Optional[float], Optional[float]]]
+) -> List[Optional[float]]:
+    """Convert (amount, unit, density_g_per_ml, piece_weight_g) tuples to grams."""
+    return convert_many((amount, unit, "g", density, piece_weight) for amount, unit, density, piece_weight in items)
+
+
+def merge_quantities(quantities: Dict[str, float]) -> Dict[str, float]:
+    """Merge {unit: quantity} entries whose units are spellings of the same unit."""
+    merged: Dict[str, float] = {}
+    for unit, quantity in quantities.items():
+        key = unit_key(unit)
+        merged[key] = merged.get(key, 0) + (quantity or 0)
+    return merged
@@ -0,0 +1,93 @@
+"""
+Process-wide TTL cache of authenticated users.
+
+The bearer token already identifies the user, so routes only need the profile fields
+(diet_type, intolerances) and pantry_version, which change rarely. They are kept here
+as frozen CurrentUser values for USER_CACHE_TTL_SECONDS; a miss is loaded with its own
+short-lived session, so a cached request checks out no connection for authentication.
+Entries are dropped when the profile or pantry changes, in every worker
+(see app.services.catalog_events.notify_user_changed).
+"""
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.user_pantry_log import User
+
+
+@dataclass(frozen=True, slots=True)
+class CurrentUser:
+    id: int
+    email: str
+    name: Optional[str]
+    diet_type: Optional[str]
+    intolerances: Tuple[str, ...]
+    pantry_version: int
+
+    @classmethod
+    def from_model(cls, user: User) -> "CurrentUser":
+        return cls(
+            id=user.id,
+            email=user.email,
+            name=user.name,
+            diet_type=user.diet_type,
+            intolerances=tuple(user.intolerances or ()),
+            pantry_version=user.pantry_version or 0,
+        )
+
+
+class UserCache:
+    def __init__(self, ttl_seconds: float, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: "OrderedDict[int, Tuple[float, CurrentUser]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, user_id: int) -> Optional[CurrentUser]:
+        """The user, from the cache or loaded in one query; None if it does not exist."""
+        cached = self._entries.get(user_id)
+        if cached is not None and cached[0] > time.monotonic():
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return cached[1]
+
+        self.misses += 1
+        async with AsyncSessionLocal() as session:
+            user = (await session.execute(select(User).where(User.id == user_id))).scalar_one_or_none()
+        if user is None:
+            self._entries.pop(user_id, None)
+            return None
+        return self.store(user)
+
+    def store(self, user: User) -> CurrentUser:
+        current = CurrentUser.from_model(user)
+        self._entries[current.id] = (time.monotonic() + self.ttl_seconds, current)
+        self._entries.move_to_end(current.id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return current
+
+    def invalidate(self, user_id: int) -> None:
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        """Drop every entry (user events may have been missed)."""
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+user_cache = UserCache(ttl_seconds=settings.USER_CACHE_TTL_SECONDS, max_size=settings.USER_CACHE_SIZE)
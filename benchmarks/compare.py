@@ -0,0 +1,76 @@
+"""
+Compare two benchmark result files (python -m benchmarks.run) route by route.
+
+Usage:
+    python -m benchmarks.compare BASELINE.json CANDIDATE.json [--threshold 10] [--fail-on-regression]
+
+A route regresses when its p95 latency grows by more than --threshold percent or it
+runs more queries per request.
+"""
+import argparse
+import json
+import sys
+from typing import Optional
+
+
+def _change(before: Optional[float], after: Optional[float]) -> Optional[float]:
+    if before is None or after is None or before == 0:
+        return None
+    return (after - before) / before * 100
+
+
+def _fmt(value: Optional[float], unit: str = "") -> str:
+    return "-" if value is None else f"{value:.1f}{unit}"
+
+
+def compare(baseline: dict, candidate: dict, threshold: float) -> int:
+    """Print the per-route comparison; returns the number of regressions."""
+    base_meta, cand_meta = baseline["meta"], candidate["meta"]
+    print(f"baseline  {base_meta.get('commit')} {base_meta['timestamp']} ({base_meta['concurrency']} clients)")
+    print(f"candidate {cand_meta.get('commit')} {cand_meta['timestamp']} ({cand_meta['concurrency']} clients)")
+    if base_meta.get("table_counts") != cand_meta.get("table_counts"):
+        print("warning: the runs used different data sets (table_counts differ)")
+    print()
+
+    regressions = 0
+    for name, after in candidate["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if before is None:
+            print(f"{name:<58} new route")
+            continue
+        p95_change = _change(before["latency_ms"]["p95"], after["latency_ms"]["p95"])
+        more_queries = (
+            before["queries_per_request"] is not None and after["queries_per_request"] is not None
+            and after["queries_per_request"] > before["queries_per_request"]
+        )
+        regressed = (p95_change is not None and p95_change > threshold) or more_queries
+        regressions += regressed
+        print(
+            f"{'!' if regressed else ' '} {name:<56}"
+            f" p50 {_fmt(before['latency_ms']['p50'])} -> {_fmt(after['latency_ms']['p50'])}"
+            f"  p95 {_fmt(before['latency_ms']['p95'])} -> {_fmt(after['latency_ms']['p95'])} ({_fmt(p95_change, '%')})"
+            f"  p99 {_fmt(before['latency_ms']['p99'])} -> {_fmt(after['latency_ms']['p99'])}"
+            f"  req/s {_fmt(before['throughput_rps'])} -> {_fmt(after['throughput_rps'])}"
+            f"  q/req {_fmt(before['queries_per_request'])} -> {_fmt(after['queries_per_request'])}"
+        )
+    for name in baseline["scenarios"].keys() - candidate["scenarios"].keys():
+        print(f"  {name:<56} not in candidate")
+
+    print(f"\n{regressions} regressions (p95 > +{threshold:g}% or more queries per request)")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Allowed p95 increase, in percent")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with 1 if a route regressed")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+    regressions = compare(baseline, candidate, args.threshold)
+    sys.exit(1 if regressions and args.fail_on_regression else 0)
@@ -0,0 +1,332 @@
+"""
+Load-test every API route and report latency percentiles, throughput and queries per request.
+
+Needs a running server on a generated database (python -m app.scripts.generate_scale_data)
+sharing this environment's DATABASE_URL and SECRET_KEY: benchmark users and sample
+recipes are read from the database and bearer tokens are minted locally. Queries per request come from
+the Server-Timing header (SQL_INSTRUMENTATION=true on the server).
+
+Each route is driven in turn by --concurrency clients, each with its own benchmark
+user. Rows written by the run (pantry, shopping list, food log, registered users) are
+deleted afterwards unless --keep-writes is given.
+
+Usage:
+    python -m app.scripts.generate_scale_data --reset --recipes 20000 --users 1000
+    python -m uvicorn app.main:app --workers 4
+    python -m benchmarks.run [--concurrency 16] [--requests 500 | --duration 10] [--only /recipes]
+
+Results are written to benchmarks/results/<timestamp>_<commit>.json; compare two runs
+with python -m benchmarks.compare.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+# Add project root to sys.path
+sys.path.append(os.getcwd())
+
+import httpx
+import numpy as np
+from sqlalchemy import delete, func, select, update
+
+from app.core.security import create_access_token
+from app.db.session import AsyncSessionLocal
+from app.models.ingredient import Ingredient, IngredientTranslation
+from app.models.recipe import ExternalRecipe, RecipeIngredient
+from app.models.user_pantry_log import PantryItem, ShoppingListItem, User, UserFoodLog
+from app.scripts.generate_scale_data import USER_EMAIL
+from app.services.catalog_events import notify_user_changed
+from benchmarks.scenarios import BenchContext, BenchUser, Scenario, SKIPPED, missing_routes, select_scenarios
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# Recipes sampled for the recipe scenarios
+RECIPE_SAMPLE = 2000
+
+_SERVER_TIMING_DB = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries"')
+
+# Tables whose rows the run may add, with the owner column (None: the table is users)
+_WRITTEN_TABLES = [(PantryItem, PantryItem.user_id), (ShoppingListItem, ShoppingListItem.user_id),
+                   (UserFoodLog, UserFoodLog.user_id), (User, None)]
+
+
+def git_revision() -> Dict[str, object]:
+    def git(*args) -> str:
+        try:
+            return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return ""
+    return {"commit": git("rev-parse", "--short", "HEAD") or None,
+            "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+async def load_context(n_users: int, rng: random.Random) -> tuple:
+    """Benchmark users (with tokens), sample recipes, ingredients and search terms; row counts; id watermarks."""
+    async with AsyncSessionLocal() as session:
+        users = (await session.execute(
+            select(User.id, User.email)
+            .where(User.email.like(USER_EMAIL.format("%")))
+            .order_by(User.id).limit(n_users)
+        )).all()
+        if not users:
+            raise SystemExit("No benchmark users found: generate data first (python -m app.scripts.generate_scale_data).")
+        user_ids = [u.id for u in users]
+
+        pantry: Dict[int, list] = {uid: [] for uid in user_ids}
+        for item_id, user_id, ingredient_id in (await session.execute(
+            select(PantryItem.id, PantryItem.user_id, PantryItem.ingredient_id).where(PantryItem.user_id.in_(user_ids))
+        )).all():
+            pantry[user_id].append((item_id, ingredient_id))
+        shopping: Dict[int, list] = {uid: [] for uid in user_ids}
+        for item_id, user_id in (await session.execute(
+            select(ShoppingListItem.id, ShoppingListItem.user_id).where(ShoppingListItem.user_id.in_(user_ids))
+        )).all():
+            shopping[user_id].append(item_id)
+
+        low, high = (await session.execute(select(func.min(ExternalRecipe.id), func.max(ExternalRecipe.id)))).one()
+        candidates = rng.sample(range(low, high + 1), min(RECIPE_SAMPLE, high - low + 1)) if low is not None else []
+        recipe_rows = (await session.execute(
+            select(ExternalRecipe.id, ExternalRecipe.ingredient_ids)
+            .where(ExternalRecipe.id.in_(candidates), ExternalRecipe.ingredient_count > 0)
+        )).all()
+        ingredient_ids = list((await session.execute(select(Ingredient.id))).scalars())
+        names = list((await session.execute(
+            select(IngredientTranslation.name).where(IngredientTranslation.lang == "es")
+        )).scalars())
+
+        counts = {}
+        for model in (ExternalRecipe, RecipeIngredient, Ingredient, User, PantryItem, ShoppingListItem, UserFoodLog):
+            counts[model.__tablename__] = (await session.execute(select(func.count()).select_from(model))).scalar_one()
+        watermarks = {}
+        for model, _ in _WRITTEN_TABLES:
+            watermarks[model.__tablename__] = (await session.execute(select(func.max(model.id)))).scalar_one() or 0
+
+    if not recipe_rows or not ingredient_ids:
+        raise SystemExit("The database has no recipes with ingredients: generate data first (python -m app.scripts.generate_scale_data).")
+
+    bench_users = []
+    for user in users:
+        if not pantry[user.id] or not shopping[user.id]:
+            continue  # PATCH / GET by id scenarios need existing rows
+        bench_users.append(BenchUser(
+            id=user.id, email=user.email,
+            headers={"Authorization": f"Bearer {create_access_token(user.id)}"},
+            pantry_item_ids=[item_id for item_id, _ in pantry[user.id]],
+            pantry_ingredient_ids={ingredient_id for _, ingredient_id in pantry[user.id]},
+            shopping_item_ids=shopping[user.id],
+        ))
+    if not bench_users:
+        raise SystemExit("None of the generated users has both pantry and shopping list items.")
+
+    terms = sorted({name.split()[0] for name in names if len(name.split()[0]) >= 4})
+    context = BenchContext(
+        users=bench_users,
+        recipe_ids=sorted(r.id for r in recipe_rows),
+        recipe_ingredient_ids={r.id: list(r.ingredient_ids) for r in recipe_rows},
+        ingredient_ids=ingredient_ids,
+        search_terms=rng.sample(terms, min(200, len(terms))) or ["tomate"],
+    )
+    return context, counts, watermarks
+
+
+async def remove_writes(context: BenchContext, watermarks: Dict[str, int]) -> None:
+    """Delete the rows the run created, so the next run starts from the same data."""
+    user_ids = [u.id for u in context.users]
+    async with AsyncSessionLocal() as session:
+        for model, owner in _WRITTEN_TABLES:
+            stmt = delete(model).where(model.id > watermarks[model.__tablename__])
+            if owner is not None:
+                stmt = stmt.where(owner.in_(user_ids))
+            else:
+                stmt = stmt.where(model.email.like("bench-run-%"))
+            await session.execute(stmt)
+        # Pantry contents changed behind the API: invalidate the ETags and cached profiles of the workers
+        await session.execute(
+            update(User).where(User.id.in_(user_ids)).values(pantry_version=User.pantry_version + 1)
+        )
+        for user_id in user_ids:
+            await notify_user_changed(session, user_id)
+        await session.commit()
+
+
+class Samples:
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.db_ms: List[float] = []
+        self.queries: List[int] = []
+        self.statuses: Dict[str, int] = {}
+        self.setup_errors = 0
+
+    def record(self, elapsed: float, response: Optional[httpx.Response]) -> None:
+        self.latencies.append(elapsed)
+        status = str(response.status_code) if response is not None else "error"
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if response is not None:
+            match = _SERVER_TIMING_DB.search(response.headers.get("server-timing", ""))
+            if match:
+                self.db_ms.append(float(match.group(1)))
+                self.queries.append(int(match.group(2)))
+
+    def summary(self, wall_seconds: float) -> dict:
+        latencies = np.asarray(self.latencies) * 1000
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (None, None, None)
+        ok = sum(n for status, n in self.statuses.items() if status.startswith("2") or status == "304")
+        return {
+            "requests": len(self.latencies),
+            "ok": ok,
+            "statuses": dict(sorted(self.statuses.items())),
+            "setup_errors": self.setup_errors,
+            "throughput_rps": round(len(self.latencies) / wall_seconds, 1) if wall_seconds else None,
+            "latency_ms": {
+                "p50": _round(p50), "p95": _round(p95), "p99": _round(p99),
+                "mean": _round(latencies.mean()) if len(latencies) else None,
+                "max": _round(latencies.max()) if len(latencies) else None,
+            },
+            "queries_per_request": _round(np.mean(self.queries)) if self.queries else None,
+            "max_queries": max(self.queries) if self.queries else None,
+            "db_ms_per_request": _round(np.mean(self.db_ms)) if self.db_ms else None,
+        }
+
+
+def _round(value) -> Optional[float]:
+    return None if value is None else round(float(value), 2)
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, context: BenchContext, concurrency: int,
+                       requests: int, duration: Optional[float], warmup: int, seed: int) -> dict:
+    samples = Samples()
+
+    async def one(user: BenchUser, rng: random.Random, record: bool) -> None:
+        try:
+            kwargs = await scenario.build(client, context, user, rng)
+        except (httpx.HTTPError, KeyError, ValueError):
+            samples.setup_errors += record
+            return
+        headers = user.headers if scenario.auth else None
+        started = time.perf_counter()
+        try:
+            response = await client.request(scenario.method, headers=headers, **kwargs)
+        except httpx.HTTPError:
+            response = None
+        if record:
+            samples.record(time.perf_counter() - started, response)
+
+    # Warm up sequentially (worker caches, pool connections), then measure with every client
+    rng = random.Random(seed)
+    for _ in range(warmup):
+        await one(context.users[0], rng, record=False)
+
+    remaining = requests
+    started = time.perf_counter()
+    deadline = started + duration if duration else None
+
+    async def worker(index: int) -> None:
+        nonlocal remaining
+        user = context.users[index % len(context.users)]
+        rng = random.Random(seed * 1000 + index)
+        while (time.perf_counter() < deadline) if deadline else remaining > 0:
+            remaining -= 1
+            await one(user, rng, record=True)
+
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return samples.summary(time.perf_counter() - started)
+
+
+def print_summary(name: str, result: dict) -> None:
+    latency = result["latency_ms"]
+    queries = result["queries_per_request"]
+    errors = result["requests"] - result["ok"] + result["setup_errors"]
+    print(
+        f"{name:<58} p50 {latency['p50'] or 0:>8.1f}  p95 {latency['p95'] or 0:>8.1f}  p99 {latency['p99'] or 0:>8.1f} ms"
+        f"  {result['throughput_rps'] or 0:>7.1f} req/s"
+        f"  {'-' if queries is None else f'{queries:.1f}':>5} q/req"
+        + (f"  {errors} errors {result['statuses']}" if errors else "")
+    )
+
+
+async def run(args) -> int:
+    rng = random.Random(args.seed)
+    context, counts, watermarks = await load_context(args.users, rng)
+    scenarios = select_scenarios(args.only)
+    if not scenarios:
+        print(f"No scenario matches {args.only}")
+        return 1
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        try:
+            openapi = (await client.get("/openapi.json")).raise_for_status().json()
+        except httpx.HTTPError as e:
+            print(f"Server not up at {args.base_url}: {e}")
+            return 1
+        for method, path in missing_routes(openapi):
+            print(f"warning: no benchmark scenario for {method} {path}")
+
+        print(f"{len(scenarios)} scenarios, {args.concurrency} clients, "
+              f"{f'{args.duration:g}s' if args.duration else f'{args.requests} requests'} each "
+              f"({len(context.users)} users, {counts['external_recipes']} recipes)")
+        results = {}
+        try:
+            for scenario in scenarios:
+                results[scenario.name] = await run_scenario(
+                    client, scenario, context, args.concurrency, args.requests, args.duration, args.warmup, args.seed
+                )
+                print_summary(scenario.name, results[scenario.name])
+        finally:
+            if not args.keep_writes:
+                await remove_writes(context, watermarks)
+
+    revision = git_revision()
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            **revision,
+            "base_url": args.base_url,
+            "concurrency": args.concurrency,
+            "requests": None if args.duration else args.requests,
+            "duration_seconds": args.duration,
+            "warmup": args.warmup,
+            "seed": args.seed,
+            "users": len(context.users),
+            "table_counts": counts,
+            "skipped": [f"{method} {path}: {reason}" for (method, path), reason in SKIPPED.items()],
+        },
+        "scenarios": results,
+    }
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        output = os.path.join(RESULTS_DIR, f"{stamp}_{revision['commit'] or 'nogit'}.json")
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test every API route")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients per route")
+    parser.add_argument("--requests", type=int, default=500, help="Measured requests per route")
+    parser.add_argument("--duration", type=float, default=None, help="Seconds per route (instead of --requests)")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per route")
+    parser.add_argument("--users", type=int, default=50, help="Benchmark users to spread the clients over")
+    parser.add_argument("--only", nargs="+", help='Only routes whose "METHOD /path" contains one of these')
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/<timestamp>_<commit>.json)")
+    parser.add_argument("--keep-writes", action="store_true", help="Keep the rows created by the run")
+    args = parser.parse_args()
+
+    if sys.platform == 'win32':
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    sys.exit(asyncio.run(run(args)))
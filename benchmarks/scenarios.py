@@ -0,0 +1,319 @@
+"""
+One benchmark scenario per API route.
+
+A scenario builds the keyword arguments of one request (url, params, json) for a
+benchmark user; the runner times only that request. Routes that need a target row
+(PATCH / DELETE) create it first through the API, outside the timed request.
+"""
+import random
+import uuid
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+import httpx
+
+from app.scripts.generate_scale_data import USER_PASSWORD
+
+# Routes the suite does not drive, with the reason
+SKIPPED = {
+    ("POST", "/admin/spoonacular/import-recipe/{spoonacular_id}"): "calls the Spoonacular API",
+}
+
+
+@dataclass
+class BenchUser:
+    id: int
+    email: str
+    headers: Dict[str, str]
+    pantry_item_ids: List[int]
+    pantry_ingredient_ids: Set[int]
+    shopping_item_ids: List[int]
+
+
+@dataclass
+class BenchContext:
+    users: List[BenchUser]
+    recipe_ids: List[int]
+    recipe_ingredient_ids: Dict[int, List[int]]  # recipe id -> its ingredient ids
+    ingredient_ids: List[int]
+    search_terms: List[str]  # Spanish ingredient names
+    lang: str = "es"
+    created: Dict[str, List[int]] = field(default_factory=dict)  # kind -> ids created by the run
+
+
+Build = Callable[[httpx.AsyncClient, BenchContext, BenchUser, random.Random], Awaitable[dict]]
+
+
+@dataclass(frozen=True)
+class Scenario:
+    method: str
+    route: str  # OpenAPI path template, as reported by /metrics
+    build: Build
+    auth: bool = True
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.route}"
+
+
+SCENARIOS: List[Scenario] = []
+
+
+def scenario(method: str, route: str, auth: bool = True):
+    def register(build: Build) -> Build:
+        SCENARIOS.append(Scenario(method, route, build, auth))
+        return build
+    return register
+
+
+def missing_routes(openapi: dict) -> List[Tuple[str, str]]:
+    """Routes of the OpenAPI schema that have neither a scenario nor a SKIPPED entry."""
+    covered = {(s.method, s.route) for s in SCENARIOS} | set(SKIPPED)
+    return [
+        (method.upper(), path)
+        for path, operations in openapi["paths"].items()
+        for method in operations
+        if (method.upper(), path) not in covered
+    ]
+
+
+def _recipe_with_ingredients(ctx: BenchContext, rng: random.Random) -> Tuple[int, List[int]]:
+    recipe_id = rng.choice(ctx.recipe_ids)
+    return recipe_id, ctx.recipe_ingredient_ids[recipe_id]
+
+
+def _new_pantry_ingredient(user: BenchUser, ctx: BenchContext, rng: random.Random) -> int:
+    while True:
+        ingredient_id = rng.choice(ctx.ingredient_ids)
+        if ingredient_id not in user.pantry_ingredient_ids:
+            user.pantry_ingredient_ids.add(ingredient_id)
+            return ingredient_id
+
+
+async def _create(client: httpx.AsyncClient, ctx: BenchContext, user: BenchUser, kind: str, url: str, body: dict) -> int:
+    """Untimed setup request; returns the id of the created row."""
+    response = await client.post(url, json=body, headers=user.headers)
+    response.raise_for_status()
+    item_id = response.json()["id"]
+    ctx.created.setdefault(kind, []).append(item_id)
+    return item_id
+
+
+# --- Misc -----------------------------------------------------------------
+
+@scenario("GET", "/", auth=False)
+async def root(client, ctx, user, rng):
+    return {"url": "/"}
+
+
+@scenario("GET", "/metrics", auth=False)
+async def metrics(client, ctx, user, rng):
+    return {"url": "/metrics"}
+
+
+# --- Auth -----------------------------------------------------------------
+
+@scenario("POST", "/auth/register", auth=False)
+async def register(client, ctx, user, rng):
+    return {"url": "/auth/register", "json": {
+        "email": f"bench-run-{uuid.uuid4().hex}@cooky.test", "password": USER_PASSWORD,
+    }}
+
+
+@scenario("POST", "/auth/login", auth=False)
+async def login(client, ctx, user, rng):
+    return {"url": "/auth/login", "json": {"email": user.email, "password": USER_PASSWORD}}
+
+
+# --- Recipes --------------------------------------------------------------
+
+@scenario("GET", "/recipes/")
+async def list_recipes(client, ctx, user, rng):
+    params = {"limit": 20, "lang": ctx.lang}
+    if rng.random() < 0.5:
+        params["use_user_profile"] = "true"
+    return {"url": "/recipes/", "params": params}
+
+
+@scenario("GET", "/recipes/search")
+async def search_recipes(client, ctx, user, rng):
+    return {"url": "/recipes/search", "params": {"q": rng.choice(ctx.search_terms), "limit": 20, "lang": ctx.lang}}
+
+
+@scenario("GET", "/recipes/batch")
+async def batch_recipes(client, ctx, user, rng):
+    ids = rng.sample(ctx.recipe_ids, min(10, len(ctx.recipe_ids)))
+    return {"url": "/recipes/batch", "params": {"ids": ",".join(map(str, ids)), "lang": ctx.lang}}
+
+
+@scenario("GET", "/recipes/by-ingredients")
+async def recipes_by_ingredients(client, ctx, user, rng):
+    _, ingredient_ids = _recipe_with_ingredients(ctx, rng)
+    wanted = rng.sample(ingredient_ids, min(2, len(ingredient_ids)))
+    return {"url": "/recipes/by-ingredients", "params": {
+        "all": ",".join(map(str, wanted)), "limit": 20, "lang": ctx.lang,
+    }}
+
+
+@scenario("GET", "/recipes/{recipe_id}")
+async def recipe_detail(client, ctx, user, rng):
+    return {"url": f"/recipes/{rng.choice(ctx.recipe_ids)}", "params": {"lang": ctx.lang}}
+
+
+@scenario("GET", "/recipes/{recipe_id}/similar")
+async def similar_recipes(client, ctx, user, rng):
+    return {"url": f"/recipes/{rng.choice(ctx.recipe_ids)}/similar", "params": {"limit": 10, "lang": ctx.lang}}
+
+
+@scenario("POST", "/recipes/{recipe_id}/shopping-list/add-missing")
+async def add_missing(client, ctx, user, rng):
+    return {"url": f"/recipes/{rng.choice(ctx.recipe_ids)}/shopping-list/add-missing", "params": {"lang": ctx.lang},
+            "json": {"include_partially_available": True}}
+
+
+@scenario("POST", "/recipes/{recipe_id}/shopping-list/add-ingredient")
+async def add_ingredient(client, ctx, user, rng):
+    recipe_id, ingredient_ids = _recipe_with_ingredients(ctx, rng)
+    return {"url": f"/recipes/{recipe_id}/shopping-list/add-ingredient", "params": {"lang": ctx.lang},
+            "json": {"ingredient_id": rng.choice(ingredient_ids)}}
+
+
+@scenario("GET", "/recipes/recommendations/expiring")
+async def expiring_recommendations(client, ctx, user, rng):
+    return {"url": "/recipes/recommendations/expiring", "params": {"days": 7, "limit": 10, "lang": ctx.lang}}
+
+
+@scenario("GET", "/recipes/recommendations/cookable")
+async def cookable_recommendations(client, ctx, user, rng):
+    return {"url": "/recipes/recommendations/cookable", "params": {"limit": 10, "lang": ctx.lang}}
+
+
+# --- Pantry ---------------------------------------------------------------
+
+@scenario("GET", "/pantry/")
+async def list_pantry(client, ctx, user, rng):
+    return {"url": "/pantry/", "params": {"limit": 50, "lang": ctx.lang}}
+
+
+@scenario("POST", "/pantry/")
+async def create_pantry_item(client, ctx, user, rng):
+    return {"url": "/pantry/", "params": {"lang": ctx.lang}, "json": {
+        "ingredient_id": _new_pantry_ingredient(user, ctx, rng), "quantity": 250, "unit": "g",
+    }}
+
+
+@scenario("GET", "/pantry/{item_id}")
+async def get_pantry_item(client, ctx, user, rng):
+    return {"url": f"/pantry/{rng.choice(user.pantry_item_ids)}", "params": {"lang": ctx.lang}}
+
+
+@scenario("PATCH", "/pantry/{item_id}")
+async def update_pantry_item(client, ctx, user, rng):
+    return {"url": f"/pantry/{rng.choice(user.pantry_item_ids)}", "params": {"lang": ctx.lang},
+            "json": {"quantity": round(rng.uniform(50, 1000), 1)}}
+
+
+@scenario("DELETE", "/pantry/{item_id}")
+async def delete_pantry_item(client, ctx, user, rng):
+    item_id = await _create(client, ctx, user, "pantry", "/pantry/", {
+        "ingredient_id": _new_pantry_ingredient(user, ctx, rng), "quantity": 100, "unit": "g",
+    })
+    return {"url": f"/pantry/{item_id}"}
+
+
+# --- Ingredients ----------------------------------------------------------
+
+@scenario("GET", "/ingredients/search")
+async def search_ingredients(client, ctx, user, rng):
+    return {"url": "/ingredients/search", "params": {"q": rng.choice(ctx.search_terms)[:4], "limit": 20}}
+
+
+# --- Shopping list --------------------------------------------------------
+
+@scenario("GET", "/shopping-list/")
+async def list_shopping(client, ctx, user, rng):
+    return {"url": "/shopping-list/", "params": {"only_pending": str(rng.random() < 0.5).lower(), "limit": 50,
+                                                 "lang": ctx.lang}}
+
+
+@scenario("POST", "/shopping-list/")
+async def create_shopping_item(client, ctx, user, rng):
+    return {"url": "/shopping-list/", "params": {"lang": ctx.lang},
+            "json": {"ingredient_id": rng.choice(ctx.ingredient_ids), "quantity": 2, "unit": "unit"}}
+
+
+@scenario("PATCH", "/shopping-list/{item_id}")
+async def update_shopping_item(client, ctx, user, rng):
+    return {"url": f"/shopping-list/{rng.choice(user.shopping_item_ids)}", "params": {"lang": ctx.lang},
+            "json": {"is_done": rng.random() < 0.5}}
+
+
+@scenario("DELETE", "/shopping-list/{item_id}")
+async def delete_shopping_item(client, ctx, user, rng):
+    item_id = await _create(client, ctx, user, "shopping", "/shopping-list/", {
+        "ingredient_id": rng.choice(ctx.ingredient_ids), "quantity": 1, "unit": "unit",
+    })
+    return {"url": f"/shopping-list/{item_id}"}
+
+
+# --- Food log -------------------------------------------------------------
+
+@scenario("POST", "/log/recipe")
+async def log_recipe(client, ctx, user, rng):
+    return {"url": "/log/recipe", "params": {"lang": ctx.lang},
+            "json": {"recipe_id": rng.choice(ctx.recipe_ids), "servings": 1}}
+
+
+@scenario("POST", "/log/ingredient")
+async def log_ingredient(client, ctx, user, rng):
+    return {"url": "/log/ingredient", "params": {"lang": ctx.lang},
+            "json": {"ingredient_id": rng.choice(ctx.ingredient_ids), "quantity": 150, "unit": "g"}}
+
+
+@scenario("GET", "/log/daily-summary")
+async def daily_summary(client, ctx, user, rng):
+    return {"url": "/log/daily-summary", "params": {"lang": ctx.lang}}
+
+
+@scenario("DELETE", "/log/{log_id}")
+async def delete_log(client, ctx, user, rng):
+    log_id = await _create(client, ctx, user, "log", "/log/recipe", {"recipe_id": rng.choice(ctx.recipe_ids)})
+    return {"url": f"/log/{log_id}"}
+
+
+# --- Profile / meal plan --------------------------------------------------
+
+@scenario("GET", "/profile/")
+async def get_profile(client, ctx, user, rng):
+    return {"url": "/profile/"}
+
+
+@scenario("PATCH", "/profile/")
+async def update_profile(client, ctx, user, rng):
+    # Name only: the diet drives the recipe filters of the other scenarios
+    return {"url": "/profile/", "json": {"name": f"Bench {rng.randint(0, 10_000)}"}}
+
+
+@scenario("GET", "/meal-plan/")
+async def meal_plan(client, ctx, user, rng):
+    return {"url": "/meal-plan/", "params": {"days": 7, "seed": rng.randint(0, 1_000_000), "lang": ctx.lang}}
+
+
+# --- Admin ----------------------------------------------------------------
+
+def _admin_stats(route: str) -> None:
+    @scenario("GET", route, auth=False)
+    async def stats(client, ctx, user, rng):
+        return {"url": route}
+
+
+for _route in ("/admin/catalog/stats", "/admin/ingredients/cache/stats", "/admin/similarity/stats",
+               "/admin/users/cache/stats", "/admin/db/pool/stats"):
+    _admin_stats(_route)
+
+
+def select_scenarios(only: Optional[List[str]] = None) -> List[Scenario]:
+    """Scenarios whose "METHOD /route" name contains one of the given substrings (all if None)."""
+    if not only:
+        return list(SCENARIOS)
+    return [s for s in SCENARIOS if any(part in s.name for part in only)]
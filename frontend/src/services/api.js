@@ -8,14 +8,14 @@ const api = axios.create({
     },
 });
 
-export const getPantryItems = () => api.get('/pantry/');
+export const getPantryItems = () => api.get('/pantry/', { params: { paginate: false } });
 export const addPantryItem = (data) => api.post('/pantry/', data);
 export const updatePantryItem = (id, data) => api.patch(`/pantry/${id}`, data);
 export const deletePantryItem = (id) => api.delete(`/pantry/${id}`);
 export const searchIngredients = (query) => api.get('/ingredients/search', { params: query });
 
 // Shopping List
-export const getShoppingList = (params) => api.get('/shopping-list/', { params });
+export const getShoppingList = (params) => api.get('/shopping-list/', { params: { paginate: false, ...params } });
 export const addShoppingListItem = (data) => api.post('/shopping-list/', data);
 export const updateShoppingListItem = (id, data) => api.patch(`/shopping-list/${id}`, data);
 export const deleteShoppingListItem = (id) => api.delete(`/shopping-list/${id}`);
@@ -4,12 +4,15 @@ Makes individual calls to get_recipe_information for complete data.
 """
 import asyncio
 import httpx
-from sqlalchemy import select
+from sqlalchemy import select, func
 from app.db.session import AsyncSessionLocal
 from app.models.recipe import ExternalRecipe, RecipeTranslation, RecipeIngredient
 from app.models.ingredient import Ingredient, IngredientTranslation
 from app.models.translation import TranslationJob
 from app.services.normalization import normalize_ingredient_name
+from app.services.diet_mask import compute_diet_mask, compute_intolerance_mask
+from app.services.catalog_events import notify_catalog_changed
+from app.services.recipe_search import refresh_search_vectors
 from app.core.config import settings
 
 API_KEY = settings.SPOONACULAR_API_KEY
@@ -85,6 +88,8 @@ async def import_single_recipe(db, recipe_data: dict):
         recipe = existing
         recipe.instructions_raw = recipe_data.get("instructions", "")
         recipe.diets = recipe_data.get("diets", [])
+        recipe.diet_mask = compute_diet_mask(recipe.diets)
+        recipe.intolerance_mask = compute_intolerance_mask(recipe.intolerances_warn)
         
         # Update nutrition
         if recipe_data.get("nutrition") and recipe_data["nutrition"].get("nutrients"):
@@ -115,6 +120,8 @@ async def import_single_recipe(db, recipe_data: dict):
             image_url=recipe_data.get("image"),
             servings=recipe_data.get("servings", 1),
             diets=recipe_data.get("diets", []),
+            diet_mask=compute_diet_mask(recipe_data.get("diets", [])),
+            intolerance_mask=0,
             nutrition_totals_per_serving=nutrition if nutrition else None,
             instructions_raw=recipe_data.get("instructions", ""),
             raw_json=recipe_data
@@ -192,6 +199,21 @@ async def import_single_recipe(db, recipe_data: dict):
             db.add(link)
             ingredients_added += 1
     
+    # Keep the denormalized count / ingredient id array in sync (autoflush includes new links)
+    ingredient_count, ingredient_ids = (await db.execute(
+        select(
+            func.count(),
+            func.array_agg(RecipeIngredient.ingredient_id.distinct()),
+        ).where(RecipeIngredient.recipe_id == recipe.id)
+    )).one()
+    recipe.ingredient_count = ingredient_count
+    recipe.ingredient_ids = ingredient_ids or []
+    
+    # Full-text document (titles, ingredient names, instructions)
+    await refresh_search_vectors(db, [recipe.id])
+    
+    # Running API workers reload their catalog snapshot when this commits
+    await notify_catalog_changed(db, "recipes")
     await db.commit()
     print(f"   ✅ Recipe complete! {ingredients_added} new ingredients linked.")
     return recipe